@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+/api/generate-hwpx 요청 본문 고속 디코딩 (opt-in: HWPX_FAST_DECODE=1)
+
+pydantic 모델 대신 요청 JSON을 바로 가벼운 구조체로 디코딩한다.
+- msgspec 설치 시: msgspec.json.Decoder + Struct (디코딩과 타입 검증을 한 번에)
+- 없으면 orjson(없으면 표준 json) + __slots__ 클래스 + 최소 타입 검증
+결과 객체는 GenerateRequest와 같은 속성(title, sections[].title/text, organization, date, model, preset, priority)을 가진다.
+"""
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+DEFAULTS = {
+    "organization": "Architect PRO",
+    "date": "",
+    "model": "unknown",
+    "preset": "제안서",
+    "priority": "",
+}
+
+
+class RequestDecodeError(ValueError):
+    """요청 본문이 JSON이 아니거나 스키마와 맞지 않음 (422로 응답)"""
+
+
+if msgspec is not None:
+    DECODER = "msgspec"
+
+    class FastSection(msgspec.Struct):
+        title: str
+        text: str
+
+    class FastGenerateRequest(msgspec.Struct):
+        title: str
+        sections: list[FastSection]
+        organization: str = DEFAULTS["organization"]
+        date: str = DEFAULTS["date"]
+        model: str = DEFAULTS["model"]
+        preset: str = DEFAULTS["preset"]
+        priority: str = DEFAULTS["priority"]
+
+    _decoder = msgspec.json.Decoder(FastGenerateRequest)
+
+    def decode_generate_request(body):
+        try:
+            return _decoder.decode(body)
+        except (msgspec.DecodeError, msgspec.ValidationError) as e:
+            raise RequestDecodeError(str(e)) from None
+
+else:
+    DECODER = "orjson" if orjson is not None else "json"
+
+    if orjson is not None:
+        _loads = orjson.loads
+        _json_error = orjson.JSONDecodeError
+    else:
+        import json
+        _loads = json.loads
+        _json_error = ValueError
+
+    class FastSection:
+        __slots__ = ("title", "text")
+
+        def __init__(self, title, text):
+            self.title = title
+            self.text = text
+
+    class FastGenerateRequest:
+        __slots__ = ("title", "sections", "organization", "date", "model", "preset", "priority")
+
+        def __init__(self, title, sections, organization, date, model, preset, priority):
+            self.title = title
+            self.sections = sections
+            self.organization = organization
+            self.date = date
+            self.model = model
+            self.preset = preset
+            self.priority = priority
+
+    def _require_str(obj, key, path, default=None):
+        value = obj.get(key, default)
+        if not isinstance(value, str):
+            if value is None and default is None:
+                raise RequestDecodeError(f"Object missing required field `{key}` - at `{path}`")
+            raise RequestDecodeError(f"Expected `str`, got `{type(value).__name__}` - at `{path}.{key}`")
+        return value
+
+    def decode_generate_request(body):
+        try:
+            data = _loads(body)
+        except _json_error as e:
+            raise RequestDecodeError(f"JSON is malformed: {e}") from None
+        if not isinstance(data, dict):
+            raise RequestDecodeError(f"Expected `object`, got `{type(data).__name__}`")
+
+        raw_sections = data.get("sections")
+        if not isinstance(raw_sections, list):
+            raise RequestDecodeError("Expected `array` - at `$.sections`")
+
+        sections = []
+        for index, section in enumerate(raw_sections):
+            path = f"$.sections[{index}]"
+            if not isinstance(section, dict):
+                raise RequestDecodeError(f"Expected `object` - at `{path}`")
+            sections.append(FastSection(_require_str(section, "title", path), _require_str(section, "text", path)))
+
+        return FastGenerateRequest(
+            _require_str(data, "title", "$"),
+            sections,
+            *(_require_str(data, key, "$", default) for key, default in DEFAULTS.items()),
+        )
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""
+요청 단위 프로파일링 (운영 진단용, 기본 꺼짐)
+
+HWPX_PROFILE_TOKEN이 설정된 경우에만 /api/generate-hwpx가 X-Profile 헤더를 확인한다
+(설정되지 않으면 라우트에서 분기 한 번도 하지 않음 - 비용 없음).
+
+    X-Profile: cprofile | sample      (cprofile: 결정적 프로파일러, sample: 스택 샘플링 1ms)
+    X-Profile-Token: <HWPX_PROFILE_TOKEN>
+    X-Profile-Include-Hwpx: 1         (선택: 보고서에 HWPX를 base64로 함께)
+
+생성 함수를 프로파일러 + tracemalloc 아래에서 실행하고 HWPX 대신 JSON 보고서를 돌려준다.
+- top_functions: 누적/자체 시간 상위 함수 (sample 모드: 샘플 수 기준)
+- allocations: tracemalloc 할당 위치 상위 (파일:줄, KB, 블록 수) + peak
+- stages: preprocess / attribution / render / serialize / zip / namespaces 단계별 시간
+- collapsed: (sample 모드) flamegraph.pl/speedscope용 접힌 스택
+tracemalloc은 프로세스 전역이므로 동시에 실행 중인 다른 요청의 할당도 섞일 수 있다
+(추적은 동시에 실행 중인 프로파일 요청이 모두 끝나야 멈춘다).
+"""
+import cProfile
+import hmac
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+PROFILE_TOKEN = os.environ.get("HWPX_PROFILE_TOKEN", "")
+PROFILE_MODES = ("cprofile", "sample")
+TOP_N = 25
+SAMPLE_INTERVAL = 0.001
+
+# tracemalloc 사용 중인 프로파일 요청 수 - 마지막 요청이 끝날 때만 추적을 멈춘다
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_started = False  # 이 모듈이 시작한 추적인지 (PYTHONTRACEMALLOC 등 외부 추적은 멈추지 않음)
+
+# (단계, 파일 이름, 함수 이름) - 샘플은 스택 안쪽부터 처음 맞는 규칙의 단계로 집계
+STAGE_RULES = (
+    ("serialize", "hwpx_generator.py", "_serialize_xml"),
+    ("zip", "hwpx_generator.py", "_finish_document"),
+    ("render", "hwpx_generator.py", "generate_bytes"),
+    ("attribution", "attribution.py", "check_document"),
+    ("preprocess", "index.py", "preprocess_sections"),
+    ("namespaces", "index.py", "fix_hwpx_namespaces"),
+)
+
+
+class ProfileDenied(Exception):
+    """토큰 불일치 또는 알 수 없는 모드"""
+
+
+def requested_mode(headers):
+    """
+    요청 헤더 → 프로파일 모드 (프로파일 요청이 아니면 None)
+
+    Raises:
+        ProfileDenied: 토큰이 틀리거나 모드가 잘못된 경우
+    """
+    mode = headers.get("x-profile")
+    if not mode:
+        return None
+    token = headers.get("x-profile-token", "")
+    if not PROFILE_TOKEN or not hmac.compare_digest(token.encode(), PROFILE_TOKEN.encode()):
+        raise ProfileDenied("invalid profile token")
+    mode = mode.strip().lower()
+    if mode in ("1", "true"):
+        mode = "cprofile"
+    if mode not in PROFILE_MODES:
+        raise ProfileDenied(f"unknown profile mode: {mode} (use {' | '.join(PROFILE_MODES)})")
+    return mode
+
+
+def _short_path(filename):
+    parts = filename.replace("\\", "/").split("/")
+    return "/".join(parts[-2:])
+
+
+class StackSampler:
+    """대상 스레드의 스택을 일정 간격으로 샘플링 (sys._current_frames)"""
+
+    def __init__(self, thread_id, interval=SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()  # (바깥 → 안쪽 프레임 튜플) -> 샘플 수
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_name, frame.f_lineno))
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(reversed(stack))] += 1
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def report(self, top=TOP_N):
+        total = sum(self.stacks.values()) or 1
+        inclusive, exclusive, stages = Counter(), Counter(), Counter()
+        stacks = Counter()
+        for stack, count in self.stacks.items():
+            stacks[_trim(stack)] += count
+        for stack, count in stacks.items():
+            functions = [(_short_path(filename), name) for filename, name, _ in stack]
+            for function in set(functions):
+                inclusive[function] += count
+            exclusive[functions[-1]] += count
+            stages[_stage_of(stack)] += count
+
+        def share(count):
+            return round(count / total * 100, 1)
+
+        return {
+            "samples": total,
+            "interval_ms": self.interval * 1000,
+            "top_functions": [{"function": name, "file": path, "inclusive_pct": share(count),
+                               "self_pct": share(exclusive[(path, name)])}
+                              for (path, name), count in inclusive.most_common(top)],
+            "stages_pct": {stage: share(count) for stage, count in stages.most_common()},
+            "collapsed": [";".join(f"{name} ({_short_path(filename)}:{line})" for filename, name, line in stack)
+                          + f" {count}" for stack, count in stacks.most_common(200)],
+        }
+
+
+def _trim(stack):
+    """스레드 풀/프로파일러 자체 프레임(run_profiled까지) 제외"""
+    for index in range(len(stack) - 1, -1, -1):
+        if stack[index][0] == __file__:
+            return stack[index + 1:] or stack
+    return stack
+
+
+def _stage_of(stack):
+    for filename, name, _ in reversed(stack):
+        for stage, rule_file, rule_name in STAGE_RULES:
+            if name == rule_name and filename.endswith(rule_file):
+                return stage
+    return "other"
+
+
+def _cprofile_report(profiler, top=TOP_N):
+    stats = pstats.Stats(profiler)
+    rows = []
+    cumulative = {}
+    for (filename, line, name), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({"function": name, "file": f"{_short_path(filename)}:{line}", "calls": calls,
+                     "self_ms": round(tottime * 1000, 2), "cumulative_ms": round(cumtime * 1000, 2)})
+        for stage, rule_file, rule_name in STAGE_RULES:
+            if name == rule_name and filename.endswith(rule_file):
+                cumulative[stage] = cumulative.get(stage, 0.0) + cumtime * 1000
+
+    # 누적 시간에서 안쪽 단계를 빼서 단계별 고유 시간으로
+    stages = dict(cumulative)
+    if "zip" in stages:
+        stages["zip"] -= cumulative.get("serialize", 0.0)
+    if "render" in stages:
+        stages["render"] -= cumulative.get("zip", 0.0)
+    return {
+        "top_cumulative": sorted(rows, key=lambda row: row["cumulative_ms"], reverse=True)[:top],
+        "top_self": sorted(rows, key=lambda row: row["self_ms"], reverse=True)[:top],
+        "stages_ms": {stage: round(ms, 2) for stage, ms in sorted(stages.items(), key=lambda item: -item[1])},
+    }
+
+
+def _allocation_report(snapshot, top=TOP_N):
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ))
+    return [{"site": f"{_short_path(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+             "kb": round(stat.size / 1024, 1), "blocks": stat.count}
+            for stat in snapshot.statistics("lineno")[:top]]
+
+
+def _acquire_tracing():
+    global _tracing_users, _tracing_started
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_started = True
+        _tracing_users += 1
+        tracemalloc.reset_peak()
+
+
+def _release_tracing():
+    global _tracing_users, _tracing_started
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _tracing_started:
+            tracemalloc.stop()
+            _tracing_started = False
+
+
+def run_profiled(func, mode="cprofile", top=TOP_N):
+    """
+    func()를 현재 스레드에서 프로파일러 + tracemalloc 아래 실행
+
+    Returns:
+        (func 결과, 보고서 dict)
+    """
+    _acquire_tracing()
+    start = time.perf_counter()
+    try:
+        if mode == "sample":
+            with StackSampler(threading.get_ident()) as sampler:
+                result = func()
+            report = sampler.report(top)
+        else:
+            profiler = cProfile.Profile()
+            result = profiler.runcall(func)
+            report = _cprofile_report(profiler, top)
+        wall_ms = (time.perf_counter() - start) * 1000
+        _, peak = tracemalloc.get_traced_memory()
+        report["allocations"] = _allocation_report(tracemalloc.take_snapshot(), top)
+    finally:
+        _release_tracing()
+
+    report.update({
+        "mode": mode,
+        "wall_ms": round(wall_ms, 2),
+        "peak_traced_mb": round(peak / 1024 / 1024, 2),
+    })
+    return result, report
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+생성 작업 우선순위 스케줄러
+
+대화형 내보내기(interactive)가 일괄 내보내기(bulk)에 밀리지 않도록
+생성 작업 앞에서 우선순위 클래스별로 실행 순서와 동시 실행 수를 정한다.
+- 전체 동시 실행 수(max_concurrency) + 클래스별 동시 실행 상한(limits)
+- 대기 중에는 우선순위가 높은 클래스부터 실행, 오래 기다린 작업은 aging_seconds마다
+  한 단계씩 우선순위가 올라가 bulk도 굶지 않는다.
+- 작업마다 대기 시간(queue_ms)을 측정해 돌려준다.
+
+사용 예:
+    scheduler = PriorityScheduler(max_concurrency=4)
+    result, ticket = await scheduler.submit("bulk", generate_bytes)   # ticket.queue_ms
+"""
+import asyncio
+import itertools
+import time
+
+# 클래스 이름 -> 기본 우선순위 (작을수록 먼저)
+PRIORITY_CLASSES = {
+    "interactive": 0,
+    "normal": 1,
+    "bulk": 2,
+}
+DEFAULT_CLASS = "normal"
+
+
+def canonical_class(name):
+    """요청 헤더/필드 값을 우선순위 클래스 이름으로 (알 수 없으면 기본 클래스)"""
+    name = (name or "").strip().lower()
+    return name if name in PRIORITY_CLASSES else DEFAULT_CLASS
+
+
+class Ticket:
+    """작업 하나의 스케줄링 기록"""
+    __slots__ = ("priority_class", "enqueued", "started", "future")
+
+    def __init__(self, priority_class, future=None):
+        self.priority_class = priority_class
+        self.enqueued = time.perf_counter()
+        self.started = None
+        self.future = future
+
+    @property
+    def queue_ms(self):
+        return round(((self.started or time.perf_counter()) - self.enqueued) * 1000, 1)
+
+
+class PriorityScheduler:
+    """우선순위 클래스별 동시 실행 제한 + aging (이벤트 루프 하나에서 사용)"""
+
+    def __init__(self, max_concurrency=2, limits=None, aging_seconds=5.0):
+        """
+        Args:
+            max_concurrency: 전체 동시 실행 수
+            limits: {클래스: 동시 실행 상한} (기본: bulk만 max_concurrency의 절반)
+            aging_seconds: 이 시간만큼 기다릴 때마다 우선순위 한 단계 상승
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.limits = {name: self.max_concurrency for name in PRIORITY_CLASSES}
+        self.limits["bulk"] = max(1, self.max_concurrency // 2)
+        self.limits.update(limits or {})
+        self.aging_seconds = aging_seconds
+
+        self._running = dict.fromkeys(PRIORITY_CLASSES, 0)
+        self._waiting = []  # [(순번, Ticket)] - 도착 순
+        self._order = itertools.count()
+        self._stats = {name: {"completed": 0, "queue_ms_total": 0.0, "queue_ms_max": 0.0}
+                       for name in PRIORITY_CLASSES}
+
+    def _can_start(self, priority_class):
+        return (sum(self._running.values()) < self.max_concurrency
+                and self._running[priority_class] < self.limits[priority_class])
+
+    def _effective_priority(self, ticket, now):
+        waited = now - ticket.enqueued
+        return PRIORITY_CLASSES[ticket.priority_class] - waited / self.aging_seconds
+
+    def _start(self, ticket):
+        ticket.started = time.perf_counter()
+        self._running[ticket.priority_class] += 1
+
+    def _dispatch(self):
+        """빈 슬롯이 있는 동안 실행 가능한 대기 작업 중 유효 우선순위가 가장 높은 것부터 시작"""
+        while self._waiting:
+            now = time.perf_counter()
+            eligible = [(self._effective_priority(ticket, now), order, ticket)
+                        for order, ticket in self._waiting
+                        if not ticket.future.done() and self._can_start(ticket.priority_class)]
+            # 취소된 대기 작업 정리
+            self._waiting = [(order, ticket) for order, ticket in self._waiting if not ticket.future.done()]
+            if not eligible:
+                return
+            _, order, ticket = min(eligible, key=lambda entry: entry[:2])
+            self._waiting.remove((order, ticket))
+            self._start(ticket)
+            ticket.future.set_result(None)
+
+    async def acquire(self, priority_class):
+        """슬롯을 얻을 때까지 대기 후 Ticket 반환 (끝나면 release(ticket) 필수)"""
+        priority_class = canonical_class(priority_class)
+        ticket = Ticket(priority_class)
+        if not self._waiting and self._can_start(priority_class):
+            self._start(ticket)
+            return ticket
+
+        ticket.future = asyncio.get_running_loop().create_future()
+        self._waiting.append((next(self._order), ticket))
+        self._dispatch()
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            if ticket.started is not None:
+                # 슬롯을 받은 직후 취소된 경우 슬롯 반환
+                self.release(ticket)
+            raise
+        return ticket
+
+    def release(self, ticket):
+        self._running[ticket.priority_class] -= 1
+        stats = self._stats[ticket.priority_class]
+        stats["completed"] += 1
+        stats["queue_ms_total"] += ticket.queue_ms
+        stats["queue_ms_max"] = max(stats["queue_ms_max"], ticket.queue_ms)
+        self._dispatch()
+
+    async def submit(self, priority_class, func):
+        """
+        슬롯을 얻은 뒤 동기 함수 func()를 스레드에서 실행
+
+        Returns:
+            (func 결과, Ticket)
+        """
+        ticket = await self.acquire(priority_class)
+        try:
+            return await asyncio.to_thread(func), ticket
+        finally:
+            self.release(ticket)
+
+    def stats(self):
+        """모니터링용: 설정, 클래스별 실행/대기 수와 평균/최대 대기 시간"""
+        waiting = dict.fromkeys(PRIORITY_CLASSES, 0)
+        for _, ticket in self._waiting:
+            waiting[ticket.priority_class] += 1
+        classes = {}
+        for name, stats in self._stats.items():
+            completed = stats["completed"]
+            classes[name] = {
+                "limit": self.limits[name],
+                "running": self._running[name],
+                "waiting": waiting[name],
+                "completed": completed,
+                "queue_ms_avg": round(stats["queue_ms_total"] / completed, 1) if completed else 0.0,
+                "queue_ms_max": stats["queue_ms_max"],
+            }
+        return {"max_concurrency": self.max_concurrency, "aging_seconds": self.aging_seconds, "classes": classes}
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""
+자체 호스팅용 prefork 서버 (Vercel 배포에서는 쓰지 않음)
+
+    python api/_server.py [--host 0.0.0.0] [--port 8000] [--workers 4] [--no-preload]
+
+마스터 프로세스가 fork 전에 한 번만
+1. api/index.py import (FastAPI/pydantic) + preset 풀 (lxml, 스냅샷/템플릿 archive, 모든 preset의 스타일·header)
+   + 폰트 파일 + 출처 검증 색인 (index.prepare_for_fork)
+2. 워밍업 요청: preset마다 작은 문서를 실제 생성 경로(generate_hwpx_bytes)로 한 번씩 생성
+   (지연 import, 정규식 컴파일, 요소 프로토타입까지 준비)
+3. gc.freeze() - 공유 객체를 GC가 훑으며 페이지를 복사하지 않도록
+을 끝낸 뒤 listen 소켓을 열고 worker를 fork한다. worker는 페이지를 copy-on-write로 공유하고
+uvicorn으로 같은 소켓에서 accept한다.
+
+worker가 뜨면 마스터가 /api/ready로 준비를 확인하고 worker별 준비 시간과 메모리(RSS/PSS/공유)를 출력한다.
+죽은 worker는 준비된 마스터에서 다시 fork, SIGTERM/SIGINT는 worker에 전달 후 모두 끝나면 종료.
+--no-preload는 비교용 (worker마다 fork 후 직접 로드). fork가 없는 OS(Windows)는 단일 프로세스로 실행한다.
+
+uvicorn이 필요하다 (requirements.txt 선택 항목).
+"""
+import argparse
+import gc
+import http.client
+import os
+import signal
+import socket
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+READY_TIMEOUT = 60.0
+RESPAWN_BACKOFF = 1.0  # 시작 직후 죽은 worker는 이만큼 기다렸다가 다시 fork
+
+WARM_UP_SECTIONS = [
+    {"title": "1. 사업 개요", "text": '<p>□ 추진 배경 <span class="text-red-600">2025년</span> 기준 '
+                                   '<span class="text-green-600">공공데이터 기반</span> 분석</p><p>○ 세부 내용</p>'},
+    {"title": "2. 추진 일정", "text": "<table><thead><tr><th>단계</th><th>기간</th></tr></thead>"
+                                   "<tbody><tr><td>설계</td><td>1개월</td></tr></tbody></table><p>― 비고</p>"},
+]
+
+
+def preload():
+    """마스터: fork 전에 공유할 상태 준비 + 워밍업 요청, 소요 시간(ms) dict 반환"""
+    start = time.perf_counter()
+    import index
+    import uvicorn  # noqa: F401 - worker에서 다시 import하지 않도록 미리
+    timings = {"import_ms": round((time.perf_counter() - start) * 1000, 1)}
+    timings.update(index.prepare_for_fork())
+
+    start = time.perf_counter()
+    for preset in index.get_preset_pool().presets:
+        req = index.GenerateRequest(title="워밍업", sections=WARM_UP_SECTIONS, model="warmup", preset=preset)
+        index.generate_hwpx_bytes(req, "2026. 1. 1.")
+    timings["warm_up_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+    gc.collect()
+    gc.freeze()
+    return timings
+
+
+def _memory(pid):
+    """/proc/<pid>/smaps_rollup의 Rss/Pss/공유/전용 (MB) - Linux가 아니면 None"""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line and not line.startswith(" "))
+    except OSError:
+        return None
+
+    def mb(*names):
+        return round(sum(int(fields.get(name, "0 kB").split()[0]) for name in names) / 1024, 1)
+
+    return {"rss": mb("Rss"), "pss": mb("Pss"), "shared": mb("Shared_Clean", "Shared_Dirty"),
+            "private": mb("Private_Clean", "Private_Dirty")}
+
+
+def _serve(sock, ready_fd, preloaded, log_level):
+    """worker: (preload 안 했으면 여기서 로드) uvicorn으로 sock에서 accept, 시작되면 ready_fd에 알림"""
+    import asyncio
+
+    import uvicorn
+
+    import index
+    if not preloaded:
+        index.get_preset_pool()
+
+    server = uvicorn.Server(uvicorn.Config(index.app, log_level=log_level, lifespan="off"))
+
+    async def run():
+        task = asyncio.ensure_future(server.serve(sockets=[sock]))
+        while not server.started and not task.done():
+            await asyncio.sleep(0.005)
+        if task.done():
+            await task  # 시작 실패 - 예외를 그대로
+            return
+        os.write(ready_fd, b"1")
+        os.close(ready_fd)
+        await task
+
+    asyncio.run(run())
+
+
+class Master:
+    """worker fork/감시/재시작"""
+
+    def __init__(self, sock, workers, preloaded, log_level):
+        self.sock = sock
+        self.workers = workers
+        self.preloaded = preloaded
+        self.log_level = log_level
+        self.children = {}  # pid -> (fork 시각, 준비 신호 fd)
+        self.stopping = False
+
+    def spawn(self):
+        read_fd, write_fd = os.pipe()
+        started = time.perf_counter()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            code = 0
+            try:
+                _serve(self.sock, write_fd, self.preloaded, self.log_level)
+            except BaseException:
+                import traceback
+                traceback.print_exc()
+                code = 1
+            finally:
+                os._exit(code)
+        os.close(write_fd)
+        self.children[pid] = (started, read_fd)
+        return pid
+
+    def wait_ready(self, pids, timeout=READY_TIMEOUT):
+        """
+        worker별 fork → 소켓 accept 시작까지 시간(ms)
+
+        준비 신호 전에 종료한 worker는 pipe EOF로 알아채고 넘어간다.
+        회수(wait)와 재시작은 supervise가 맡는다 - 여기서 회수하면 supervise가 종료를 보지 못한다.
+        """
+        ready = {}
+        for pid in pids:
+            started, read_fd = self.children[pid]
+            deadline = time.monotonic() + timeout
+            os.set_blocking(read_fd, False)
+            while time.monotonic() < deadline:
+                try:
+                    if os.read(read_fd, 1):
+                        ready[pid] = round((time.perf_counter() - started) * 1000, 1)
+                    break  # b"": 준비 전에 종료
+                except BlockingIOError:
+                    pass
+                time.sleep(0.005)
+            os.close(read_fd)
+        return ready
+
+    def check_ready(self, host, port):
+        """/api/ready가 200을 돌려줄 때까지 확인 (소켓 → worker → 앱 경로 전체)"""
+        host = "127.0.0.1" if host in ("0.0.0.0", "") else ("::1" if host == "::" else host)
+        deadline = time.monotonic() + READY_TIMEOUT
+        while time.monotonic() < deadline:
+            try:
+                conn = http.client.HTTPConnection(host, port, timeout=5)
+                conn.request("GET", "/api/ready")
+                response = conn.getresponse()
+                response.read()
+                conn.close()
+                if response.status == 200:
+                    return True
+            except OSError:
+                pass
+            time.sleep(0.05)
+        return False
+
+    def report(self, ready):
+        for pid in self.children:
+            memory = _memory(pid)
+            ready_ms = ready.get(pid)
+            print(f"[Server] worker {pid}: " + (f"ready in {ready_ms}ms" if ready_ms is not None else "not ready")
+                  + (f", RSS {memory['rss']}MB PSS {memory['pss']}MB shared {memory['shared']}MB "
+                     f"private {memory['private']}MB" if memory else ""))
+
+    def stop(self, signum, frame):
+        self.stopping = True
+        for pid in self.children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def supervise(self):
+        """worker 종료를 기다리며 비정상 종료한 worker는 다시 fork"""
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            started, _ = self.children.pop(pid, (None, None))
+            if self.stopping or started is None:
+                continue
+            print(f"[Server] worker {pid} exited ({os.waitstatus_to_exitcode(status)}), respawning")
+            if time.perf_counter() - started < RESPAWN_BACKOFF:
+                time.sleep(RESPAWN_BACKOFF)
+            new_pid = self.spawn()
+            self.wait_ready([new_pid])
+
+
+def bind(host, port, backlog=2048):
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HWPX API prefork 서버 (자체 호스팅)")
+    parser.add_argument("--host", default=os.environ.get("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1)))
+    parser.add_argument("--no-preload", action="store_true", help="worker마다 fork 후 직접 로드 (비교용)")
+    parser.add_argument("--log-level", default="warning")
+    args = parser.parse_args()
+
+    if not hasattr(os, "fork"):
+        import uvicorn
+        import index
+        print("[Server] fork를 지원하지 않는 OS - 단일 프로세스로 실행")
+        index.get_preset_pool()
+        uvicorn.run(index.app, host=args.host, port=args.port, log_level=args.log_level)
+        return
+
+    boot = time.perf_counter()
+    preloaded = not args.no_preload
+    if preloaded:
+        print(f"[Server] preload {preload()}")
+        memory = _memory(os.getpid())
+        if memory:
+            print(f"[Server] master RSS {memory['rss']}MB")
+
+    sock = bind(args.host, args.port)
+    master = Master(sock, max(1, args.workers), preloaded, args.log_level)
+    signal.signal(signal.SIGTERM, master.stop)
+    signal.signal(signal.SIGINT, master.stop)
+    pids = [master.spawn() for _ in range(master.workers)]
+    ready = master.wait_ready(pids)
+    ok = master.check_ready(args.host, args.port)
+    master.report(ready)
+    print(f"[Server] {len(ready)}/{len(pids)} workers on {args.host}:{args.port}, "
+          f"/api/ready {'ok' if ok else 'FAILED'} ({(time.perf_counter() - boot) * 1000:.0f}ms since boot)")
+    master.supervise()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+동일 요청 합치기 (single-flight)
+
+같은 키로 동시에 들어온 요청은 먼저 온 요청(leader)의 작업 하나만 실행하고,
+나머지(follower)는 그 결과(또는 예외)를 함께 받는다. 작업이 끝나면 키를 비우므로
+결과를 캐시하지는 않는다 - 진행 중인 작업에만 합류한다.
+
+사용 예:
+    flight = SingleFlight()
+    hwpx_bytes = await flight.run(request_key(req), lambda: asyncio.to_thread(generate_bytes, req))
+"""
+import asyncio
+import hashlib
+import json
+
+
+def request_key(*parts):
+    """요청 내용(문자열/숫자/리스트)을 정규화한 JSON의 sha256 - 필드 순서/인코딩과 무관"""
+    payload = json.dumps(parts, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SingleFlight:
+    """키별 진행 중 작업 공유 (이벤트 루프 하나에서 사용)"""
+
+    def __init__(self):
+        self._in_flight = {}  # 키 -> [asyncio.Task, 대기 중인 follower 수]
+        self.requests = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.max_waiters = 0
+
+    async def run(self, key, func):
+        """
+        key로 진행 중인 작업이 있으면 그 결과를 기다리고, 없으면 func()가 돌려준 awaitable을 실행
+
+        Args:
+            key: 요청 식별 키 (request_key)
+            func: 인자 없이 awaitable(코루틴 등)을 돌려주는 함수 - leader 요청에서만 호출
+        """
+        self.requests += 1
+        flight = self._in_flight.get(key)
+        if flight is None:
+            task = asyncio.ensure_future(func())
+            flight = self._in_flight[key] = [task, 0]
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            self.executions += 1
+        else:
+            flight[1] += 1
+            self.coalesced += 1
+            self.max_waiters = max(self.max_waiters, flight[1])
+
+        # shield: 요청 하나가 취소돼도(연결 끊김) 공유 작업은 계속 실행
+        return await asyncio.shield(flight[0])
+
+    def stats(self):
+        """모니터링용 카운터"""
+        return {
+            "requests": self.requests,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+            "max_waiters": self.max_waiters,
+        }
@@ -2,23 +2,120 @@
 """
 Vercel Python Serverless Function - HWPX Generation API
 FastAPI 기반, HWPXGenerator를 사용하여 HWPX 문서 생성
+
+Cold start: lxml/HWPXGenerator import와 템플릿·스타일 로드는 첫 생성 요청까지 미루고,
+배포 시 만든 스냅샷(hwpx_snapshot.pickle)이 있으면 파싱 없이 그대로 사용한다.
 """
+import time
+
+_MODULE_START = time.perf_counter()
+
+import asyncio
+import json
 import os
 import re
 import sys
-import tempfile
+import threading
 from pathlib import Path
 from typing import List
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import Response
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
 
 # HWPXGenerator import를 위해 경로 추가
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT / "skills" / "4_hwpx_generation" / "src"))
 
-from hwpx_generator import HWPXGenerator
+from proposal_ir import Document, Paragraph, Section, Table  # 표준 라이브러리만 사용 (cold start 영향 없음)
+
+# api/_*.py 보조 모듈 (Vercel 함수로 만들어지지 않음)
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from _scheduler import PriorityScheduler, canonical_class
+from _singleflight import SingleFlight, request_key
+
+# 요청 본문 고속 디코딩 (msgspec/orjson, pydantic 검증 생략) - HWPX_FAST_DECODE=1일 때만
+FAST_DECODE = os.environ.get("HWPX_FAST_DECODE", "").lower() in ("1", "true", "yes")
+if FAST_DECODE:
+    from _fast_decode import DECODER, RequestDecodeError, decode_generate_request
+
+# 요청 단위 프로파일링 (X-Profile 헤더) - HWPX_PROFILE_TOKEN이 있을 때만, 없으면 라우트에서 확인도 안 함
+PROFILING = bool(os.environ.get("HWPX_PROFILE_TOKEN"))
+if PROFILING:
+    from _profiling import ProfileDenied, requested_mode, run_profiled
+
+# 시작 단계별 소요 시간 (ms) - /api/health에서 확인
+STARTUP_TIMINGS = {"module_import_ms": round((time.perf_counter() - _MODULE_START) * 1000, 1)}
+
+# 첫 생성 요청 시 채워지는 preset별 템플릿/스타일 풀 (hwpx_presets.PresetPool)
+_preset_pool = None
+_preset_pool_lock = threading.Lock()
+
+# 같은 내용으로 동시에 들어온 생성 요청은 한 번만 생성 (/api/health의 coalescing)
+generation_flight = SingleFlight()
+
+# 우선순위 클래스(interactive/normal/bulk)별 생성 순서·동시 실행 수 (/api/health의 scheduler)
+generation_scheduler = PriorityScheduler(
+    max_concurrency=int(os.environ.get("HWPX_MAX_CONCURRENCY", "2")),
+    aging_seconds=float(os.environ.get("HWPX_AGING_SECONDS", "5")),
+)
+
+
+# 회사 원천 자료 색인 (skills/2_company_data/corpus_index.py) - 첫 검색 요청 시 증분 색인
+_corpus_index = None
+_corpus_lock = threading.Lock()
+
+# RFP/참조 PDF 추출 캐시 (skills/1_rfp_analysis/pdf_extract.py) - 첫 분석 요청 시 생성
+_pdf_cache = None
+
+# 색상 마커 출처 검증 (skills/2_company_data/attribution.py)
+# off: 검증 안 함 / report: 응답 헤더로 결과만 / strict: 근거 없는 마커가 있으면 422
+# 기본값은 report, Vercel(VERCEL 환경변수)에서는 off - 서버리스 인스턴스는 응답 후 멈춰서
+# 백그라운드 색인 구성이 끝나지 않고 콜드 스타트만 늘어난다 (쓰려면 HWPX_ATTRIBUTION을 직접 지정)
+ATTRIBUTION_MODE = os.environ.get("HWPX_ATTRIBUTION", "off" if os.environ.get("VERCEL") else "report").lower()
+_attribution_index = None
+_attribution_thread = None
+_attribution_lock = threading.Lock()
+
+
+def get_preset_pool():
+    """HWPXGenerator import + 스냅샷(없으면 원본 파일) 로드 + 모든 preset 준비 - 프로세스당 한 번"""
+    global _preset_pool
+    if _preset_pool is not None:
+        return _preset_pool
+
+    with _preset_pool_lock:
+        if _preset_pool is None:
+            _preset_pool = _create_preset_pool()
+    return _preset_pool
+
+
+def _create_preset_pool():
+    start = time.perf_counter()
+    from hwpx_presets import PresetPool
+    from hwpx_snapshot import load_snapshot
+    STARTUP_TIMINGS["generator_import_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+    start = time.perf_counter()
+    sources = load_snapshot(PROJECT_ROOT)
+    pool = PresetPool(PROJECT_ROOT, sources=sources)
+    STARTUP_TIMINGS["preset_compile_ms"] = pool.preload()
+    STARTUP_TIMINGS["runtime_init_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    STARTUP_TIMINGS["snapshot"] = sorted(sources) if sources is not None else "none"
+    if sources is None:
+        print("[Startup] WARNING: 스냅샷 없음 - 템플릿/스타일을 원본 파일에서 로드 (빌드 로그의 [Snapshot] 확인)")
+    print(f"[Startup] {STARTUP_TIMINGS}")
+    return pool
+
+
+def snapshot_status():
+    """스냅샷으로 로드한 preset 목록, 스냅샷이 없으면 "none" (preset 풀을 만들기 전에는 파일 유무만)"""
+    if "snapshot" in STARTUP_TIMINGS:
+        return STARTUP_TIMINGS["snapshot"]
+    from hwpx_snapshot import DEFAULT_SNAPSHOT_PATH
+    return "pending" if DEFAULT_SNAPSHOT_PATH.exists() else "none"
+
 
 app = FastAPI()
 
@@ -44,9 +141,31 @@ class GenerateRequest(BaseModel):
     date: str = ""
     model: str = "unknown"
     preset: str = "제안서"
+    priority: str = ""  # interactive | normal | bulk (X-Priority 헤더가 우선)
 
 
-# --- HTML Preprocessing (Node.js route.ts 로직을 Python으로 이식) ---
+class CorpusQueryRequest(BaseModel):
+    queries: List[str]  # 섹션 제목/프롬프트 - 질의마다 따로 검색
+    top_k: int = 5
+
+
+class MergeRequest(BaseModel):
+    """문서 병합 요청 - HWPX 파일(base64)을 합칠 순서대로, 첫 파일이 기준 (페이지 설정/메타데이터)"""
+    files: List[str]
+    filename: str = "병합_문서.hwpx"
+
+
+class StreamHeader(BaseModel):
+    """스트리밍 생성 요청 첫 줄 (GenerateRequest에서 sections 제외)"""
+    title: str
+    organization: str = "Architect PRO"
+    date: str = ""
+    model: str = "unknown"
+    preset: str = "제안서"
+    priority: str = ""
+
+
+# --- HTML Preprocessing (Node.js lib/hwpx-preprocess.mjs 로직을 Python으로 이식, 차이는 scripts/preprocess_parity.py로 확인) ---
 
 def parse_html_with_color_markers(html: str) -> str:
     """HTML span 태그를 {{color:text}} 마커로 변환하고 나머지 HTML 제거"""
@@ -261,7 +380,7 @@ def clean_paragraph_text(text: str) -> str:
 
 
 def text_to_items(text: str) -> list:
-    """텍스트를 문단 아이템 리스트로 변환"""
+    """텍스트를 문단 아이템(proposal_ir.Paragraph) 리스트로 변환"""
     # 줄바꿈으로 문단 분리
     text = re.sub(r'\n{2,}', '\n', text)
     paragraphs = [p.strip() for p in text.split('\n') if p.strip()]
@@ -270,158 +389,656 @@ def text_to_items(text: str) -> list:
     for para in paragraphs:
         cleaned = clean_paragraph_text(para)
         if cleaned:
-            items.append({
-                'level': infer_paragraph_level(cleaned),
-                'text': cleaned,
-                'color': 'default',
-                'source': 'generated'
-            })
+            items.append(Paragraph(cleaned, infer_paragraph_level(cleaned)))
     return items
 
 
-def preprocess_sections(sections: list, metadata: dict) -> dict:
-    """프론트엔드에서 받은 섹션 데이터를 HWPXGenerator용 JSON으로 변환"""
+def preprocess_section(idx: int, section_title: str, section_html: str) -> list:
+    """
+    섹션 하나(idx: 0부터 시작하는 섹션 순번)를 content 항목(Section/Table) 목록으로 변환
+
+    표가 있으면 표 앞뒤 텍스트를 section{n}, section{n}_part{k} 항목으로 나눈다.
+    """
     content_array = []
+    parts = extract_tables_and_text(section_html)
+
+    section_items = []
+    table_counter = 0
+
+    for part in parts:
+        if part['type'] == 'text':
+            items = text_to_items(part['content'])
+            section_items.extend(items)
+        elif part['type'] == 'table':
+            # 표 앞 텍스트가 있으면 먼저 섹션으로 추가
+            if section_items:
+                content_array.append(Section(
+                    section_title if table_counter == 0 else '',
+                    section_items,
+                    id=f'section{idx + 1}{"_part" + str(table_counter) if table_counter > 0 else ""}',
+                ))
+                section_items = []
+            elif table_counter == 0 and section_title:
+                content_array.append(Section(section_title, id=f'section{idx + 1}'))
+
+            table_counter += 1
+            content_array.append(Table(
+                part['data']['headers'],
+                part['data']['rows'],
+                id=f'table_s{idx + 1}_{table_counter}',
+            ))
+
+    # 남은 텍스트
+    if section_items:
+        suffix = f'_part{table_counter + 1}' if table_counter > 0 else ''
+        content_array.append(Section(
+            section_title if table_counter == 0 else '',
+            section_items,
+            id=f'section{idx + 1}{suffix}',
+        ))
+
+    # 빈 섹션
+    if table_counter == 0 and not section_items:
+        content_array.append(Section(section_title, id=f'section{idx + 1}'))
+
+    return content_array
+
+
+def section_fields(section) -> tuple:
+    """{'title','text'} dict 또는 title/text 속성을 가진 객체(요청 모델) → (title, text)"""
+    if isinstance(section, dict):
+        return section.get('title', ''), section.get('text', '') or ''
+    return section.title, section.text or ''
+
+
+def preprocess_sections(sections: list, metadata: dict) -> Document:
+    """
+    프론트엔드에서 받은 섹션 데이터를 HWPXGenerator용 문서(proposal_ir.Document)로 변환
+
+    sections는 {'title','text'} dict 또는 title/text 속성을 가진 객체(요청 모델) 목록.
+    metadata['total_chars']는 같은 순회에서 채운다.
+    """
+    content_array = []
+    total_chars = 0
 
     for idx, section in enumerate(sections):
-        section_html = section.get('text', '') or ''
-        parts = extract_tables_and_text(section_html)
-
-        section_items = []
-        table_counter = 0
-
-        for part in parts:
-            if part['type'] == 'text':
-                items = text_to_items(part['content'])
-                section_items.extend(items)
-            elif part['type'] == 'table':
-                # 표 앞 텍스트가 있으면 먼저 섹션으로 추가
-                if section_items:
-                    content_array.append({
-                        'type': 'section',
-                        'id': f'section{idx + 1}{"_part" + str(table_counter) if table_counter > 0 else ""}',
-                        'title': section.get('title', '') if table_counter == 0 else '',
-                        'items': section_items
-                    })
-                    section_items = []
-                elif table_counter == 0 and section.get('title'):
-                    content_array.append({
-                        'type': 'section',
-                        'id': f'section{idx + 1}',
-                        'title': section.get('title', ''),
-                        'items': []
-                    })
-
-                table_counter += 1
-                content_array.append({
-                    'type': 'table',
-                    'id': f'table_s{idx + 1}_{table_counter}',
-                    'title': '',
-                    'headers': part['data']['headers'],
-                    'rows': part['data']['rows']
-                })
-
-        # 남은 텍스트
-        if section_items:
-            suffix = f'_part{table_counter + 1}' if table_counter > 0 else ''
-            content_array.append({
-                'type': 'section',
-                'id': f'section{idx + 1}{suffix}',
-                'title': section.get('title', '') if table_counter == 0 else '',
-                'items': section_items
-            })
-
-        # 빈 섹션
-        if table_counter == 0 and not section_items:
-            content_array.append({
-                'type': 'section',
-                'id': f'section{idx + 1}',
-                'title': section.get('title', ''),
-                'items': []
-            })
+        section_title, section_html = section_fields(section)
+        total_chars += len(section_html)
+        content_array.extend(preprocess_section(idx, section_title, section_html))
 
-    return {
-        'metadata': metadata,
-        'content': content_array
-    }
+    metadata['total_chars'] = total_chars
+    return Document(metadata, content_array)
 
 
 # --- API Endpoints ---
 
 @app.get("/api/health")
 async def health():
-    return {"status": "ok", "generator": "HWPXGenerator"}
+    return {
+        "status": "ok",
+        "generator": "HWPXGenerator",
+        "decoder": DECODER if FAST_DECODE else "pydantic",
+        "startup": STARTUP_TIMINGS,
+        "snapshot": snapshot_status(),
+        "coalescing": generation_flight.stats(),
+        "scheduler": generation_scheduler.stats(),
+        "corpus": _corpus_index.stats() if _corpus_index is not None else None,
+        "attribution": {
+            "mode": ATTRIBUTION_MODE,
+            "index": _attribution_index.stats() if _attribution_index is not None else None,
+        },
+    }
+
+
+@app.get("/api/ready")
+async def ready():
+    """준비 확인 (자체 호스팅 prefork 서버/로드 밸런서용) - preset 풀이 준비되기 전에는 503"""
+    if _preset_pool is None:
+        return JSONResponse({"ready": False, "pid": os.getpid()}, status_code=503)
+    return {"ready": True, "pid": os.getpid(), "startup": STARTUP_TIMINGS}
+
+
+def get_corpus_index():
+    """
+    원천 자료 색인 열기 + 증분 색인 (프로세스당 한 번)
+
+    COMPANY_DATA_DIR(기본: assets/3-rawdata)을 COMPANY_DATA_INDEX(기본: 임시 폴더, Vercel은 /tmp만 쓰기 가능)에 색인.
+    """
+    global _corpus_index
+    with _corpus_lock:
+        if _corpus_index is None:
+            import tempfile
+            sys.path.insert(0, str(PROJECT_ROOT / "skills" / "2_company_data"))
+            from corpus_index import CorpusIndex
+
+            index = CorpusIndex(os.environ.get("COMPANY_DATA_INDEX")
+                                or Path(tempfile.gettempdir()) / "company_data_index.sqlite")
+            stats = index.update(os.environ.get("COMPANY_DATA_DIR") or PROJECT_ROOT / "assets" / "3-rawdata")
+            print(f"[Corpus] 색인 +{stats['added']} ~{stats['updated']} -{stats['removed']} "
+                  f"={stats['unchanged']} -> {stats['chunks']} chunks ({stats['seconds']}s)")
+            _corpus_index = index
+    return _corpus_index
+
+
+def query_corpus(queries, top_k):
+    index = get_corpus_index()
+    from corpus_index import format_context
+
+    with _corpus_lock:  # 연결 하나를 스레드끼리 공유
+        results = index.query_sections(queries, top_k)
+    return [{"query": query, "hits": hits, "context": format_context(hits)}
+            for query, hits in zip(queries, results)]
+
+
+def get_pdf_cache():
+    """PDF 추출 캐시 (RFP_CACHE_DIR, 기본: 임시 폴더) - 프로세스당 한 번"""
+    global _pdf_cache
+    if _pdf_cache is None:
+        sys.path.insert(0, str(PROJECT_ROOT / "skills" / "1_rfp_analysis"))
+        from pdf_extract import PdfCache
+        _pdf_cache = PdfCache()
+    return _pdf_cache
+
+
+def _build_attribution_index():
+    global _attribution_index
+    try:
+        from attribution import AttributionIndex
+        start = time.perf_counter()
+        index = AttributionIndex.from_sources(get_corpus_index(), PROJECT_ROOT / "assets" / "2-reference",
+                                              get_pdf_cache())
+        print(f"[Attribution] 색인 {index.stats()} ({(time.perf_counter() - start) * 1000:.0f}ms)")
+        _attribution_index = index
+    except Exception as e:
+        print(f"[Attribution] 색인 실패: {e}")
+
+
+def get_attribution_index(wait=False):
+    """
+    마커 검증용 n-gram 색인 - 첫 호출 때 백그라운드 스레드에서 구성
+
+    wait=False면 준비되지 않았을 때 None (생성 요청은 기다리지 않고 검증만 건너뜀).
+    """
+    global _attribution_thread
+    if _attribution_index is not None or ATTRIBUTION_MODE == "off":
+        return _attribution_index
+    with _attribution_lock:
+        if _attribution_thread is None:
+            sys.path.insert(0, str(PROJECT_ROOT / "skills" / "2_company_data"))
+            _attribution_thread = threading.Thread(target=_build_attribution_index, daemon=True)
+            _attribution_thread.start()
+    if wait:
+        _attribution_thread.join()
+    return _attribution_index
+
+
+def prepare_for_fork():
+    """
+    fork 전에 공유할 상태를 모두 준비 (api/_server.py prefork 마스터에서 호출)
+
+    preset 풀(lxml, 템플릿, 스타일), 폰트 파일, 출처 검증 색인을 만들고
+    SQLite 연결처럼 fork 후에 공유하면 안 되는 것은 닫는다 (worker가 처음 쓸 때 다시 연다).
+
+    Returns:
+        단계별 소요 시간(ms) dict
+    """
+    global _corpus_index
+    timings = {}
+    start = time.perf_counter()
+    get_preset_pool()
+    timings["preset_pool_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+    start = time.perf_counter()
+    from hwpx_generator import preload_fonts
+    fonts, font_bytes = preload_fonts(PROJECT_ROOT)
+    timings["fonts"] = {"files": fonts, "bytes": font_bytes, "ms": round((time.perf_counter() - start) * 1000, 1)}
+
+    if ATTRIBUTION_MODE != "off":
+        start = time.perf_counter()
+        get_attribution_index(wait=True)
+        timings["attribution_index_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+    with _corpus_lock:
+        if _corpus_index is not None:
+            _corpus_index.close()
+            _corpus_index = None
+    return timings
+
+
+class AttributionError(Exception):
+    """strict 모드에서 근거 없는 색상 마커가 있을 때 (report: AttributionReport.to_dict())"""
+
+    def __init__(self, report):
+        super().__init__(f"{report['counts'].get('unsupported', 0)} unsupported marker(s)")
+        self.report = report
+
+
+def new_attribution_report():
+    """
+    검증 색인이 준비됐으면 빈 AttributionReport, 아니면 None
+
+    strict 모드는 색인이 준비될 때까지 기다리고, 그래도 없으면 503 (검증 없이 통과시키지 않음).
+    """
+    strict = ATTRIBUTION_MODE == "strict"
+    index = get_attribution_index(wait=strict)
+    if index is None:
+        if strict:
+            raise HTTPException(status_code=503, detail="검증 색인을 만들 수 없습니다 (strict 모드)")
+        return None
+    from attribution import AttributionReport
+    return AttributionReport(index)
+
+
+def check_attribution(report):
+    """strict 모드에서 근거 없는 마커가 있으면 AttributionError"""
+    if report is not None and ATTRIBUTION_MODE == "strict" and report.unsupported:
+        raise AttributionError(report.to_dict())
+
+
+@app.post("/api/verify-attribution")
+async def verify_attribution(req: GenerateRequest):
+    """
+    색상 마커 출처 검증 API - 생성 요청과 같은 본문, 모든 마커의 판정 결과
+
+    red 마커는 원천 자료(assets/3-rawdata), green 마커는 참조 제안서(assets/2-reference)에서 찾는다.
+    """
+    def run():
+        get_attribution_index(wait=True)
+        report = new_attribution_report()
+        if report is None:
+            raise HTTPException(status_code=503, detail="검증 색인을 만들 수 없습니다")
+        metadata = {}
+        return report.check_document(preprocess_sections(req.sections, metadata)).to_dict(include_all=True)
+
+    return await asyncio.to_thread(run)
+
 
+@app.post("/api/rfp/analyze")
+async def analyze_rfp(request: Request):
+    """
+    RFP PDF 뼈대 분석 API - 요청 본문은 PDF 파일 그대로 (application/pdf)
 
-@app.post("/api/generate-hwpx")
-async def generate_hwpx(req: GenerateRequest):
-    """HWPX 문서 생성 API - HWPXGenerator 기반"""
-    temp_output = None
+    같은 내용의 PDF는 추출 캐시에 적중해 다시 파싱하지 않는다.
+    응답 sections는 /api/hwpx/analyze와 같은 {id, title, depth} (+ page).
+    """
+    data = await request.body()
+    if not data.startswith(b"%PDF"):
+        raise HTTPException(status_code=400, detail="PDF 파일 본문이 필요합니다")
     try:
-        # 1. 메타데이터 구성
+        extraction = await asyncio.to_thread(get_pdf_cache().extract, data)
+    except ImportError as e:
+        raise HTTPException(status_code=501, detail=f"PDF 추출 모듈 미설치: {e.name}")
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "sections": extraction.backbone(),
+        "pages": extraction.page_count,
+        "cached": extraction.cached,
+    }
+
+
+@app.post("/api/company-data/query")
+async def query_company_data(req: CorpusQueryRequest):
+    """
+    원천 자료 검색 API - 질의(섹션)마다 관련도 상위 top_k 청크
+
+    context는 AI 생성 요청의 sourceData로 그대로 넘길 수 있는 텍스트 ([파일 위치] 청크).
+    """
+    top_k = max(1, min(req.top_k, 50))
+    try:
+        return {"results": await asyncio.to_thread(query_corpus, req.queries, top_k)}
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+if FAST_DECODE:
+    @app.post("/api/generate-hwpx")
+    async def generate_hwpx(request: Request):
+        """HWPX 문서 생성 API - 요청 본문을 _fast_decode 구조체로 직접 디코딩"""
+        try:
+            req = decode_generate_request(await request.body())
+        except RequestDecodeError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        if PROFILING and "x-profile" in request.headers:
+            return await build_profile_response(req, request)
+        return await build_hwpx_response(req, request.headers.get("X-Priority"))
+else:
+    @app.post("/api/generate-hwpx")
+    async def generate_hwpx(req: GenerateRequest, request: Request):
+        """HWPX 문서 생성 API - HWPXGenerator 기반"""
+        if PROFILING and "x-profile" in request.headers:
+            return await build_profile_response(req, request)
+        return await build_hwpx_response(req, request.headers.get("X-Priority"))
+
+
+def generate_hwpx_bytes(req, date_str):
+    """요청 → (네임스페이스까지 수정한 HWPX bytes, AttributionReport 또는 None) (동기, 스레드에서 실행)"""
+    # 1. 메타데이터 구성 (total_chars는 전처리 중에 채움)
+    metadata = {
+        'title': req.title or '제안서',
+        'organization': req.organization,
+        'date': date_str,
+        'model': req.model,
+        'preset': req.preset,
+    }
+
+    # 2. HTML 전처리 → HWPXGenerator용 IR 변환 (요청 객체의 sections를 복사 없이 사용)
+    proposal_doc = preprocess_sections(req.sections, metadata)
+
+    # 3. 색상 마커 출처 검증 (색인 준비 전이면 건너뜀, strict 모드는 색인을 기다리고 생성 전에 중단)
+    attribution = None
+    if ATTRIBUTION_MODE != "off":
+        attribution = new_attribution_report()
+        if attribution is not None:
+            attribution.check_document(proposal_doc)
+            check_attribution(attribution)
+
+    # 4. HWPX 생성 (메모리에서 생성, 임시 파일 없음)
+    gen = get_preset_pool().generator(req.preset, embed_fonts=False)
+    hwpx_bytes = gen.generate_bytes(proposal_doc)
+
+    # 5. 네임스페이스 수정 (fix_hwpx_namespaces)
+    return fix_hwpx_namespaces(hwpx_bytes), attribution
+
+
+async def build_hwpx_response(req, priority=None):
+    """
+    요청(GenerateRequest 또는 _fast_decode.FastGenerateRequest) → HWPX 응답
+
+    priority(X-Priority 헤더) 또는 req.priority로 우선순위 클래스를 고르고,
+    응답 헤더 X-Priority-Class / X-Queue-Time-Ms로 클래스와 대기 시간을 알려준다.
+    """
+    arrived = time.perf_counter()
+    try:
+        priority_class = canonical_class(priority or req.priority)
         date_str = req.date or __import__('datetime').datetime.now().strftime('%Y. %m. %d.')
-        total_chars = sum(len(s.text or '') for s in req.sections)
 
-        metadata = {
-            'title': req.title or '제안서',
-            'organization': req.organization,
-            'date': date_str,
-            'model': req.model,
-            'preset': req.preset,
-            'total_chars': total_chars
+        # 생성 결과에 영향을 주는 필드와 우선순위 클래스가 모두 같은 동시 요청은 진행 중인 생성 하나를 공유
+        # (클래스가 다르면 합치지 않음 - interactive 요청이 bulk 순서로 기다리지 않도록)
+        key = request_key(priority_class, req.title, req.organization, date_str, req.model, req.preset,
+                          [(section.title, section.text) for section in req.sections])
+        (hwpx_bytes, attribution), ticket = await generation_flight.run(key, lambda: generation_scheduler.submit(
+            priority_class, lambda: generate_hwpx_bytes(req, date_str)))
+        # 합쳐진 요청은 공유 작업이 시작될 때까지를 대기 시간으로 (자기 도착 시각 기준)
+        queue_ms = round(max(0.0, ticket.started - arrived) * 1000, 1)
+        return hwpx_response(hwpx_bytes, req, date_str, ticket.priority_class, queue_ms, attribution)
+
+    except HTTPException:
+        raise
+    except AttributionError as e:
+        raise HTTPException(status_code=422, detail={"error": str(e), "attribution": e.report})
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def build_profile_response(req, request):
+    """
+    X-Profile 요청 → 생성을 프로파일러 + tracemalloc 아래 실행한 JSON 보고서 (api/_profiling.py)
+
+    요청 합치기는 거치지 않고(다른 요청과 결과를 공유하지 않음) 스케줄러 슬롯만 받는다.
+    X-Profile-Include-Hwpx: 1이면 생성된 HWPX를 base64로 함께 돌려준다.
+    """
+    try:
+        mode = requested_mode(request.headers)
+    except ProfileDenied as e:
+        raise HTTPException(status_code=403, detail=str(e))
+
+    priority_class = canonical_class(request.headers.get("X-Priority") or req.priority)
+    date_str = req.date or __import__('datetime').datetime.now().strftime('%Y. %m. %d.')
+    try:
+        ((hwpx_bytes, attribution), report), ticket = await generation_scheduler.submit(
+            priority_class, lambda: run_profiled(lambda: generate_hwpx_bytes(req, date_str), mode))
+    except HTTPException:
+        raise
+    except AttributionError as e:
+        raise HTTPException(status_code=422, detail={"error": str(e), "attribution": e.report})
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+    import hashlib
+    hwpx = {"bytes": len(hwpx_bytes), "sha256": hashlib.sha256(hwpx_bytes).hexdigest()}
+    if request.headers.get("X-Profile-Include-Hwpx", "").lower() in ("1", "true", "yes"):
+        import base64
+        hwpx["base64"] = base64.b64encode(hwpx_bytes).decode("ascii")
+    print(f"[Profile] {mode}: {report['wall_ms']}ms, peak {report['peak_traced_mb']}MB, "
+          f"{len(req.sections)} sections")
+    return JSONResponse({
+        "profile": report,
+        "request": {"sections": len(req.sections), "chars": sum(len(s.text or "") for s in req.sections),
+                    "preset": req.preset, "priority_class": priority_class, "queue_ms": ticket.queue_ms},
+        "attribution": attribution.to_dict() if attribution is not None else None,
+        "hwpx": hwpx,
+    })
+
+
+def hwpx_response(hwpx_bytes, req, date_str, priority_class, queue_ms, attribution=None):
+    """
+    HWPX 다운로드 응답 (파일명: {preset}_{model}_{date}.hwpx)
+
+    attribution(AttributionReport)이 있으면 X-Attribution-* 헤더로 검증 결과 요약
+    (상세 목록은 /api/verify-attribution).
+    """
+    # 파일명 생성 (한국어 파일명은 RFC 5987 형식으로 인코딩)
+    safe_date = date_str.replace('. ', '-').replace('.', '')
+    filename = f"{req.preset}_{req.model}_{safe_date}.hwpx"
+    from urllib.parse import quote
+    filename_encoded = quote(filename)
+
+    return Response(
+        content=hwpx_bytes,
+        media_type="application/vnd.hancom.hwpx+zip",
+        headers={
+            "Content-Disposition": f"attachment; filename*=UTF-8''{filename_encoded}",
+            "X-Priority-Class": priority_class,
+            "X-Queue-Time-Ms": str(queue_ms),
+            **attribution_headers(attribution),
         }
+    )
+
+
+def attribution_headers(attribution):
+    if ATTRIBUTION_MODE == "off":
+        return {}
+    if attribution is None:
+        return {"X-Attribution": "pending"}  # 색인 준비 중
+    report = attribution.to_dict()
+    return {
+        "X-Attribution": "checked",
+        "X-Attribution-Checked": str(report["checked"]),
+        "X-Attribution-Unsupported": str(report["counts"].get("unsupported", 0)),
+        "X-Attribution-Ms": str(report["ms"]),
+    }
+
+
+# --- Streaming (NDJSON) ---
 
-        # 2. HTML 전처리 → HWPXGenerator용 JSON 변환
-        sections_data = [{'title': s.title, 'text': s.text} for s in req.sections]
-        proposal_json = preprocess_sections(sections_data, metadata)
+class StreamingProposal:
+    """
+    스트리밍 요청 한 건의 문서 - 섹션이 도착하는 대로 전처리 + 렌더링 (메서드는 스레드에서 호출)
 
-        # 3. HWPX 생성
-        base_dir = str(PROJECT_ROOT)
-        gen = HWPXGenerator(base_dir=base_dir, embed_fonts=False)
+    섹션 ID(section{n}, table_s{n}_{k})와 생성 결과는 같은 섹션들을 한 번에 보낸 요청과 같다.
+    """
 
-        # 임시 출력 파일
-        fd, temp_output = tempfile.mkstemp(suffix='.hwpx')
-        os.close(fd)
+    def __init__(self, header, date_str):
+        self.metadata = {
+            'title': header.title or '제안서',
+            'organization': header.organization,
+            'date': date_str,
+            'model': header.model,
+            'preset': header.preset,
+            'total_chars': 0,
+        }
+        gen = get_preset_pool().generator(header.preset, embed_fonts=False)
+        self.document = gen.begin_document(self.metadata)
+        self.section_count = 0
+        self.attribution = new_attribution_report() if ATTRIBUTION_MODE != "off" else None
+
+    def add_section(self, section_title, section_html):
+        for item in preprocess_section(self.section_count, section_title, section_html):
+            if self.attribution is not None:
+                self.attribution.check_item(item)
+            self.document.add(item)
+        self.section_count += 1
+        self.metadata['total_chars'] += len(section_html)
+
+    def finish(self):
+        return fix_hwpx_namespaces(self.document.finish())
+
+
+async def ndjson_lines(request):
+    """요청 본문을 받는 대로 줄 단위(bytes)로 (빈 줄 제외)"""
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
+
+
+def parse_stream_section(line, index):
+    """NDJSON 섹션 한 줄 → (title, text) - 형식이 틀리면 422"""
+    try:
+        section = json.loads(line)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Line {index + 2}: invalid JSON ({e})")
+    if not isinstance(section, dict) or not isinstance(section.get('title'), str) \
+            or not isinstance(section.get('text'), str):
+        raise HTTPException(status_code=422, detail=f"Line {index + 2}: expected {{\"title\": str, \"text\": str}}")
+    return section['title'], section['text']
+
+
+@app.post("/api/generate-hwpx/stream")
+async def generate_hwpx_stream(request: Request):
+    """
+    NDJSON 스트리밍 생성 API - 업로드와 생성을 겹쳐서 처리
+
+    첫 줄: {"title", "organization", "date", "model", "preset", "priority"} (StreamHeader)
+    이후 한 줄에 섹션 하나: {"title", "text"}
+    섹션은 도착하는 대로 스레드에서 전처리/렌더링하고, 스트림이 닫히면 HWPX로 묶어 응답한다.
+    같은 내용 요청 합치기는 적용되지 않는다 (끝까지 받아야 내용을 알 수 있음).
+    """
+    arrived = time.perf_counter()
+    lines = ndjson_lines(request)
+    try:
+        header = StreamHeader(**json.loads(await lines.__anext__()))
+    except StopAsyncIteration:
+        raise HTTPException(status_code=422, detail="Empty stream: first line must be the document header")
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=422, detail=f"Line 1: invalid header ({e})")
+
+    priority_class = canonical_class(request.headers.get("X-Priority") or header.priority)
+    date_str = header.date or __import__('datetime').datetime.now().strftime('%Y. %m. %d.')
+
+    # 읽기(이 코루틴)와 렌더링(worker 태스크 → 스레드)을 큐로 분리해 업로드 중에도 생성 진행
+    queue = asyncio.Queue(maxsize=16)
+
+    async def render():
+        proposal = await asyncio.to_thread(StreamingProposal, header, date_str)
+        while (section := await queue.get()) is not None:
+            await asyncio.to_thread(proposal.add_section, *section)
+        return proposal
+
+    worker = asyncio.create_task(render())
+
+    async def feed(item):
+        """큐에 넣기 - 큐가 찬 채로 worker가 오류로 끝나면 기다리지 않고 False"""
+        put = asyncio.ensure_future(queue.put(item))
+        await asyncio.wait({put, worker}, return_when=asyncio.FIRST_COMPLETED)
+        if put.done():
+            return True
+        put.cancel()
+        return False
+
+    try:
+        index = 0
+        async for line in lines:
+            section = parse_stream_section(line, index)
+            if worker.done() or not await feed(section):
+                break  # 렌더링 오류 - 아래 await worker에서 전달
+            index += 1
+        if not worker.done():
+            await feed(None)
+        proposal = await worker
+        check_attribution(proposal.attribution)
+
+        hwpx_bytes, ticket = await generation_scheduler.submit(priority_class, proposal.finish)
+        print(f"[Stream] {proposal.section_count} sections, {proposal.metadata['total_chars']} chars, "
+              f"{(time.perf_counter() - arrived) * 1000:.0f}ms")
+        return hwpx_response(hwpx_bytes, header, date_str, priority_class,
+                             round((ticket.started - ticket.enqueued) * 1000, 1), proposal.attribution)
+
+    except HTTPException:
+        raise
+    except AttributionError as e:
+        raise HTTPException(status_code=422, detail={"error": str(e), "attribution": e.report})
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        worker.cancel()
 
-        gen.generate(proposal_json, temp_output)
 
-        # 4. 네임스페이스 수정 (fix_hwpx_namespaces)
-        fix_hwpx_namespaces(temp_output)
+@app.post("/api/merge-hwpx")
+async def merge_hwpx_documents(req: MergeRequest):
+    """
+    HWPX 문서 병합 API - 따로 생성한 장별 .hwpx를 다시 렌더링하지 않고 한 문서로
 
-        # 5. 파일 읽기 및 반환
-        with open(temp_output, 'rb') as f:
-            hwpx_bytes = f.read()
+    header의 폰트/charPr/paraPr/borderFill 등은 내용이 같으면 합치고 ID를 다시 매기며,
+    각 문서의 section은 순서대로 이어 붙인다 (hwpx_merge.merge_hwpx).
+    """
+    import base64
+    import binascii
+    import zipfile
 
-        # 파일명 생성 (한국어 파일명은 RFC 5987 형식으로 인코딩)
-        safe_date = date_str.replace('. ', '-').replace('.', '')
-        filename = f"{req.preset}_{req.model}_{safe_date}.hwpx"
-        from urllib.parse import quote
-        filename_encoded = quote(filename)
+    if len(req.files) < 2:
+        raise HTTPException(status_code=422, detail="병합할 HWPX 파일이 2개 이상 필요합니다")
+    try:
+        sources = [base64.b64decode(data, validate=True) for data in req.files]
+    except binascii.Error as e:
+        raise HTTPException(status_code=400, detail=f"base64 디코딩 실패: {e}")
+    for number, data in enumerate(sources, 1):
+        if not data.startswith(b"PK"):
+            raise HTTPException(status_code=400, detail=f"{number}번째 파일이 HWPX(ZIP)가 아닙니다")
 
-        return Response(
-            content=hwpx_bytes,
-            media_type="application/vnd.hancom.hwpx+zip",
-            headers={
-                "Content-Disposition": f"attachment; filename*=UTF-8''{filename_encoded}"
-            }
-        )
+    def run():
+        from hwpx_merge import merge_hwpx
+        return merge_hwpx(sources)
 
+    try:
+        merged = await asyncio.to_thread(run)
+    except zipfile.BadZipFile as e:
+        raise HTTPException(status_code=400, detail=f"HWPX(ZIP)를 읽을 수 없습니다: {e}")
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
-    finally:
-        # 임시 파일 정리
-        if temp_output and os.path.exists(temp_output):
-            try:
-                os.unlink(temp_output)
-            except Exception:
-                pass
+    from urllib.parse import quote
+    filename = req.filename if req.filename.endswith(".hwpx") else f"{req.filename}.hwpx"
+    return Response(
+        content=merged,
+        media_type="application/vnd.hancom.hwpx+zip",
+        headers={"Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}"},
+    )
 
 
-def fix_hwpx_namespaces(hwpx_path: str):
-    """HWPX 파일의 네임스페이스를 표준 prefix로 수정"""
+def fix_hwpx_namespaces(hwpx_bytes: bytes) -> bytes:
+    """HWPX bytes의 네임스페이스를 표준 prefix로 수정 (수정할 것이 없으면 재압축 없이 그대로 반환)"""
+    import io
     import zipfile
 
     NS_MAP = {
@@ -430,22 +1047,29 @@ def fix_hwpx_namespaces(hwpx_path: str):
         "http://www.hancom.co.kr/hwpml/2011/paragraph": "hp",
         "http://www.hancom.co.kr/hwpml/2011/section": "hs",
     }
-    tmp_path = hwpx_path + ".tmp"
-    with zipfile.ZipFile(hwpx_path, "r") as zin:
-        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as zout:
+    fixed = {}
+    with zipfile.ZipFile(io.BytesIO(hwpx_bytes), "r") as zin:
+        for item in zin.infolist():
+            if item.filename.startswith("Contents/") and item.filename.endswith(".xml"):
+                text = zin.read(item.filename).decode("utf-8")
+                ns_aliases = {}
+                for match in re.finditer(r'xmlns:(ns\d+)="([^"]+)"', text):
+                    alias, uri = match.group(1), match.group(2)
+                    if uri in NS_MAP:
+                        ns_aliases[alias] = NS_MAP[uri]
+                if not ns_aliases:
+                    continue
+                for old_prefix, new_prefix in ns_aliases.items():
+                    text = text.replace(f"xmlns:{old_prefix}=", f"xmlns:{new_prefix}=")
+                    text = text.replace(f"<{old_prefix}:", f"<{new_prefix}:")
+                    text = text.replace(f"</{old_prefix}:", f"</{new_prefix}:")
+                fixed[item.filename] = text.encode("utf-8")
+
+        if not fixed:
+            return hwpx_bytes
+
+        out = io.BytesIO()
+        with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as zout:
             for item in zin.infolist():
-                data = zin.read(item.filename)
-                if item.filename.startswith("Contents/") and item.filename.endswith(".xml"):
-                    text = data.decode("utf-8")
-                    ns_aliases = {}
-                    for match in re.finditer(r'xmlns:(ns\d+)="([^"]+)"', text):
-                        alias, uri = match.group(1), match.group(2)
-                        if uri in NS_MAP:
-                            ns_aliases[alias] = NS_MAP[uri]
-                    for old_prefix, new_prefix in ns_aliases.items():
-                        text = text.replace(f"xmlns:{old_prefix}=", f"xmlns:{new_prefix}=")
-                        text = text.replace(f"<{old_prefix}:", f"<{new_prefix}:")
-                        text = text.replace(f"</{old_prefix}:", f"</{new_prefix}:")
-                    data = text.encode("utf-8")
-                zout.writestr(item, data)
-    os.replace(tmp_path, hwpx_path)
+                zout.writestr(item, fixed.get(item.filename) or zin.read(item.filename))
+    return out.getvalue()
@@ -9,6 +9,35 @@ function cn(...inputs: ClassValue[]) {
     return twMerge(clsx(inputs));
 }
 
+// fetch 요청 본문 스트리밍 지원 여부 (미지원 브라우저는 duplex를 읽지 않고 본문을 문자열로 바꿈)
+function supportsRequestStreams() {
+    let duplexAccessed = false;
+    const hasContentType = new Request("", {
+        body: new ReadableStream(),
+        method: "POST",
+        get duplex() {
+            duplexAccessed = true;
+            return "half";
+        },
+    } as RequestInit).headers.has("Content-Type");
+    return duplexAccessed && !hasContentType;
+}
+
+// 객체 목록 → 한 줄에 하나씩 보내는 NDJSON 요청 본문
+function ndjsonStream(lines: object[]) {
+    const encoder = new TextEncoder();
+    let index = 0;
+    return new ReadableStream<Uint8Array>({
+        pull(controller) {
+            if (index < lines.length) {
+                controller.enqueue(encoder.encode(JSON.stringify(lines[index++]) + "\n"));
+            } else {
+                controller.close();
+            }
+        },
+    });
+}
+
 
 interface Section {
     id: string;
@@ -231,7 +260,7 @@ export default function ProposalWorkbench({
         try {
             const response = await fetch(hwpxApiUrl, {
                 method: "POST",
-                headers: { "Content-Type": "application/json" },
+                headers: { "Content-Type": "application/json", "X-Priority": "interactive" },
                 body: JSON.stringify({
                     title: section.title,
                     sections: [{ title: section.title, text: contents[id] }],
@@ -276,22 +305,43 @@ export default function ProposalWorkbench({
         const presetName = `${Math.floor(presetValue / 10000)}만자`; // e.g., "20만자", "10만자"
         const timestamp = new Date().toLocaleDateString("ko-KR").replace(/\. /g, '-').replace(/\./g, '');
 
+        const header = {
+            title: "종합 제안서 초안",
+            organization: "Architect PRO",
+            date: new Date().toLocaleDateString("ko-KR").replace(/\//g, '. '),
+            model: modelName,
+            preset: presetName
+        };
+        const sectionPayloads = depth2Sections.map(s => ({
+            title: s.title,
+            text: contents[s.id]
+        }));
+
+        const postJson = () => fetch(hwpxApiUrl, {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({ ...header, sections: sectionPayloads }),
+        });
+
         try {
-            const response = await fetch(hwpxApiUrl, {
-                method: "POST",
-                headers: { "Content-Type": "application/json" },
-                body: JSON.stringify({
-                    title: "종합 제안서 초안",
-                    sections: depth2Sections.map(s => ({
-                        title: s.title,
-                        text: contents[s.id]
-                    })),
-                    organization: "Architect PRO",
-                    date: new Date().toLocaleDateString("ko-KR").replace(/\//g, '. '),
-                    model: modelName,
-                    preset: presetName
-                }),
-            });
+            // Vercel(Python API)에서는 섹션을 NDJSON으로 스트리밍 - 서버가 받는 대로 생성 시작
+            // (요청 스트리밍 미지원 브라우저, 또는 전송 단계에서 거부되면(HTTP/1.1, 프록시 등) 기존 JSON 요청)
+            let response: Response;
+            if (process.env.NEXT_PUBLIC_VERCEL && supportsRequestStreams()) {
+                try {
+                    response = await fetch("/api/generate-hwpx/stream", {
+                        method: "POST",
+                        headers: { "Content-Type": "application/x-ndjson" },
+                        body: ndjsonStream([header, ...sectionPayloads]),
+                        duplex: "half",
+                    } as RequestInit & { duplex: "half" });
+                } catch (e) {
+                    console.warn("Streaming upload rejected, retrying as JSON", e);
+                    response = await postJson();
+                }
+            } else {
+                response = await postJson();
+            }
 
             if (response.ok) {
                 const blob = await response.blob();
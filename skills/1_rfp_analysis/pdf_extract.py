@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+PDF 텍스트 추출 캐시 (RFP / 참조 제안서)
+
+PDF 내용의 sha256을 키로 페이지별 텍스트와 제목 후보(Ⅰ., 1., 가., ①, ■ 패턴)를 디스크에 캐시한다.
+- {hash}.txt  : 모든 페이지 텍스트를 이어 붙인 UTF-8 파일
+- {hash}.json : 페이지 오프셋 색인 [{offset, length, headings}, ...] + 메타데이터
+같은 PDF는 파일명/경로가 달라도 다시 파싱하지 않고, 특정 페이지는 오프셋으로 그 부분만 읽는다.
+처음 보는 큰 PDF는 페이지 구간을 나눠 프로세스 병렬로 추출한다.
+
+pypdf가 필요하다 (requirements.txt 선택 항목).
+
+사용법:
+  python pdf_extract.py <file.pdf> [--page 3] [--backbone] [--workers 4] [--cache-dir DIR]
+  python pdf_extract.py --warm [폴더 ...]   (기본: assets/1-template, assets/2-reference)
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_CACHE_DIR = Path(os.environ.get("RFP_CACHE_DIR") or Path(tempfile.gettempdir()) / "rfp_pdf_cache")
+CACHE_VERSION = 1
+
+PARALLEL_MIN_PAGES = 16  # 이보다 적은 페이지는 단일 프로세스로 추출
+PAGES_PER_JOB = 8
+
+# (패턴 이름, 수준, 정규식) - 위에서부터 먼저 맞는 것 사용
+# HWP에서 변환한 PDF는 글머리 기호(①, ■)가 줄 끝으로 밀려나는 경우가 있어 줄 끝도 허용
+HEADING_PATTERNS = (
+    ("roman", 1, re.compile(r"^[ⅠⅡⅢⅣⅤⅥⅦⅧⅨⅩ][\.\s]")),
+    ("number", 1, re.compile(r"^\d{1,2}\.\s*\S")),
+    ("korean", 2, re.compile(r"^[가나다라마바사아자차카타파하][\.\)]\s*\S")),
+    ("circled", 2, re.compile(r"^[①-⑳]|\S[①-⑳]\s*$")),
+    ("square", 2, re.compile(r"^■|\S■\s*$")),
+)
+HEADING_MAX_CHARS = 60
+
+
+def heading_candidates(text):
+    """페이지 텍스트에서 제목 후보 [{line, text, pattern, level}, ...]"""
+    headings = []
+    for line_number, line in enumerate(text.splitlines()):
+        line = line.strip()
+        if not line or len(line) > HEADING_MAX_CHARS:
+            continue
+        for name, level, pattern in HEADING_PATTERNS:
+            if pattern.search(line):
+                headings.append({"line": line_number, "text": line, "pattern": name, "level": level})
+                break
+    return headings
+
+
+def _extract_pages(source, start, stop):
+    """페이지 [start, stop) 텍스트 (병렬 워커에서도 호출 - source는 경로 또는 bytes)"""
+    from pypdf import PdfReader
+
+    reader = PdfReader(io.BytesIO(source) if isinstance(source, bytes) else str(source))
+    return [reader.pages[index].extract_text() or "" for index in range(start, stop)]
+
+
+def _page_count(data):
+    from pypdf import PdfReader
+    return len(PdfReader(io.BytesIO(data)).pages)
+
+
+class PdfExtraction:
+    """캐시된 추출 결과 (텍스트는 필요한 페이지만 오프셋으로 읽음)"""
+
+    def __init__(self, text_path, index, cached):
+        self.text_path = Path(text_path)
+        self.index = index
+        self.cached = cached  # 캐시 적중 여부
+
+    @property
+    def page_count(self):
+        return len(self.index["pages"])
+
+    @property
+    def headings(self):
+        """전체 제목 후보 (page 번호 포함, 1부터)"""
+        return [dict(heading, page=number)
+                for number, page in enumerate(self.index["pages"], 1) for heading in page["headings"]]
+
+    def page_text(self, page_number):
+        """1부터 시작하는 페이지 번호의 텍스트"""
+        page = self.index["pages"][page_number - 1]
+        with open(self.text_path, "rb") as f:
+            f.seek(page["offset"])
+            return f.read(page["length"]).decode("utf-8")
+
+    def text(self):
+        return self.text_path.read_text(encoding="utf-8")
+
+    def backbone(self):
+        """
+        제목 후보로 만든 제안서 뼈대 [{id, title, depth, page}, ...]
+
+        /api/hwpx/analyze의 줄 단위 휴리스틱을 제목 후보에만 적용 (depth 1: 수준 1 패턴, 2: 나머지)
+        """
+        return [{"id": f"s{index}", "title": heading["text"], "depth": heading["level"], "page": heading["page"]}
+                for index, heading in enumerate(self.headings, 1)]
+
+
+class PdfCache:
+    """content-hash 키 PDF 추출 캐시"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, workers=None):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.workers = workers or min(os.cpu_count() or 1, 8)
+
+    def _paths(self, digest):
+        return self.cache_dir / f"{digest}.txt", self.cache_dir / f"{digest}.json"
+
+    def lookup(self, digest):
+        """캐시된 추출 결과 (없으면 None)"""
+        text_path, index_path = self._paths(digest)
+        try:
+            index = json.loads(index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if index.get("version") != CACHE_VERSION or not text_path.exists():
+            return None
+        return PdfExtraction(text_path, index, cached=True)
+
+    def extract(self, source):
+        """
+        PDF(경로 또는 bytes) 추출 - 같은 내용이면 캐시 적중
+
+        Returns:
+            PdfExtraction
+        """
+        data = source if isinstance(source, bytes) else Path(source).read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        extraction = self.lookup(digest)
+        if extraction is not None:
+            return extraction
+
+        start = time.perf_counter()
+        page_texts = self._extract_all(data)
+        extraction = self._store(digest, page_texts, len(data))
+        name = Path(source).name if not isinstance(source, bytes) else digest[:12]
+        print(f"[PdfCache] {name}: {len(page_texts)} pages extracted in "
+              f"{(time.perf_counter() - start) * 1000:.0f}ms")
+        return extraction
+
+    def _extract_all(self, data):
+        page_count = _page_count(data)
+        if page_count < PARALLEL_MIN_PAGES or self.workers <= 1:
+            return _extract_pages(data, 0, page_count)
+
+        ranges = [(start, min(start + PAGES_PER_JOB, page_count))
+                  for start in range(0, page_count, PAGES_PER_JOB)]
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(ranges))) as pool:
+            futures = [pool.submit(_extract_pages, data, start, stop) for start, stop in ranges]
+            return [text for future in futures for text in future.result()]
+
+    def _store(self, digest, page_texts, size):
+        text_path, index_path = self._paths(digest)
+        pages = []
+        offset = 0
+        encoded = []
+        for text in page_texts:
+            raw = text.encode("utf-8")
+            pages.append({"offset": offset, "length": len(raw), "headings": heading_candidates(text)})
+            encoded.append(raw)
+            offset += len(raw)
+        index = {"version": CACHE_VERSION, "sha256": digest, "size": size, "pages": pages}
+
+        # 임시 파일에 쓴 뒤 교체 - 동시에 같은 PDF를 추출해도 반쯤 쓴 캐시를 읽지 않음
+        for path, payload in ((text_path, b"".join(encoded)),
+                              (index_path, json.dumps(index, ensure_ascii=False).encode("utf-8"))):
+            tmp_path = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, path)
+        return PdfExtraction(text_path, index, cached=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF 텍스트 추출 캐시")
+    parser.add_argument("inputs", nargs="*", help="PDF 파일 (--warm이면 폴더)")
+    parser.add_argument("--warm", action="store_true", help="폴더 안의 PDF를 미리 캐시")
+    parser.add_argument("--page", type=int, help="이 페이지 텍스트 출력")
+    parser.add_argument("--backbone", action="store_true", help="제목 후보로 만든 뼈대 출력")
+    parser.add_argument("--workers", type=int, help="첫 추출 병렬 프로세스 수")
+    parser.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR))
+    args = parser.parse_args()
+
+    cache = PdfCache(args.cache_dir, workers=args.workers)
+    if args.warm:
+        folders = args.inputs or [PROJECT_ROOT / "assets" / "1-template", PROJECT_ROOT / "assets" / "2-reference"]
+        paths = [path for folder in folders for path in sorted(Path(folder).glob("*.pdf"))]
+    else:
+        paths = [Path(path) for path in args.inputs]
+    if not paths:
+        parser.error("PDF 파일을 지정하세요")
+
+    for path in paths:
+        start = time.perf_counter()
+        extraction = cache.extract(path)
+        print(f"{path.name}: {extraction.page_count} pages, {len(extraction.headings)} headings, "
+              f"{'cache hit' if extraction.cached else 'extracted'} ({(time.perf_counter() - start) * 1000:.1f}ms)")
+        if args.page:
+            print(extraction.page_text(args.page))
+        if args.backbone:
+            for section in extraction.backbone():
+                print(f"  {'  ' * (section['depth'] - 1)}{section['title']}  (p.{section['page']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+색상 마커 출처 검증 (red = 원천 자료, green = 참조 제안서)
+
+AI 생성 지침은 Raw Data에서 온 수치/사실을 text-red, 참조 제안서 표현을 text-green으로 감싸게 한다.
+{{red:...}} / {{green:...}} 마커 텍스트가 실제로 해당 자료에 있는지를
+미리 만든 문자 n-gram 집합으로 확인한다 (마커 하나당 집합 조회 수십 번 - 문서 전체가 수 ms).
+
+- 정규화: NFKC + 소문자 + 한글/영문/숫자만 남김 (띄어쓰기, 쉼표, 줄바꿈 차이 무시)
+- 점수(coverage): 마커 텍스트의 n-gram 중 자료에 있는 비율
+- 판정: supported (>= 0.8) / partial (>= 0.5) / unsupported
+
+원천 자료는 corpus_index 색인의 청크, 참조 제안서는 rfp 분석 스킬의 PDF 추출 캐시를 쓴다.
+
+사용법:
+  python attribution.py proposal.json [--raw-dir ...] [--reference-dir ...] [--all]
+"""
+
+import argparse
+import re
+import sys
+import time
+import unicodedata
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_REFERENCE_DIR = PROJECT_ROOT / "assets" / "2-reference"
+
+NGRAM = 4  # 이보다 짧은 마커는 전체를 한 n-gram으로 확인
+SUPPORTED = 0.8
+PARTIAL = 0.5
+
+# 마커 색 → 확인할 자료
+COLOR_CORPUS = {"red": "raw", "green": "reference"}
+
+MARKER_PATTERN = re.compile(r"\{\{(red|green):([^}]+)\}\}")
+_NON_WORD = re.compile(r"[^가-힣a-z0-9]+")
+
+
+def normalize(text):
+    return _NON_WORD.sub("", unicodedata.normalize("NFKC", text).lower())
+
+
+def _grams(text, n):
+    return [text[i:i + n] for i in range(len(text) - n + 1)]
+
+
+class AttributionIndex:
+    """자료(raw/reference)별 문자 n-gram 집합 (짧은 마커용 2~n-1-gram 포함)"""
+
+    def __init__(self, n=NGRAM):
+        self.n = n
+        self.grams = {corpus: set() for corpus in COLOR_CORPUS.values()}
+        self.chars = dict.fromkeys(COLOR_CORPUS.values(), 0)
+
+    def add(self, corpus, text):
+        text = normalize(text)
+        grams = self.grams[corpus]
+        for size in range(2, self.n + 1):
+            grams.update(_grams(text, size))
+        self.chars[corpus] += len(text)
+
+    def coverage(self, corpus, text):
+        """text의 n-gram 중 corpus에 있는 비율 (정규화 후 2글자 미만이면 None - 판정 불가)"""
+        text = normalize(text)
+        if len(text) < 2:
+            return None
+        grams = self.grams[corpus]
+        if len(text) <= self.n:
+            return 1.0 if text in grams else 0.0
+        items = _grams(text, self.n)
+        return sum(gram in grams for gram in items) / len(items)
+
+    def stats(self):
+        return {corpus: {"chars": self.chars[corpus], "ngrams": len(grams)}
+                for corpus, grams in self.grams.items()}
+
+    @classmethod
+    def from_sources(cls, corpus_index=None, reference_dir=DEFAULT_REFERENCE_DIR, pdf_cache=None):
+        """
+        원천 자료(corpus_index.CorpusIndex 청크) + 참조 제안서 PDF(pdf_extract.PdfCache)로 색인 구성
+
+        pdf_cache가 없거나 pypdf가 없으면 참조 자료는 비어 있다 (green 마커는 모두 unsupported가 아니라 '자료 없음').
+        """
+        index = cls()
+        if corpus_index is not None:
+            for (text,) in corpus_index.conn.execute("SELECT text FROM chunks"):
+                index.add("raw", text)
+        if pdf_cache is not None and reference_dir is not None:
+            for path in sorted(Path(reference_dir).glob("*.pdf")):
+                try:
+                    index.add("reference", pdf_cache.extract(path).text())
+                except ImportError as e:
+                    print(f"[Attribution] 참조 PDF 건너뜀 ({e.name} 미설치)")
+                    break
+        return index
+
+
+class AttributionReport:
+    """문서 하나의 마커 검증 결과 (항목을 받는 대로 누적 - 스트리밍 생성에서도 사용)"""
+
+    def __init__(self, index):
+        self.index = index
+        self.spans = []
+        self.seconds = 0.0  # 검증에 쓴 시간 (항목을 받는 사이 시간 제외)
+
+    def check_text(self, text, location=""):
+        start = time.perf_counter()
+        for color, span in MARKER_PATTERN.findall(text):
+            corpus = COLOR_CORPUS[color]
+            if not self.index.chars[corpus]:
+                verdict, score = "no_source", None
+            else:
+                score = self.index.coverage(corpus, span)
+                if score is None:
+                    verdict = "skipped"
+                elif score >= SUPPORTED:
+                    verdict = "supported"
+                elif score >= PARTIAL:
+                    verdict = "partial"
+                else:
+                    verdict = "unsupported"
+            self.spans.append({"color": color, "text": span, "location": location,
+                               "coverage": None if score is None else round(score, 3), "verdict": verdict})
+        self.seconds += time.perf_counter() - start
+
+    def check_item(self, item):
+        """proposal_ir 항목 (Section / Paragraph / Table) 하나"""
+        location = getattr(item, "id", None) or ""
+        if hasattr(item, "rows"):
+            for cell in item.headers:
+                self.check_text(str(cell), location)
+            for row in item.rows:
+                for cell in row:
+                    self.check_text(str(cell), location)
+        elif hasattr(item, "items"):
+            self.check_text(item.title or "", location)
+            for child in item.items:
+                self.check_text(child.text, location)
+        else:
+            self.check_text(item.text, location)
+
+    def check_document(self, document):
+        for item in document.content:
+            self.check_item(item)
+        return self
+
+    @property
+    def unsupported(self):
+        return [span for span in self.spans if span["verdict"] == "unsupported"]
+
+    def to_dict(self, include_all=False):
+        counts = {}
+        for span in self.spans:
+            counts[span["verdict"]] = counts.get(span["verdict"], 0) + 1
+        return {
+            "checked": len(self.spans),
+            "counts": counts,
+            "ms": round(self.seconds * 1000, 2),
+            "spans": self.spans if include_all else [span for span in self.spans
+                                                     if span["verdict"] in ("unsupported", "partial")],
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="색상 마커 출처 검증")
+    parser.add_argument("input", help="proposal JSON")
+    parser.add_argument("--index", help="corpus_index SQLite 파일 (기본: corpus_index 기본 경로)")
+    parser.add_argument("--raw-dir", help="원천 자료 폴더 (기본: assets/3-rawdata)")
+    parser.add_argument("--reference-dir", default=str(DEFAULT_REFERENCE_DIR))
+    parser.add_argument("--all", action="store_true", help="통과한 마커도 출력")
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    sys.path.insert(0, str(PROJECT_ROOT / "skills" / "1_rfp_analysis"))
+    sys.path.insert(0, str(PROJECT_ROOT / "skills" / "4_hwpx_generation" / "src"))
+    import corpus_index
+    from pdf_extract import PdfCache
+    from proposal_ir import from_json
+
+    corpus = corpus_index.CorpusIndex(args.index or corpus_index.DEFAULT_INDEX_PATH)
+    corpus.update(args.raw_dir or corpus_index.DEFAULT_SOURCE_DIR)
+    start = time.perf_counter()
+    index = AttributionIndex.from_sources(corpus, args.reference_dir, PdfCache())
+    print(f"[Attribution] index {index.stats()} ({(time.perf_counter() - start) * 1000:.0f}ms)")
+
+    document = from_json(Path(args.input).read_text(encoding="utf-8"))
+    report = AttributionReport(index).check_document(document).to_dict(include_all=args.all)
+    print(f"[Attribution] {report['checked']} spans {report['counts']} ({report['ms']}ms)")
+    for span in report["spans"]:
+        coverage = "-" if span["coverage"] is None else f"{span['coverage']:.2f}"
+        print(f"  {span['verdict']:<12} {coverage:>5} {span['color']:<6} {span['location']:<16} {span['text'][:60]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+회사 원천 자료(Raw Data) 코퍼스 색인
+
+assets/3-rawdata의 SRT/XLSX/DOCX/PDF를 한 번만 파싱해 청크로 나누고,
+한국어 문자 2-gram 역색인을 SQLite 파일 하나에 저장한다.
+- 증분 색인: mtime/크기가 바뀐 파일만 다시 파싱, 사라진 파일은 색인에서 제거
+- 검색: 질의 n-gram에 BM25 점수를 매겨 상위 k개 청크만 반환
+  → 원천 자료 전체 대신 섹션별 관련 청크만 프롬프트(sourceData)에 넣는다.
+
+XLSX/DOCX는 zip 안의 XML을 lxml로 직접 읽는다 (추가 의존성 없음).
+PDF는 pypdf가 설치된 경우에만 색인한다 (없으면 건너뜀).
+
+사용법:
+  python corpus_index.py build [자료 폴더] [--index corpus_index.sqlite]
+  python corpus_index.py query "자율주행 실습 장비" [--top-k 5] [--index ...]
+"""
+
+import argparse
+import heapq
+import math
+import re
+import sqlite3
+import time
+import unicodedata
+import zipfile
+from collections import Counter
+from pathlib import Path
+
+from lxml import etree
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_SOURCE_DIR = PROJECT_ROOT / "assets" / "3-rawdata"
+DEFAULT_INDEX_PATH = PROJECT_ROOT / "assets" / "corpus_index.sqlite"
+
+CHUNK_CHARS = 600  # 청크 최대 글자 수 (SRT/DOCX/PDF 문단, XLSX 행 단위로 자름)
+SCHEMA_VERSION = "1"
+
+# BM25 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+S = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+_SRT_TIME = re.compile(r"(\d{2}:\d{2}:\d{2}),\d{3}\s*-->")
+_TOKEN = re.compile(r"[가-힣]+|[a-z0-9]+(?:\.[0-9]+)?")
+
+
+# --- 토큰화 ---
+
+def tokenize(text):
+    """
+    한국어는 문자 2-gram(한 글자 단어는 1-gram), 영문/숫자는 단어 단위 토큰
+
+    조사/어미가 붙어도 어간 2-gram이 겹치므로 형태소 분석 없이 부분 일치가 된다.
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    tokens = []
+    for word in _TOKEN.findall(text):
+        if "가" <= word[0] <= "힣":
+            if len(word) == 1:
+                tokens.append(word)
+            else:
+                tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+# --- 파서: 파일 → [(위치, 텍스트), ...] 청크 ---
+
+def _pack(units, limit=CHUNK_CHARS):
+    """
+    (위치, 텍스트) 단위를 limit 글자까지 묶어 청크로
+
+    start=True인 단위(SRT 차수 표시, 시트/표 시작 등)에서는 항상 새 청크를 시작한다.
+    """
+    chunks = []
+    location, lines, size = None, [], 0
+    for unit_location, text, start in units:
+        if lines and (start or size + len(text) > limit):
+            chunks.append((location, "\n".join(lines)))
+            lines, size = [], 0
+        if not lines:
+            location = unit_location
+        lines.append(text)
+        size += len(text) + 1
+    if lines:
+        chunks.append((location, "\n".join(lines)))
+    return chunks
+
+
+def parse_srt(path):
+    """자막 블록의 대사만 (번호/타임코드 제외), 위치는 청크 시작 시각"""
+    units = []
+    text = Path(path).read_text(encoding="utf-8-sig", errors="replace")
+    for block in re.split(r"\n\s*\n", text.replace("\r\n", "\n")):
+        lines = [line.strip() for line in block.strip().split("\n")]
+        time_index = next((i for i, line in enumerate(lines) if _SRT_TIME.match(line)), None)
+        if time_index is None:
+            continue
+        speech = " ".join(line for line in lines[time_index + 1:] if line)
+        if speech:
+            start = _SRT_TIME.match(lines[time_index]).group(1)
+            units.append((start, speech, speech.startswith("[")))  # [N차수: ...] 단위로 나눔
+    return _pack(units)
+
+
+def _zip_xml(zf, name):
+    return etree.fromstring(zf.read(name))
+
+
+def parse_xlsx(path):
+    """시트별 행을 '셀 | 셀' 줄로, 청크마다 시트 이름 + 첫 행(머리글)을 붙여 단독으로 읽히게"""
+    with zipfile.ZipFile(path) as zf:
+        names = set(zf.namelist())
+        shared = []
+        if "xl/sharedStrings.xml" in names:
+            for si in _zip_xml(zf, "xl/sharedStrings.xml").iter(f"{{{S}}}si"):
+                shared.append("".join(t.text or "" for t in si.iter(f"{{{S}}}t")))
+
+        rels = {rel.get("Id"): rel.get("Target")
+                for rel in _zip_xml(zf, "xl/_rels/workbook.xml.rels").iter(f"{{{PKG_REL}}}Relationship")}
+        chunks = []
+        for sheet in _zip_xml(zf, "xl/workbook.xml").iter(f"{{{S}}}sheet"):
+            target = rels.get(sheet.get(f"{{{REL}}}id"), "")
+            member = target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+            if member not in names:
+                continue
+
+            rows = []
+            for row in _zip_xml(zf, member).iter(f"{{{S}}}row"):
+                cells = []
+                for cell in row.iter(f"{{{S}}}c"):
+                    value = cell.find(f"{{{S}}}v")
+                    if cell.get("t") == "s" and value is not None:
+                        text = shared[int(value.text)]
+                    elif cell.get("t") == "inlineStr":
+                        text = "".join(t.text or "" for t in cell.iter(f"{{{S}}}t"))
+                    else:
+                        text = value.text if value is not None else ""
+                    if text and text.strip():
+                        cells.append(text.strip())
+                if cells:
+                    rows.append((row.get("r", ""), " | ".join(cells)))
+            if not rows:
+                continue
+
+            sheet_name = sheet.get("name", "")
+            header = rows[0][1]
+            prefix = f"[{sheet_name}] {header}"
+            for location, text in _pack([(r, text, False) for r, text in rows[1:]],
+                                        CHUNK_CHARS - len(prefix)) or [(rows[0][0], "")]:
+                chunks.append((f"{sheet_name}!{location}", f"{prefix}\n{text}".rstrip()))
+    return chunks
+
+
+def parse_docx(path):
+    """본문 문단 + 표(행을 '셀 | 셀' 줄로)를 문서 순서대로, 위치는 문단 번호"""
+    with zipfile.ZipFile(path) as zf:
+        body = _zip_xml(zf, "word/document.xml").find(f"{{{W}}}body")
+
+    def paragraph_text(p):
+        return "".join(t.text or "" for t in p.iter(f"{{{W}}}t")).strip()
+
+    units = []
+    for index, block in enumerate(body):
+        if block.tag == f"{{{W}}}p":
+            text = paragraph_text(block)
+            if text:
+                style = block.find(f"{{{W}}}pPr/{{{W}}}pStyle")
+                heading = style is not None and "heading" in style.get(f"{{{W}}}val", "").lower()
+                units.append((f"p{index}", text, heading))
+        elif block.tag == f"{{{W}}}tbl":
+            for row_index, row in enumerate(block.iter(f"{{{W}}}tr")):
+                cells = [" ".join(paragraph_text(p) for p in tc.iter(f"{{{W}}}p")).strip()
+                         for tc in row.iter(f"{{{W}}}tc")]
+                cells = [cell for cell in cells if cell]
+                if cells:
+                    units.append((f"p{index}", " | ".join(cells), row_index == 0))
+    return _pack(units)
+
+
+def parse_pdf(path):
+    """페이지별 텍스트 (pypdf 필요), 위치는 페이지 번호"""
+    from pypdf import PdfReader
+
+    units = []
+    for page_number, page in enumerate(PdfReader(str(path)).pages, 1):
+        first = True
+        for line in (page.extract_text() or "").splitlines():
+            line = " ".join(line.split())  # 글자 배치로 생긴 연속 공백 정리
+            if line:
+                units.append((f"p.{page_number}", line, first))
+                first = False
+    return _pack(units)
+
+
+PARSERS = {
+    ".srt": parse_srt,
+    ".xlsx": parse_xlsx,
+    ".docx": parse_docx,
+    ".pdf": parse_pdf,
+}
+
+
+# --- 색인 ---
+
+class CorpusIndex:
+    """SQLite 역색인 (files / chunks / postings 테이블)"""
+
+    def __init__(self, index_path=DEFAULT_INDEX_PATH):
+        self.index_path = Path(index_path)
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.index_path), check_same_thread=False)
+        self._init_schema()
+
+    def _init_schema(self):
+        conn = self.conn
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version and str(version) != SCHEMA_VERSION:
+            # 스키마가 바뀌면 처음부터 다시 색인
+            conn.executescript("DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS chunks; "
+                               "DROP TABLE IF EXISTS postings;")
+        conn.executescript(f"""
+            PRAGMA journal_mode=WAL;
+            PRAGMA user_version={SCHEMA_VERSION};
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, chunk_count INTEGER);
+            CREATE TABLE IF NOT EXISTS chunks (
+                id INTEGER PRIMARY KEY, path TEXT, location TEXT, text TEXT, length INTEGER);
+            CREATE INDEX IF NOT EXISTS chunks_path ON chunks(path);
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT, chunk_id INTEGER, tf INTEGER, PRIMARY KEY (term, chunk_id)) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_chunk ON postings(chunk_id);
+        """)
+
+    def close(self):
+        self.conn.close()
+
+    def _remove_file(self, path):
+        conn = self.conn
+        conn.execute("DELETE FROM postings WHERE chunk_id IN (SELECT id FROM chunks WHERE path = ?)", (path,))
+        conn.execute("DELETE FROM chunks WHERE path = ?", (path,))
+        conn.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def _add_file(self, path, chunks, stat):
+        conn = self.conn
+        for location, text in chunks:
+            tokens = tokenize(text)
+            if not tokens:
+                continue
+            chunk_id = conn.execute("INSERT INTO chunks (path, location, text, length) VALUES (?, ?, ?, ?)",
+                                    (path, location, text, len(tokens))).lastrowid
+            conn.executemany("INSERT INTO postings (term, chunk_id, tf) VALUES (?, ?, ?)",
+                             [(term, chunk_id, tf) for term, tf in Counter(tokens).items()])
+        conn.execute("INSERT INTO files (path, mtime_ns, size, chunk_count) VALUES (?, ?, ?, ?)",
+                     (path, stat.st_mtime_ns, stat.st_size, len(chunks)))
+
+    def update(self, source_dir=DEFAULT_SOURCE_DIR):
+        """
+        source_dir 아래 지원 형식 파일을 증분 색인 (mtime/크기가 같은 파일은 건너뜀)
+
+        Returns:
+            {"added", "updated", "removed", "unchanged", "skipped", "chunks", "seconds"}
+        """
+        start = time.perf_counter()
+        source_dir = Path(source_dir)
+        known = {path: (mtime_ns, size) for path, mtime_ns, size in
+                 self.conn.execute("SELECT path, mtime_ns, size FROM files")}
+        stats = dict.fromkeys(("added", "updated", "removed", "unchanged", "skipped"), 0)
+        seen = set()
+
+        with self.conn:
+            for file_path in sorted(source_dir.rglob("*")):
+                parser = PARSERS.get(file_path.suffix.lower())
+                if parser is None or not file_path.is_file() or file_path.name.startswith("~$"):
+                    continue
+                path = file_path.relative_to(source_dir).as_posix()
+                seen.add(path)
+                stat = file_path.stat()
+                if known.get(path) == (stat.st_mtime_ns, stat.st_size):
+                    stats["unchanged"] += 1
+                    continue
+
+                try:
+                    chunks = parser(file_path)
+                except ImportError as e:
+                    print(f"[Corpus] {path}: 건너뜀 ({e.name} 미설치)")
+                    stats["skipped"] += 1
+                    continue
+                except Exception as e:
+                    print(f"[Corpus] {path}: 파싱 실패 ({e})")
+                    stats["skipped"] += 1
+                    continue
+
+                if path in known:
+                    self._remove_file(path)
+                    stats["updated"] += 1
+                else:
+                    stats["added"] += 1
+                self._add_file(path, chunks, stat)
+
+            for path in known.keys() - seen:
+                self._remove_file(path)
+                stats["removed"] += 1
+
+        stats["chunks"] = self.conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+        stats["seconds"] = round(time.perf_counter() - start, 3)
+        return stats
+
+    def query(self, text, top_k=5):
+        """
+        BM25 상위 top_k 청크
+
+        Returns:
+            [{"path", "location", "text", "score"}, ...] (점수 내림차순)
+        """
+        terms = sorted(set(tokenize(text)))
+        if not terms:
+            return []
+        total, avg_length = self.conn.execute("SELECT COUNT(*), AVG(length) FROM chunks").fetchone()
+        if not total:
+            return []
+
+        placeholders = ",".join("?" * len(terms))
+        rows = self.conn.execute(
+            f"SELECT p.term, p.chunk_id, p.tf, c.length FROM postings p JOIN chunks c ON c.id = p.chunk_id "
+            f"WHERE p.term IN ({placeholders})", terms).fetchall()
+
+        df = Counter(term for term, _, _, _ in rows)
+        scores = Counter()
+        for term, chunk_id, tf, length in rows:
+            idf = math.log(1 + (total - df[term] + 0.5) / (df[term] + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+            scores[chunk_id] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+        best = heapq.nlargest(top_k, scores.items(), key=lambda entry: entry[1])
+        if not best:
+            return []
+        chunk_rows = {row[0]: row[1:] for row in self.conn.execute(
+            f"SELECT id, path, location, text FROM chunks WHERE id IN ({','.join('?' * len(best))})",
+            [chunk_id for chunk_id, _ in best])}
+        return [{"path": chunk_rows[chunk_id][0], "location": chunk_rows[chunk_id][1],
+                 "text": chunk_rows[chunk_id][2], "score": round(score, 3)}
+                for chunk_id, score in best]
+
+    def query_sections(self, queries, top_k=5):
+        """섹션(제목/프롬프트)마다 상위 top_k 청크 목록"""
+        return [self.query(text, top_k) for text in queries]
+
+    def stats(self):
+        files, chunks = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(chunk_count), 0) FROM files").fetchone()
+        terms = self.conn.execute("SELECT COUNT(DISTINCT term) FROM postings").fetchone()[0]
+        return {"files": files, "chunks": chunks, "terms": terms}
+
+
+def format_context(hits):
+    """검색 결과 → 프롬프트용 원본 데이터 텍스트 ([파일 위치] 청크)"""
+    return "\n\n".join(f"[{hit['path']} {hit['location']}]\n{hit['text']}" for hit in hits)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="회사 원천 자료 코퍼스 색인/검색")
+    parser.add_argument("--index", default=str(DEFAULT_INDEX_PATH), help="SQLite 색인 파일")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="증분 색인")
+    build.add_argument("source", nargs="?", default=str(DEFAULT_SOURCE_DIR), help="원천 자료 폴더")
+
+    query = sub.add_parser("query", help="상위 k개 청크 검색")
+    query.add_argument("text", nargs="+", help="질의 (섹션 제목 등) - 여러 개면 각각 검색")
+    query.add_argument("--top-k", type=int, default=5)
+    args = parser.parse_args()
+
+    index = CorpusIndex(args.index)
+    try:
+        if args.command == "build":
+            stats = index.update(args.source)
+            print(f"[Corpus] +{stats['added']} ~{stats['updated']} -{stats['removed']} "
+                  f"={stats['unchanged']} skipped {stats['skipped']} -> {stats['chunks']} chunks "
+                  f"({stats['seconds']}s)")
+            return
+
+        for text, hits in zip(args.text, index.query_sections(args.text, args.top_k)):
+            print(f"## {text}")
+            for hit in hits:
+                preview = hit["text"].replace("\n", " / ")[:120]
+                print(f"  {hit['score']:7.3f}  {hit['path']} {hit['location']}  {preview}")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,10 @@ import json
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "4_hwpx_generation" / "src"))
+
+from proposal_ir import Document, Paragraph, Section, Table  # noqa: E402
+
 
 class MarkdownToJsonConverter:
     """마크다운을 JSON으로 변환하는 클래스"""
@@ -30,126 +34,127 @@ class MarkdownToJsonConverter:
             ]
         }
 
-    def convert_bold_to_markers(self, text):
-        """볼드 마크다운을 색상 마커로 변환"""
-
-        # 먼저 green 패턴 적용
-        for pattern in self.color_patterns['green']:
-            def replace_green(match):
-                content = match.group(0)
-                # **제거
-                content = content.replace('**', '')
-                return f'{{{{green:{content}}}}}'
-
-            text = re.sub(pattern, replace_green, text)
+        # 패턴을 미리 컴파일 - 적용 순서(green 패턴들 → red 패턴들 → 남은 볼드)는 그대로 유지
+        # (한 번의 alternation으로 합치면 중첩/짝이 맞지 않는 ** 에서 결과가 달라진다)
+        self.compiled_patterns = [(re.compile(pattern), self._marker_replacer(color))
+                                  for color in ('green', 'red')
+                                  for pattern in self.color_patterns[color]]
+        self.plain_bold_pattern = re.compile(r'\*\*([^*]+?)\*\*')
+
+    @staticmethod
+    def _marker_replacer(color):
+        """색상 패턴 매치 → {{color:내용}} 마커 (** 제거)"""
+        def replace(match):
+            content = match.group(0).replace('**', '')
+            return f'{{{{{color}:{content}}}}}'
+        return replace
 
-        # 그 다음 red 패턴 적용
-        for pattern in self.color_patterns['red']:
-            def replace_red(match):
-                content = match.group(0)
-                # **제거
-                content = content.replace('**', '')
-                return f'{{{{red:{content}}}}}'
+    def convert_bold_to_markers(self, text):
+        """볼드 마크다운을 색상 마커로 변환 (green 패턴 → red 패턴 순, 남은 볼드는 제거)"""
+        for pattern, replace in self.compiled_patterns:
+            text = pattern.sub(replace, text)
+        return self.plain_bold_pattern.sub(r'\1', text)
 
-            text = re.sub(pattern, replace_red, text)
+    def convert_markdown_to_document(self, markdown_text, metadata=None):
+        """마크다운 텍스트를 proposal_ir.Document로 변환 (HWPXGenerator에 바로 전달 가능)"""
 
-        # 남은 볼드는 그냥 제거
-        text = re.sub(r'\*\*([^*]+?)\*\*', r'\1', text)
+        if metadata is None:
+            metadata = self._default_metadata(len(markdown_text))
 
-        return text
+        return Document(metadata, list(self.iter_sections(markdown_text.split('\n'))))
 
     def convert_markdown_to_json(self, markdown_text, metadata=None):
         """마크다운 텍스트를 JSON으로 변환"""
+        return self.convert_markdown_to_document(markdown_text, metadata).to_dict()
 
-        if metadata is None:
-            metadata = {
-                "title": "제안서",
-                "organization": "기관명",
-                "date": "2026-02-16",
-                "model": "claude_sonnet_4.5",
-                "preset": "default",
-                "rfp_source": "rfp.pdf",
-                "total_chars": len(markdown_text)
-            }
-
-        content = []
-        lines = markdown_text.split('\n')
+    def _default_metadata(self, total_chars):
+        """metadata 미지정 시 기본값"""
+        return {
+            "title": "제안서",
+            "organization": "기관명",
+            "date": "2026-02-16",
+            "model": "claude_sonnet_4.5",
+            "preset": "default",
+            "rfp_source": "rfp.pdf",
+            "total_chars": total_chars
+        }
 
-        current_section = None
-        current_items = []
-        table_buffer = []
+    def _process_table_buffer(self, table_buffer, current_items):
+        """버퍼에 있는 표 데이터를 Table 아이템으로 변환하여 current_items에 추가"""
+        if not table_buffer:
+            return
+        if current_items is None:
+            return
 
-        def process_table_buffer():
-            """버퍼에 있는 표 데이터를 JSON 아이템으로 변환"""
-            nonlocal current_items
-            if not table_buffer:
+        try:
+            # 첫 번째 줄은 헤더
+            header_row = table_buffer[0]
+            headers = [cell.strip() for cell in header_row.strip('|').split('|')]
+            headers = [h for h in headers if h]  # 빈 헤더 제거
+
+            if not headers:
                 return
-            if current_items is None:
+
+            rows = []
+            start_row_idx = 1
+
+            # 두 번째 줄이 구분선(|---|)인지 확인
+            if len(table_buffer) > 1:
+                second_row = table_buffer[1].strip()
+                separator_content = second_row.replace('|', '').replace('-', '').replace(':', '').replace(' ', '')
+                if separator_content == '':
+                    start_row_idx = 2
+
+            for i in range(start_row_idx, len(table_buffer)):
+                row_text = table_buffer[i]
+                if not row_text.strip():
+                    continue
+
+                cells = [cell.strip() for cell in row_text.strip('|').split('|')]
+                cells = [c for c in cells if c or len(cells) <= len(headers)]  # 빈 셀 처리
+
+                # 셀 개수를 헤더에 맞춤
+                if len(cells) < len(headers):
+                    cells.extend([""] * (len(headers) - len(cells)))
+                elif len(cells) > len(headers):
+                    cells = cells[:len(headers)]
+
+                rows.append(cells)
+
+            if not rows:
                 return
 
-            try:
-                # 첫 번째 줄은 헤더
-                header_row = table_buffer[0]
-                headers = [cell.strip() for cell in header_row.strip('|').split('|')]
-                headers = [h for h in headers if h]  # 빈 헤더 제거
-
-                if not headers:
-                    return
-
-                rows = []
-                start_row_idx = 1
-
-                # 두 번째 줄이 구분선(|---|)인지 확인
-                if len(table_buffer) > 1:
-                    second_row = table_buffer[1].strip()
-                    separator_content = second_row.replace('|', '').replace('-', '').replace(':', '').replace(' ', '')
-                    if separator_content == '':
-                        start_row_idx = 2
-
-                for i in range(start_row_idx, len(table_buffer)):
-                    row_text = table_buffer[i]
-                    if not row_text.strip():
-                        continue
-
-                    cells = [cell.strip() for cell in row_text.strip('|').split('|')]
-                    cells = [c for c in cells if c or len(cells) <= len(headers)]  # 빈 셀 처리
-
-                    # 셀 개수를 헤더에 맞춤
-                    if len(cells) < len(headers):
-                        cells.extend([""] * (len(headers) - len(cells)))
-                    elif len(cells) > len(headers):
-                        cells = cells[:len(headers)]
-
-                    rows.append(cells)
-
-                if not rows:
-                    return
-
-                current_items.append({
-                    "type": "table",
-                    "headers": headers,
-                    "rows": rows,
-                    "style": {
-                        "headerBg": "#2563eb",
-                        "headerColor": "#ffffff",
-                        "borderColor": "#cbd5e1"
-                    }
-                })
-                print(f"  [Table Parsed] Headers: {headers}, Rows: {len(rows)}")
-            except Exception as e:
-                print(f"Error parsing table: {e}")
+            current_items.append(Table(headers, rows, style={
+                "headerBg": "#2563eb",
+                "headerColor": "#ffffff",
+                "borderColor": "#cbd5e1"
+            }))
+            print(f"  [Table Parsed] Headers: {headers}, Rows: {len(rows)}")
+        except Exception as e:
+            print(f"Error parsing table: {e}")
+
+    def iter_sections(self, lines):
+        """
+        줄 단위 이터러블(리스트, 파일 객체 등)을 읽으며 섹션(proposal_ir.Section)을 하나씩 생성
+
+        완성된 섹션만 내보내므로 메모리에는 현재 섹션 하나만 유지된다.
+        """
+        section_count = 0
+        current_section = None
+        current_items = []
+        table_buffer = []
 
         for line in lines:
             line = line.strip()
-            
+
             # 표 처리 (파이프로 시작하는 경우)
             if line.startswith('|'):
                 table_buffer.append(line)
                 continue
-            
+
             # 표가 끝났는데 버퍼가 차있는 경우 처리
             if table_buffer:
-                process_table_buffer()
+                self._process_table_buffer(table_buffer, current_items)
                 table_buffer = []
 
             if not line:
@@ -157,20 +162,17 @@ class MarkdownToJsonConverter:
 
             # 섹션 제목 (# 또는 ##)
             if line.startswith('# ') or line.startswith('## '):
-                # 이전 섹션 저장
+                # 이전 섹션 내보내기
                 if current_section:
-                    current_section['items'] = current_items
-                    content.append(current_section)
+                    current_section.items = current_items
+                    yield current_section
+                    section_count += 1
 
                 # 새 섹션 시작
                 section_title = line.lstrip('#').strip()
                 section_title = self.convert_bold_to_markers(section_title)
 
-                current_section = {
-                    "type": "section",
-                    "id": f"section{len(content) + 1}",
-                    "title": section_title,
-                }
+                current_section = Section(section_title, id=f"section{section_count + 1}")
                 current_items = []
 
             # 본문 텍스트 (표가 아닌 경우)
@@ -188,43 +190,84 @@ class MarkdownToJsonConverter:
                 # 볼드를 색상 마커로 변환
                 converted_text = self.convert_bold_to_markers(line)
 
-                current_items.append({
-                    "level": level,
-                    "text": converted_text,
-                    "color": "default",
-                    "source": "generated"
-                })
+                current_items.append(Paragraph(converted_text, level))
 
         # 루프 종료 후 남은 표 처리
         if table_buffer:
-            process_table_buffer()
+            self._process_table_buffer(table_buffer, current_items)
 
-        # 마지막 섹션 저장
+        # 마지막 섹션 내보내기
         if current_section:
-            current_section['items'] = current_items
-            content.append(current_section)
+            current_section.items = current_items
+            yield current_section
 
-        return {
-            "metadata": metadata,
-            "content": content
-        }
+    def convert_file_streaming(self, input_file, output_file, metadata=None):
+        """
+        마크다운 파일을 한 줄씩 읽어 JSON 파일로 스트리밍 변환 (대용량 파일용, 상수 메모리)
+
+        섹션은 완성되는 즉시 파일에 기록된다. total_chars를 끝까지 읽어야 알 수 있으므로
+        "metadata"는 "content" 뒤에 기록한다.
+
+        Returns:
+            (섹션 수, 아이템 수)
+        """
+        total_chars = 0
+        section_count = 0
+        item_count = 0
+
+        with open(input_file, 'r', encoding='utf-8') as fin, \
+                open(output_file, 'w', encoding='utf-8') as fout:
+
+            def counted_lines():
+                nonlocal total_chars
+                for line in fin:
+                    total_chars += len(line)
+                    yield line
+
+            fout.write('{\n  "content": [')
+            for section in self.iter_sections(counted_lines()):
+                section_json = json.dumps(section.to_dict(), ensure_ascii=False, indent=2)
+                fout.write(',\n' if section_count else '\n')
+                fout.write('\n'.join('    ' + line for line in section_json.split('\n')))
+                section_count += 1
+                item_count += len(section.items)
+            fout.write('\n  ]' if section_count else ']')
+
+            if metadata is None:
+                metadata = self._default_metadata(total_chars)
+            metadata_json = json.dumps(metadata, ensure_ascii=False, indent=2)
+            fout.write(',\n  "metadata": ' + metadata_json.replace('\n', '\n  ') + '\n}\n')
+
+        return section_count, item_count
 
 
 def main():
     """메인 함수"""
-    if len(sys.argv) < 2:
-        print("Usage: python markdown_to_json.py <input.md> [output.json]")
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    stream = '--stream' in sys.argv[1:]
+
+    if len(args) < 1:
+        print("Usage: python markdown_to_json.py [--stream] <input.md> [output.json]")
+        print("  --stream  한 줄씩 읽어 섹션 단위로 기록 (대용량 파일, 상수 메모리)")
         sys.exit(1)
 
-    input_file = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else input_file.replace('.md', '.json')
+    input_file = args[0]
+    output_file = args[1] if len(args) > 1 else input_file.replace('.md', '.json')
+
+    converter = MarkdownToJsonConverter()
+
+    if stream:
+        section_count, total_items = converter.convert_file_streaming(input_file, output_file)
+        print(f"✓ Converted (stream): {input_file} -> {output_file}")
+        print(f"  Sections: {section_count}")
+        print(f"  Items: {total_items}")
+        return
 
     # 마크다운 읽기
     with open(input_file, 'r', encoding='utf-8') as f:
         markdown_text = f.read()
 
     # 변환
-    converter = MarkdownToJsonConverter()
     result = converter.convert_markdown_to_json(markdown_text)
 
     # JSON 저장
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+HWPX 출력 크기/시간 벤치마크 (compact 모드, deflate 수준)
+
+같은 문서를 기본 출력(pretty_print, deflate 6)과 compact 모드(들여쓰기 없음 + header 미사용 스타일 제거)의
+여러 deflate 수준으로 생성해 .hwpx 크기, XML 크기, 생성 시간을 비교한다.
+
+사용법:
+  python bench_output_size.py [proposal.json 또는 proposal.md] [--scale 8] [--levels 1 6 9] [--repeat 3]
+  (입력 생략 시 표가 섞인 합성 문서 사용)
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import statistics
+import sys
+import time
+import zipfile
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parents[2]
+sys.path.insert(0, str(SCRIPT_DIR.parent / "src"))
+sys.path.insert(0, str(PROJECT_ROOT / "skills" / "3_proposal_writing"))
+
+from hwpx_generator import HWPXGenerator  # noqa: E402
+from proposal_ir import Document, Paragraph, Section, Table, as_document  # noqa: E402
+
+
+def synthetic_document(scale):
+    """본문 문단 + 표가 섞인 합성 제안서"""
+    content = []
+    for index in range(scale * 10):
+        items = [Paragraph(f"□ 세부 추진 계획 {index}-{n} {{{{green:공공데이터 기반}}}} 분석 결과를 반영한다.", 1 + n % 3)
+                 for n in range(20)]
+        content.append(Section(f"{index + 1}. 추진 계획", items, id=f"section{index + 1}"))
+        content.append(Table([f"열{n}" for n in range(5)],
+                             [[f"항목 {r} 값 {r * n}" for n in range(5)] for r in range(15)], id=f"table_{index}"))
+    return Document({"title": "벤치마크 제안서", "include_title": True}, content)
+
+
+def load_document(path, scale):
+    if path is None:
+        return synthetic_document(scale)
+    text = Path(path).read_text(encoding="utf-8")
+    if path.endswith(".md"):
+        from markdown_to_json import MarkdownToJsonConverter
+        doc = MarkdownToJsonConverter().convert_markdown_to_document(text)
+    else:
+        doc = as_document(json.loads(text))
+    doc.content = doc.content * scale
+    return doc
+
+
+def xml_size(hwpx_bytes):
+    with zipfile.ZipFile(io.BytesIO(hwpx_bytes)) as zf:
+        return sum(info.file_size for info in zf.infolist() if info.filename.startswith("Contents/"))
+
+
+def measure(generator, doc, repeat, **kwargs):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            hwpx_bytes = generator.generate_bytes(doc, **kwargs)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), hwpx_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HWPX 출력 크기/시간 벤치마크")
+    parser.add_argument("input", nargs="?", help="proposal JSON 또는 마크다운 (생략 시 합성 문서)")
+    parser.add_argument("--scale", type=int, default=8, help="content 반복 배수 (합성 문서: 장 10개 단위)")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 6, 9], help="compact 모드 deflate 수준")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (중앙값 사용)")
+    args = parser.parse_args()
+
+    doc = load_document(args.input, args.scale)
+    generator = HWPXGenerator(base_dir=str(PROJECT_ROOT), embed_fonts=False)
+
+    modes = [("default", {})] + [(f"compact -{level}", {"compact": True, "compress_level": level})
+                                 for level in args.levels]
+
+    print(f"{'mode':<12} {'hwpx':>12} {'xml':>14} {'median ms':>10} {'size':>7}")
+    baseline = None
+    for name, kwargs in modes:
+        median, hwpx_bytes = measure(generator, doc, args.repeat, **kwargs)
+        baseline = baseline or len(hwpx_bytes)
+        print(f"{name:<12} {len(hwpx_bytes):12,} {xml_size(hwpx_bytes):14,} {median * 1000:10.1f} "
+              f"{len(hwpx_bytes) / baseline:6.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+/api/generate-hwpx 요청 디코딩 벤치마크
+
+표가 붙여넣어진 대용량(수 MB) 요청 JSON을 만들어
+기존 pydantic 경로와 _fast_decode(HWPX_FAST_DECODE=1) 경로의 디코딩 시간/메모리를 비교한다.
+
+- pydantic: FastAPI 기본 동작 (json.loads → GenerateRequest 검증) + 기존 sections dict 복사/total_chars 계산
+- pydantic-json: GenerateRequest.model_validate_json (참고용)
+- fast: _fast_decode.decode_generate_request (msgspec 또는 orjson/json)
+
+사용법:
+  python bench_request_decode.py [--mb 1 4 16] [--repeat 5]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(PROJECT_ROOT / "api"))
+
+from _fast_decode import DECODER, decode_generate_request  # noqa: E402
+from index import GenerateRequest  # noqa: E402
+
+
+def make_payload(target_mb):
+    """본문 문단 + HTML 표가 섞인 섹션들로 target_mb 크기의 요청 JSON 생성"""
+    row = "<tr>" + "".join(f"<td>항목 {i} 데이터 값 {i * 37}</td>" for i in range(6)) + "</tr>"
+    table = "<table><thead><tr>" + "".join(f"<th>열{i}</th>" for i in range(6)) + "</tr></thead><tbody>" + row * 40 + "</tbody></table>"
+    paragraph = '<p>□ 사업 추진 배경 및 필요성 <span class="text-green-600">공공데이터 기반</span> 분석 결과를 반영한다.</p>\n'
+    section_text = paragraph * 30 + table + paragraph * 10
+
+    sections = []
+    size = 0
+    while size < target_mb * 1024 * 1024:
+        sections.append({"title": f"{len(sections) + 1}. 세부 추진 계획", "text": section_text})
+        size += len(section_text.encode("utf-8"))
+
+    body = {"title": "대용량 제안서", "sections": sections, "organization": "Architect PRO",
+            "date": "2026. 1. 1.", "model": "bench", "preset": "제안서"}
+    return json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+
+def decode_pydantic(body):
+    req = GenerateRequest.model_validate(json.loads(body))
+    sum(len(s.text or "") for s in req.sections)
+    return [{"title": s.title, "text": s.text} for s in req.sections]
+
+
+def decode_pydantic_json(body):
+    return GenerateRequest.model_validate_json(body).sections
+
+
+def decode_fast(body):
+    return decode_generate_request(body).sections
+
+
+def measure(func, body, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(body)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(body)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(times), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="요청 JSON 디코딩 경로 벤치마크")
+    parser.add_argument("--mb", type=float, nargs="+", default=[1, 4, 16], help="요청 본문 크기(MB)")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수 (중앙값 사용)")
+    args = parser.parse_args()
+
+    paths = [("pydantic", decode_pydantic), ("pydantic-json", decode_pydantic_json), (f"fast ({DECODER})", decode_fast)]
+
+    print(f"{'size':>8}  {'path':<16} {'median ms':>10} {'peak MB':>8} {'speedup':>8}")
+    for mb in args.mb:
+        body = make_payload(mb)
+        baseline = None
+        for name, func in paths:
+            median, peak = measure(func, body, args.repeat)
+            baseline = baseline or median
+            print(f"{len(body) / 1024 / 1024:7.1f}M  {name:<16} {median * 1000:10.2f} {peak / 1024 / 1024:8.1f} "
+                  f"{baseline / median:7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
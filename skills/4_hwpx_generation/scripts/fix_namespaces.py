@@ -8,16 +8,169 @@ python-hwpx가 생성한 HWPX 파일의 XML 네임스페이스 프리픽스를
 이 스크립트를 실행하지 않으면 한글 Viewer(특히 macOS)에서
 문서가 빈 페이지로 표시될 수 있다.
 
+Contents/*.xml을 문자열로 디코딩하지 않고 바이트 그대로 다룬다.
+- 교체할 별칭(ns0, ns1 ...)은 루트 요소의 네임스페이스 선언에서만 찾는다 (엔트리 앞부분만 해제)
+- 교체가 필요한 엔트리는 청크 단위로 읽으며 bytes.replace로 교체해 바로 압축 기록
+- 나머지 엔트리는 압축 해제/재압축 없이 raw 복사, 교체할 것이 없는 파일은 아예 다시 쓰지 않음
+디렉토리나 glob을 넘기면 프로세스 풀에서 파일 단위로 병렬 처리한다.
+
 사용법:
-  CLI:    python fix_namespaces.py <file.hwpx>
-  Import: exec(open("fix_namespaces.py").read())
+  단일:  python fix_namespaces.py <file.hwpx>
+  일괄:  python fix_namespaces.py archive/ "legacy/**/*.hwpx" [-o out/] [-j 4] [--check]
+  Import: from fix_namespaces import fix_hwpx_namespaces
           fix_hwpx_namespaces("output.hwpx")
 """
 
-import zipfile
+import argparse
+import glob
+import io
 import os
 import re
+import shutil
 import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from hwpx_archive import copy_entry_raw, rewrite_archive  # noqa: E402
+
+
+NS_MAP = {
+    "http://www.hancom.co.kr/hwpml/2011/head": "hh",
+    "http://www.hancom.co.kr/hwpml/2011/core": "hc",
+    "http://www.hancom.co.kr/hwpml/2011/paragraph": "hp",
+    "http://www.hancom.co.kr/hwpml/2011/section": "hs",
+}
+_NS_PREFIXES = {uri.encode(): prefix.encode() for uri, prefix in NS_MAP.items()}
+
+_ROOT_TAG = re.compile(rb"<(?![?!])[^>]*>")
+_XMLNS_ALIAS = re.compile(rb'xmlns:(ns\d+)="([^"]+)"')
+_ROOT_SCAN_LIMIT = 1024 * 1024  # 루트 시작 태그를 찾을 최대 바이트
+_CHUNK = 256 * 1024
+
+
+def _root_aliases(head):
+    """XML 앞부분(루트 시작 태그 포함)에서 {별칭: 표준 프리픽스} (b"ns0" → b"hh")"""
+    match = _ROOT_TAG.search(head)
+    if match is None:
+        return {}
+    return {alias: _NS_PREFIXES[uri] for alias, uri in _XMLNS_ALIAS.findall(match.group(0))
+            if uri in _NS_PREFIXES}
+
+
+def _replacements(aliases):
+    """(찾을 바이트, 바꿀 바이트) 목록 - xmlns:ns0= / <ns0: / </ns0: (구분자까지 포함해 ns1과 ns10이 섞이지 않음)"""
+    pairs = []
+    for alias, prefix in aliases.items():
+        pairs += [(b"xmlns:" + alias + b"=", b"xmlns:" + prefix + b"="),
+                  (b"<" + alias + b":", b"<" + prefix + b":"),
+                  (b"</" + alias + b":", b"</" + prefix + b":")]
+    return pairs
+
+
+def _replace_all(data, pairs):
+    for old, new in pairs:
+        data = data.replace(old, new)
+    return data
+
+
+def _read_head(stream):
+    """루트 시작 태그가 끝날 때까지 읽은 앞부분"""
+    head = b""
+    while len(head) < _ROOT_SCAN_LIMIT:
+        chunk = stream.read(_CHUNK if head else 4096)
+        if not chunk:
+            break
+        head += chunk
+        if _ROOT_TAG.search(head):
+            break
+    return head
+
+
+def _fix_xml_stream(src, dst, aliases):
+    """src 스트림을 청크 단위로 교체하며 dst에 기록 (열린 태그가 청크 끝에 걸리면 다음 청크와 합침)"""
+    pairs = _replacements(aliases)
+    pending = b""
+    while True:
+        chunk = src.read(_CHUNK)
+        if not chunk:
+            break
+        pending += chunk
+        # 마지막 '<' 뒤에 '>'가 없으면 태그가 잘렸을 수 있으므로 그 부분은 남겨 둔다
+        cut = pending.rfind(b"<")
+        if cut == -1 or pending.rfind(b">") > cut:
+            cut = len(pending)
+        dst.write(_replace_all(pending[:cut], pairs))
+        pending = pending[cut:]
+    dst.write(_replace_all(pending, pairs))
+
+
+def _is_contents_xml(name):
+    return name.startswith("Contents/") and name.endswith(".xml")
+
+
+def _plan(zin):
+    """교체가 필요한 Contents/*.xml 엔트리 {이름: 별칭 dict} (각 엔트리의 앞부분만 해제)"""
+    plan = {}
+    for info in zin.infolist():
+        if _is_contents_xml(info.filename):
+            with zin.open(info) as stream:
+                aliases = _root_aliases(_read_head(stream))
+            if aliases:
+                plan[info.filename] = aliases
+    return plan
+
+
+def fix_hwpx_file(hwpx_path, output_path=None, check_only=False):
+    """
+    HWPX 파일 하나의 네임스페이스 프리픽스 교체
+
+    Args:
+        hwpx_path: 입력 .hwpx 경로
+        output_path: 저장 경로 (None이면 제자리 교체)
+        check_only: 교체가 필요한지 확인만 하고 쓰지 않음
+
+    Returns:
+        (hwpx_path, 상태 "fixed" | "unchanged" | "needs-fix", 교체한 엔트리 수, 초, 오류 메시지 또는 None)
+    """
+    start = time.perf_counter()
+    try:
+        with zipfile.ZipFile(hwpx_path, "r") as zin:
+            plan = _plan(zin)
+            if check_only or not plan:
+                if not check_only and not plan and output_path \
+                        and os.path.abspath(output_path) != os.path.abspath(hwpx_path):
+                    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copyfile(hwpx_path, output_path)
+                status = "needs-fix" if plan else "unchanged"
+                return hwpx_path, status, len(plan), time.perf_counter() - start, None
+
+            target = output_path or hwpx_path
+            Path(target).parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = f"{target}.{os.getpid()}.tmp"
+            try:
+                with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as zout:
+                    for info in zin.infolist():
+                        aliases = plan.get(info.filename)
+                        if aliases is None:
+                            copy_entry_raw(zin, info, zout)
+                            continue
+                        zinfo = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+                        zinfo.compress_type = info.compress_type
+                        zinfo.external_attr = info.external_attr
+                        with zin.open(info) as src, zout.open(zinfo, "w") as dst:
+                            _fix_xml_stream(src, dst, aliases)
+                os.replace(tmp_path, target)
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+    except (OSError, zipfile.BadZipFile, zipfile.LargeZipFile) as e:
+        return hwpx_path, "error", 0, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+
+    return hwpx_path, "fixed", len(plan), time.perf_counter() - start, None
 
 
 def fix_hwpx_namespaces(hwpx_path):
@@ -28,51 +181,99 @@ def fix_hwpx_namespaces(hwpx_path):
     Args:
         hwpx_path: 수정할 .hwpx 파일 경로
     """
-    NS_MAP = {
-        "http://www.hancom.co.kr/hwpml/2011/head": "hh",
-        "http://www.hancom.co.kr/hwpml/2011/core": "hc",
-        "http://www.hancom.co.kr/hwpml/2011/paragraph": "hp",
-        "http://www.hancom.co.kr/hwpml/2011/section": "hs",
-    }
+    _, _, _, _, error = fix_hwpx_file(hwpx_path)
+    if error:
+        raise RuntimeError(f"{hwpx_path}: {error}")
+
+
+def fix_hwpx_namespaces_bytes(hwpx_bytes):
+    """
+    fix_hwpx_namespaces의 메모리 버전 - HWPX bytes를 받아 수정된 bytes 반환
 
-    tmp_path = hwpx_path + ".tmp"
+    교체할 프리픽스가 없으면 재압축 없이 입력을 그대로 반환한다.
+    교체한 엔트리만 다시 압축하고 나머지는 raw 복사한다.
+    """
+    with zipfile.ZipFile(io.BytesIO(hwpx_bytes), "r") as zin:
+        fixed = {}
+        for name, aliases in _plan(zin).items():
+            fixed[name] = _replace_all(zin.read(name), _replacements(aliases))
 
-    with zipfile.ZipFile(hwpx_path, "r") as zin:
-        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as zout:
-            for item in zin.infolist():
-                data = zin.read(item.filename)
+    if not fixed:
+        return hwpx_bytes
+    return rewrite_archive(hwpx_bytes, fixed)
 
-                if item.filename.startswith("Contents/") and item.filename.endswith(".xml"):
-                    text = data.decode("utf-8")
 
-                    ns_aliases = {}
-                    for match in re.finditer(r'xmlns:(ns\d+)="([^"]+)"', text):
-                        alias, uri = match.group(1), match.group(2)
-                        if uri in NS_MAP:
-                            ns_aliases[alias] = NS_MAP[uri]
+def _fix_job(job):
+    return fix_hwpx_file(*job)
 
-                    for old_prefix, new_prefix in ns_aliases.items():
-                        text = text.replace(f"xmlns:{old_prefix}=", f"xmlns:{new_prefix}=")
-                        text = text.replace(f"<{old_prefix}:", f"<{new_prefix}:")
-                        text = text.replace(f"</{old_prefix}:", f"</{new_prefix}:")
 
-                    data = text.encode("utf-8")
+def _expand_inputs(patterns):
+    """파일/디렉토리/glob 패턴을 .hwpx 파일 목록으로 확장 (입력 기준 디렉토리와 함께)"""
+    inputs = []
+    seen = set()  # 디렉토리와 glob이 겹쳐도 같은 파일을 두 worker가 동시에 고치지 않도록
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths = [(path, pattern) for path in sorted(glob.glob(os.path.join(pattern, "**", "*.hwpx"), recursive=True))]
+        else:
+            paths = [(path, None) for path in sorted(glob.glob(pattern, recursive=True)) or [pattern]]
+        for path, base in paths:
+            key = os.path.realpath(path)
+            if key not in seen:
+                seen.add(key)
+                inputs.append((path, base))
+    return inputs
 
-                zout.writestr(item, data)
 
-    os.replace(tmp_path, hwpx_path)
+def _output_path(hwpx_path, base_dir, output):
+    """출력 디렉토리 안의 대응 경로 (디렉토리 입력은 하위 구조 유지, 출력 디렉토리가 없으면 제자리)"""
+    if not output:
+        return None
+    relative = Path(os.path.relpath(hwpx_path, base_dir)) if base_dir else Path(Path(hwpx_path).name)
+    return str(Path(output) / relative)
 
 
-if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python fix_namespaces.py <file.hwpx>")
-        print("  Fixes namespace prefixes for Hangul Viewer compatibility.")
-        sys.exit(1)
+def main():
+    parser = argparse.ArgumentParser(description="HWPX 네임스페이스 프리픽스 교체 (한글 Viewer 호환)")
+    parser.add_argument("inputs", nargs="+", help=".hwpx 파일, 디렉토리 또는 glob 패턴")
+    parser.add_argument("-o", "--output", help="출력 디렉토리 (기본: 제자리 교체)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="병렬 worker 수 (기본: CPU 수)")
+    parser.add_argument("--check", action="store_true", help="교체가 필요한 파일만 출력 (쓰지 않음, 있으면 종료 코드 1)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="변경 없는 파일도 출력")
+    args = parser.parse_args()
 
-    path = sys.argv[1]
-    if not os.path.exists(path):
+    inputs = _expand_inputs(args.inputs)
+    missing = [path for path, _ in inputs if not os.path.isfile(path)]
+    for path in missing:
         print(f"Error: File not found: {path}")
+    inputs = [(path, base) for path, base in inputs if os.path.isfile(path)]
+    if not inputs:
         sys.exit(1)
 
-    fix_hwpx_namespaces(path)
-    print(f"Fixed namespaces: {path}")
+    jobs = [(path, _output_path(path, base, args.output), args.check) for path, base in inputs]
+    workers = max(1, min(args.jobs or os.cpu_count() or 1, len(jobs)))
+
+    started = time.perf_counter()
+    if workers == 1:
+        results = [_fix_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_fix_job, jobs, chunksize=max(1, len(jobs) // (workers * 8))))
+    elapsed = time.perf_counter() - started
+
+    counts = {}
+    for path, status, entries, seconds, error in results:
+        counts[status] = counts.get(status, 0) + 1
+        if error:
+            print(f"✗ {path}  {error}")
+        elif status != "unchanged" or args.verbose:
+            print(f"{status:<10} {entries:>3} entries {seconds * 1000:8.1f}ms  {path}")
+
+    total_mb = sum(os.path.getsize(path) for path, _ in inputs) / 1024 / 1024
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+    print(f"✓ {len(results)} files ({total_mb:.1f} MB): {summary} in {elapsed:.2f}s ({workers} worker(s))")
+    if missing or counts.get("error") or (args.check and counts.get("needs-fix")):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
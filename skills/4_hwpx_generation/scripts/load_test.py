@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+/api/generate-hwpx 부하 테스트 (외부 서비스 없이)
+
+api/index.py 앱을 같은 프로세스에서 ASGI로 직접 호출하거나(기본),
+로컬에 띄운 서버(--url, 예: uvicorn api.index:app)에 HTTP로 요청을 보낸다.
+
+- 요청 모음: 크기/표 수/preset/우선순위를 섞은 합성 요청 (--seed로 재현), 또는 --corpus JSONL 재생
+  (한 줄에 요청 본문 하나, --record로 합성 요청 저장)
+- 부하 모델: 동시 실행 수 고정(--concurrency, closed loop) 또는 도착률 고정(--rate 초당 요청, 포아송)
+  --concurrency 1 2 4 8 처럼 여러 값을 주면 차례로 측정해 p99가 급증하는 지점을 본다.
+- 결과: 처리량, 지연 백분위(p50/p90/p95/p99/max), 오류율, 대기(X-Queue-Time-Ms), 시간에 따른 RSS
+  → 표준 출력 요약 + --json / --html 보고서
+
+사용법:
+  python load_test.py [--concurrency 1 2 4 8] [--requests 40] [--rate 2 --duration 30]
+                      [--url http://127.0.0.1:8000] [--pid 서버PID] [--corpus reqs.jsonl] [--record reqs.jsonl]
+                      [--distinct] [--json report.json] [--html report.html]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import html
+import http.client
+import io
+import json
+import os
+import random
+import resource
+import statistics
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+ENDPOINT = "/api/generate-hwpx"
+PERCENTILES = (50, 90, 95, 99)
+
+
+# --- 요청 모음 ---
+
+def synthesize_corpus(count, seed):
+    """섹션 수/문단 수/표 크기/preset/우선순위를 섞은 합성 요청 본문 목록"""
+    rng = random.Random(seed)
+    paragraph = ('<p>□ 세부 추진 계획 {n} <span class="text-green-600">공공데이터 기반</span> '
+                 '분석 결과를 반영하고 <span class="text-red-500">총괄 PM</span>이 관리한다.</p>\n')
+    corpus = []
+    for index in range(count):
+        size = rng.choices(("small", "medium", "large"), weights=(5, 3, 1))[0]
+        section_count, paragraphs, table_rows = {"small": (2, 8, 0), "medium": (6, 20, 10),
+                                                 "large": (20, 30, 40)}[size]
+        sections = []
+        for number in range(section_count):
+            text = "".join(paragraph.format(n=f"{number}-{p}") for p in range(paragraphs))
+            if table_rows:
+                row = "<tr>" + "".join(f"<td>항목 {c} 값 {c * 37}</td>" for c in range(5)) + "</tr>"
+                text += ("<table><thead><tr>" + "".join(f"<th>열{c}</th>" for c in range(5))
+                         + "</tr></thead><tbody>" + row * table_rows + "</tbody></table>")
+            sections.append({"title": f"{number + 1}. 세부 추진 계획", "text": text})
+        corpus.append({
+            "title": f"부하 테스트 제안서 {index} ({size})",
+            "sections": sections,
+            "organization": "Architect PRO",
+            "date": "2026. 1. 1.",
+            "model": "loadtest",
+            "preset": rng.choice(("제안서", "제안서", "보고서", "공문서")),
+            "priority": rng.choices(("interactive", "normal", "bulk"), weights=(2, 5, 3))[0],
+        })
+    return corpus
+
+
+def load_corpus(path):
+    """JSONL 요청 모음 (빈 줄 무시, sections가 없는 줄은 건너뜀)"""
+    corpus = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        if line.strip():
+            body = json.loads(line)
+            if isinstance(body, dict) and "sections" in body:
+                corpus.append(body)
+    return corpus
+
+
+# --- 클라이언트 ---
+
+class AsgiClient:
+    """같은 프로세스의 ASGI 앱 호출 (응답 본문은 크기만 기록)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def post(self, path, body, headers):
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+        response = {"status": 0, "headers": {}, "bytes": 0}
+
+        async def receive():
+            return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = {k.decode().lower(): v.decode() for k, v in message["headers"]}
+            elif message["type"] == "http.response.body":
+                response["bytes"] += len(message.get("body", b""))
+
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+            "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"", "root_path": "",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+            "client": ("127.0.0.1", 0), "server": ("loadtest", 80),
+        }
+        await self.app(scope, receive, send)
+        return response
+
+
+class HttpClient:
+    """로컬 서버에 HTTP 요청 (http.client, 요청마다 스레드 하나)"""
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+
+    def _post(self, path, body, headers):
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=300)
+        try:
+            conn.request("POST", self.prefix + path, body=body, headers=headers)
+            resp = conn.getresponse()
+            data = resp.read()
+            return {"status": resp.status, "headers": {k.lower(): v for k, v in resp.getheaders()},
+                    "bytes": len(data)}
+        finally:
+            conn.close()
+
+    async def post(self, path, body, headers):
+        return await asyncio.to_thread(self._post, path, body, headers)
+
+
+# --- RSS ---
+
+def read_rss_mb(pid=None):
+    """현재 RSS(MB) - /proc 기준, 없으면 최대 RSS(getrusage)"""
+    try:
+        with open(f"/proc/{pid or 'self'}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / 1024 / (1024 if sys.platform == "darwin" else 1)
+
+
+async def sample_rss(samples, start, pid, interval, stop):
+    while not stop.is_set():
+        samples.append((round(time.perf_counter() - start, 3), round(read_rss_mb(pid), 1)))
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(stop.wait(), interval)
+
+
+# --- 실행 ---
+
+async def send_one(client, body, index, distinct, start, results):
+    if distinct:
+        # 같은 요청 합치기(single-flight)를 피하려면 요청마다 제목을 다르게
+        body = dict(body, title=f"{body['title']} #{index}")
+    payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+    headers = {"Content-Type": "application/json", "X-Priority": body.get("priority") or "normal"}
+
+    sent = time.perf_counter()
+    try:
+        response = await client.post(ENDPOINT, payload, headers)
+        error = None if response["status"] == 200 else f"HTTP {response['status']}"
+    except Exception as e:
+        response, error = {"status": 0, "headers": {}, "bytes": 0}, f"{type(e).__name__}: {e}"
+    done = time.perf_counter()
+    results.append({
+        "at": round(sent - start, 4),
+        "latency_ms": round((done - sent) * 1000, 2),
+        "status": response["status"],
+        "error": error,
+        "bytes": response["bytes"],
+        "priority": response["headers"].get("x-priority-class", body.get("priority", "")),
+        "queue_ms": float(response["headers"].get("x-queue-time-ms", 0) or 0),
+    })
+
+
+async def run_closed(client, corpus, concurrency, total, distinct, start, results):
+    """동시 실행 수 고정 - 워커마다 끝나면 다음 요청"""
+    counter = iter(range(total))
+
+    async def worker():
+        for index in counter:
+            await send_one(client, corpus[index % len(corpus)], index, distinct, start, results)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def run_open(client, corpus, rate, duration, distinct, start, results, seed):
+    """도착률 고정 (포아송 도착) - 응답을 기다리지 않고 시간에 맞춰 보냄"""
+    rng = random.Random(seed)
+    tasks = []
+    index = 0
+    next_at = 0.0
+    while next_at < duration:
+        delay = start + next_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(
+            send_one(client, corpus[index % len(corpus)], index, distinct, start, results)))
+        index += 1
+        next_at += rng.expovariate(rate)
+    await asyncio.gather(*tasks)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return round(ordered[low] + (ordered[high] - ordered[low]) * (rank - low), 2)
+
+
+def summarize(label, results, elapsed, rss):
+    latencies = [r["latency_ms"] for r in results if r["error"] is None]
+    errors = [r for r in results if r["error"] is not None]
+    by_class = {}
+    for r in results:
+        if r["error"] is None:
+            by_class.setdefault(r["priority"], []).append(r["latency_ms"])
+    return {
+        "label": label,
+        "requests": len(results),
+        "errors": len(errors),
+        "error_rate": round(len(errors) / len(results), 4) if results else 0.0,
+        "error_samples": sorted({r["error"] for r in errors})[:5],
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 3) if elapsed else 0.0,
+        "latency_ms": {
+            **{f"p{pct}": percentile(latencies, pct) for pct in PERCENTILES},
+            "mean": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+            "max": max(latencies, default=0.0),
+        },
+        "queue_ms_p99": percentile([r["queue_ms"] for r in results if r["error"] is None], 99),
+        "p99_by_class": {name: percentile(values, 99) for name, values in sorted(by_class.items())},
+        "rss_mb": {"start": rss[0][1] if rss else 0.0, "max": max((mb for _, mb in rss), default=0.0),
+                   "end": rss[-1][1] if rss else 0.0},
+        "timeline": sorted(results, key=lambda r: r["at"]),
+        "rss_timeline": rss,
+    }
+
+
+async def run_level(client, corpus, args, label, concurrency=None):
+    results, rss = [], []
+    stop = asyncio.Event()
+    start = time.perf_counter()
+    sampler = asyncio.create_task(sample_rss(rss, start, args.pid, args.rss_interval, stop))
+    if args.rate:
+        await run_open(client, corpus, args.rate, args.duration, args.distinct, start, results, args.seed)
+    else:
+        await run_closed(client, corpus, concurrency, args.requests, args.distinct, start, results)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await sampler
+    return summarize(label, results, elapsed, rss)
+
+
+# --- 보고서 ---
+
+def _svg_line(points, width=640, height=160, color="#2563eb"):
+    """[(x, y), ...] → 축 눈금이 붙은 간단한 SVG 꺾은선/점 그래프"""
+    if not points:
+        return "<svg></svg>"
+    max_x = max(x for x, _ in points) or 1
+    max_y = max(y for _, y in points) or 1
+    pad = 40
+    coords = " ".join(f"{pad + x / max_x * (width - pad - 10):.1f},{height - 20 - y / max_y * (height - 30):.1f}"
+                      for x, y in points)
+    return (f'<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">'
+            f'<line x1="{pad}" y1="{height - 20}" x2="{width - 10}" y2="{height - 20}" stroke="#999"/>'
+            f'<line x1="{pad}" y1="10" x2="{pad}" y2="{height - 20}" stroke="#999"/>'
+            f'<text x="2" y="18" font-size="10">{max_y:.0f}</text>'
+            f'<text x="{width - 40}" y="{height - 5}" font-size="10">{max_x:.1f}s</text>'
+            f'<polyline fill="none" stroke="{color}" stroke-width="1.5" points="{coords}"/></svg>')
+
+
+def write_html(path, report):
+    rows = []
+    for level in report["levels"]:
+        lat = level["latency_ms"]
+        rows.append(
+            f"<tr><td>{html.escape(level['label'])}</td><td>{level['requests']}</td>"
+            f"<td>{level['throughput_rps']}</td><td>{lat['p50']}</td><td>{lat['p90']}</td><td>{lat['p95']}</td>"
+            f"<td>{lat['p99']}</td><td>{lat['max']}</td><td>{level['error_rate']:.1%}</td>"
+            f"<td>{level['queue_ms_p99']}</td><td>{level['rss_mb']['max']}</td></tr>")
+    charts = []
+    for level in report["levels"]:
+        latency_points = [(r["at"], r["latency_ms"]) for r in level["timeline"] if r["error"] is None]
+        charts.append(
+            f"<h3>{html.escape(level['label'])}</h3>"
+            f"<p>지연 시간(ms) - 요청 시작 시각 기준</p>{_svg_line(latency_points)}"
+            f"<p>RSS(MB)</p>{_svg_line(level['rss_timeline'], color='#dc2626')}")
+    Path(path).write_text(
+        "<!doctype html><meta charset='utf-8'><title>HWPX 부하 테스트</title>"
+        "<style>body{font-family:sans-serif;margin:24px}table{border-collapse:collapse}"
+        "td,th{border:1px solid #ccc;padding:4px 8px;text-align:right}</style>"
+        f"<h1>HWPX 부하 테스트</h1><p>{html.escape(json.dumps(report['config'], ensure_ascii=False))}</p>"
+        "<table><tr><th>단계</th><th>요청</th><th>처리량(rps)</th><th>p50</th><th>p90</th><th>p95</th>"
+        "<th>p99</th><th>max</th><th>오류율</th><th>대기 p99</th><th>RSS max(MB)</th></tr>"
+        + "".join(rows) + "</table>" + "".join(charts),
+        encoding="utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/api/generate-hwpx 부하 테스트")
+    parser.add_argument("--url", help="로컬 서버 주소 (생략 시 같은 프로세스에서 ASGI 호출)")
+    parser.add_argument("--pid", type=int, help="--url 사용 시 RSS를 잴 서버 프로세스 PID")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8], help="동시 실행 수 (단계별)")
+    parser.add_argument("--requests", type=int, default=40, help="단계별 요청 수 (closed loop)")
+    parser.add_argument("--rate", type=float, help="초당 도착 요청 수 (open loop, --concurrency 무시)")
+    parser.add_argument("--duration", type=float, default=30, help="--rate 사용 시 측정 시간(초)")
+    parser.add_argument("--corpus", help="요청 본문 JSONL (생략 시 합성)")
+    parser.add_argument("--corpus-size", type=int, default=50, help="합성 요청 수")
+    parser.add_argument("--record", help="사용한 요청 모음을 JSONL로 저장 (재생용)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--distinct", action="store_true", help="요청마다 제목을 달리해 요청 합치기 방지")
+    parser.add_argument("--warmup", type=int, default=2, help="측정 전 워밍업 요청 수")
+    parser.add_argument("--rss-interval", type=float, default=0.25, help="RSS 측정 간격(초)")
+    parser.add_argument("--json", help="JSON 보고서 경로")
+    parser.add_argument("--html", help="HTML 보고서 경로")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthesize_corpus(args.corpus_size, args.seed)
+    if not corpus:
+        parser.error("요청 모음이 비어 있습니다")
+    if args.record:
+        Path(args.record).write_text("".join(json.dumps(body, ensure_ascii=False) + "\n" for body in corpus),
+                                     encoding="utf-8")
+
+    if args.url:
+        client = HttpClient(args.url)
+    else:
+        sys.path.insert(0, str(PROJECT_ROOT / "api"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            from index import app
+        client = AsgiClient(app)
+
+    levels = [("rate", None)] if args.rate else [("concurrency", c) for c in args.concurrency]
+
+    async def run_all():
+        # 생성 로그(print)는 측정 중에 버림 - 진행 상황은 stderr
+        with contextlib.redirect_stdout(io.StringIO()) as sink:
+            for index in range(args.warmup):
+                await send_one(client, corpus[index % len(corpus)], -1 - index, args.distinct,
+                               time.perf_counter(), [])
+            summaries = []
+            for kind, value in levels:
+                label = f"rate {args.rate}/s x {args.duration}s" if kind == "rate" else f"concurrency {value}"
+                summaries.append(await run_level(client, corpus, args, label, value))
+                sink.seek(0)
+                sink.truncate()
+                lat = summaries[-1]["latency_ms"]
+                print(f"[LoadTest] {label}: {summaries[-1]['throughput_rps']} rps, p50 {lat['p50']}ms, "
+                      f"p99 {lat['p99']}ms, errors {summaries[-1]['error_rate']:.1%}", file=sys.stderr)
+        return summaries
+
+    summaries = asyncio.run(run_all())
+
+    print(f"{'level':<24} {'req':>5} {'rps':>7} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9} {'err':>6} "
+          f"{'queue p99':>10} {'rss max':>8}")
+    for level in summaries:
+        lat = level["latency_ms"]
+        print(f"{level['label']:<24} {level['requests']:5} {level['throughput_rps']:7.2f} {lat['p50']:9.1f} "
+              f"{lat['p90']:9.1f} {lat['p99']:9.1f} {lat['max']:9.1f} {level['error_rate']:6.1%} "
+              f"{level['queue_ms_p99']:10.1f} {level['rss_mb']['max']:8.1f}")
+
+    report = {
+        "config": {
+            "target": args.url or "in-process ASGI", "corpus": args.corpus or f"synthetic({args.corpus_size})",
+            "seed": args.seed, "distinct": args.distinct, "requests": args.requests,
+            "rate": args.rate, "duration": args.duration if args.rate else None,
+            "max_concurrency_env": os.environ.get("HWPX_MAX_CONCURRENCY", "2"),
+        },
+        "levels": summaries,
+    }
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    if args.html:
+        write_html(args.html, report)
+
+
+if __name__ == "__main__":
+    main()
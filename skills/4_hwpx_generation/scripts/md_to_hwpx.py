@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+마크다운 → HWPX 직접 변환 CLI
+
+markdown_to_json.py가 만든 중간 JSON 파일 없이
+마크다운 → 메모리 내 proposal JSON → HWPX bytes → .hwpx 파일로 한 번에 변환한다.
+디렉토리나 glob을 넘기면 프로세스 풀에서 병렬로 변환하며,
+각 worker는 preset 풀(hwpx_presets)에서 준비된 템플릿/스타일로 생성기를 한 번만 만들어 재사용한다.
+
+사용법:
+  단일:  python md_to_hwpx.py proposal.md [-o output.hwpx]
+  일괄:  python md_to_hwpx.py drafts/ "more/*.md" -o out/ -j 4
+  preset: python md_to_hwpx.py report.md --preset 보고서
+  최소 크기: python md_to_hwpx.py proposal.md --compact --compress-level 9
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+SKILL_DIR = SCRIPT_DIR.parent
+PROJECT_ROOT = SKILL_DIR.parent.parent
+
+sys.path.insert(0, str(SKILL_DIR / "src"))
+sys.path.insert(0, str(PROJECT_ROOT / "skills" / "3_proposal_writing"))
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from fix_namespaces import fix_hwpx_namespaces_bytes  # noqa: E402
+from hwpx_presets import PresetPool  # noqa: E402
+from hwpx_templates import PRESET_ALIASES, PRESETS, canonical_preset  # noqa: E402
+from markdown_to_json import MarkdownToJsonConverter  # noqa: E402
+
+# worker 프로세스별로 한 번만 만드는 변환기 (템플릿/스타일 preload)
+_worker = {}
+
+
+def _init_worker(preset, styles_path, verbose):
+    """worker 초기화: preset 템플릿 준비(compile_template) + 생성기/변환기 생성"""
+    name = canonical_preset(preset)
+    presets = None
+    if styles_path:
+        presets = dict(PRESETS, **{name: dict(PRESETS[name], styles=styles_path)})
+    with _quiet(not verbose):
+        generator = PresetPool(PROJECT_ROOT, presets=presets).generator(name)
+
+    _worker["generator"] = generator
+    _worker["converter"] = MarkdownToJsonConverter()
+    _worker["verbose"] = verbose
+
+
+@contextlib.contextmanager
+def _quiet(enabled):
+    """생성기의 단계별 print 출력 숨기기"""
+    if not enabled:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def convert_markdown(md_path, output_path, max_sections=1, compact=False, compress_level=None):
+    """
+    마크다운 파일 하나를 HWPX로 변환 (_init_worker 이후 호출)
+
+    Returns:
+        (md_path, output_path, {단계: 초}, 오류 메시지 또는 None)
+    """
+    timings = {}
+    try:
+        start = time.perf_counter()
+        with open(md_path, "r", encoding="utf-8") as f:
+            markdown_text = f.read()
+        with _quiet(not _worker["verbose"]):
+            data = _worker["converter"].convert_markdown_to_document(markdown_text)
+        timings["parse"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with _quiet(not _worker["verbose"]):
+            hwpx_bytes = _worker["generator"].generate_bytes(data, max_sections=max_sections, workers=1,
+                                                             compact=compact, compress_level=compress_level)
+        hwpx_bytes = fix_hwpx_namespaces_bytes(hwpx_bytes)
+        timings["generate"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "wb") as f:
+            f.write(hwpx_bytes)
+        timings["write"] = time.perf_counter() - start
+    except Exception as e:
+        return md_path, output_path, timings, f"{type(e).__name__}: {e}"
+
+    return md_path, output_path, timings, None
+
+
+def _convert_job(job):
+    return convert_markdown(*job)
+
+
+def _expand_inputs(patterns):
+    """파일/디렉토리/glob 패턴을 .md 파일 목록으로 확장 (입력 기준 디렉토리와 함께)"""
+    inputs = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for path in sorted(glob.glob(os.path.join(pattern, "**", "*.md"), recursive=True)):
+                inputs.append((path, pattern))
+        else:
+            for path in sorted(glob.glob(pattern)) or [pattern]:
+                inputs.append((path, None))
+    return inputs
+
+
+def _output_path(md_path, base_dir, output, batch):
+    """입력 경로에 대응하는 .hwpx 출력 경로"""
+    if output and not batch:
+        return output
+    if not output:
+        return str(Path(md_path).with_suffix(".hwpx"))
+    # 디렉토리 입력은 하위 구조를 유지
+    relative = Path(os.path.relpath(md_path, base_dir)) if base_dir else Path(Path(md_path).name)
+    return str(Path(output) / relative.with_suffix(".hwpx"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="마크다운 → HWPX 직접 변환 (중간 JSON 파일 없음)")
+    parser.add_argument("inputs", nargs="+", help=".md 파일, 디렉토리 또는 glob 패턴")
+    parser.add_argument("-o", "--output", help="출력 .hwpx 경로 (여러 파일이면 출력 디렉토리, 기본: 입력 옆)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="병렬 worker 수 (기본: CPU 수)")
+    parser.add_argument("--preset", default="제안서", choices=sorted(set(PRESETS) | set(PRESET_ALIASES)),
+                        help="문서 preset (템플릿 + 스타일, 기본: 제안서)")
+    parser.add_argument("--styles", help="스타일 JSON 경로 (기본: preset의 스타일)")
+    parser.add_argument("--max-sections", type=int, default=1, help="문서당 최대 section 파일 수")
+    parser.add_argument("--compact", action="store_true",
+                        help="들여쓰기 없이 기록 + header 미사용 charPr/paraPr/borderFill 제거")
+    parser.add_argument("--compress-level", type=int, choices=range(10), metavar="0-9",
+                        help="deflate 압축 수준 (기본: 6)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="생성 단계 로그 출력")
+    args = parser.parse_args()
+
+    inputs = _expand_inputs(args.inputs)
+    missing = [path for path, _ in inputs if not os.path.isfile(path)]
+    for path in missing:
+        print(f"Error: File not found: {path}")
+    inputs = [(path, base) for path, base in inputs if os.path.isfile(path)]
+    if not inputs:
+        sys.exit(1)
+
+    batch = len(inputs) > 1 or any(base for _, base in inputs)
+    jobs = [(path, _output_path(path, base, args.output, batch), args.max_sections, args.compact, args.compress_level)
+            for path, base in inputs]
+    workers = max(1, min(args.jobs or os.cpu_count() or 1, len(jobs)))
+
+    started = time.perf_counter()
+    if workers == 1:
+        _init_worker(args.preset, args.styles, args.verbose)
+        results = [_convert_job(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(args.preset, args.styles, args.verbose)) as executor:
+            results = list(executor.map(_convert_job, jobs))
+    elapsed = time.perf_counter() - started
+
+    failed = 0
+    print(f"{'parse':>8} {'generate':>9} {'write':>7} {'total':>7} {'size':>9}  file")
+    for md_path, output_path, timings, error in results:
+        if error:
+            failed += 1
+            print(f"{'-':>8} {'-':>9} {'-':>7} {'-':>7} {'-':>9}  {md_path}  ✗ {error}")
+            continue
+        total = sum(timings.values())
+        print(f"{timings['parse']:8.3f} {timings['generate']:9.3f} {timings['write']:7.3f} {total:7.3f} "
+              f"{os.path.getsize(output_path):9,}  "
+              f"{md_path} -> {output_path}")
+
+    print(f"✓ {len(results) - failed}/{len(results)} converted in {elapsed:.2f}s ({workers} worker(s))")
+    if failed or missing:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
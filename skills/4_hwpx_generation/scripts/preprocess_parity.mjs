@@ -0,0 +1,26 @@
+/**
+ * preprocess_parity.py의 Node 쪽 실행기
+ *
+ * 표준 입력: { cases: [{ name, body }], repeat }
+ * 표준 출력: [{ name, proposal, ms: [...] }]  (ms: 반복마다 buildProposalJson 소요 시간)
+ * 각 경우를 한 번 먼저 실행해 JIT를 데운 뒤 측정한다.
+ */
+import { performance } from "node:perf_hooks";
+import { buildProposalJson } from "../../../lib/hwpx-preprocess.mjs";
+
+const chunks = [];
+for await (const chunk of process.stdin) chunks.push(chunk);
+const { cases, repeat } = JSON.parse(Buffer.concat(chunks).toString("utf-8"));
+
+const results = cases.map(({ name, body }) => {
+    const proposal = buildProposalJson(body);
+    const ms = [];
+    for (let i = 0; i < repeat; i++) {
+        const start = performance.now();
+        buildProposalJson(body);
+        ms.push(performance.now() - start);
+    }
+    return { name, proposal, ms };
+});
+
+process.stdout.write(JSON.stringify(results));
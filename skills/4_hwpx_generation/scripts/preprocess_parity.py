@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+HTML 전처리 Node/Python 구현 비교 (출력 차이 + 처리 속도)
+
+같은 요청 본문을 두 구현에 넣어 proposal JSON(content, metadata.total_chars)을 비교하고
+각 구현의 전처리 시간을 같은 조건(프로세스 안에서, 미리 한 번 실행한 뒤)으로 측정한다.
+- Node: lib/hwpx-preprocess.mjs buildProposalJson (app/api/hwpx/generate/route.ts가 사용)
+- Python: api/index.py preprocess_sections (/api/generate-hwpx가 사용)
+
+요청 모음: 알려진 까다로운 입력을 모은 기본 사례 + --corpus JSONL(load_test.py --record 형식)
++ --mb 크기의 대용량 합성 요청 (처리량 비교용).
+차이가 하나라도 있으면 종료 코드 1.
+
+사용법:
+  python preprocess_parity.py [--corpus reqs.jsonl] [--mb 1 4] [--repeat 5] [--show 5]
+                              [--json report.json] [--node node]
+"""
+
+import argparse
+import json
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+NODE_RUNNER = Path(__file__).resolve().with_suffix(".mjs")
+sys.path.insert(0, str(PROJECT_ROOT / "api"))
+
+from index import preprocess_sections  # noqa: E402
+
+TABLE_HTML = ('<table><thead><tr><th>구분</th><th>내용</th></tr></thead><tbody>'
+              '<tr><td>기간</td><td><span class="text-red-600">6개월</span></td></tr>'
+              '<tr><td>인력</td><td>PM <strong>1명</strong>&nbsp;외</td></tr></tbody></table>')
+
+# (사례 이름, 섹션 목록) - 두 구현이 갈라지기 쉬운 입력 위주
+CASES = (
+    ("plain", [{"title": "1. 사업 개요", "text": "<p>사업 배경</p><p>본 사업은 공공데이터를 활용한다.</p>"}]),
+    ("color_spans", [{"title": "색상", "text": '<p><span class="text-green-600">공공데이터 기반</span> 분석과 '
+                                            '<span class="text-red-500 font-bold">총괄 PM</span> 배치, '
+                                            '<span class="text-blue-600">참고</span> 사항</p>'}]),
+    ("span_inline_markup", [{"title": "", "text": '<p><span class="text-red-600"><strong>100억</strong> 규모</span>'
+                                                  ' 사업</p>'}]),
+    ("span_multiline", [{"title": "줄바꿈", "text": '<p><span class="text-green-600">첫 줄\n둘째 줄</span></p>'}]),
+    ("html_table", [{"title": "2. 추진 일정", "text": "<p>일정은 다음과 같다.</p>" + TABLE_HTML + "<p>끝.</p>"}]),
+    ("html_table_no_thead", [{"title": "표", "text": "<table><tr><th>A</th><th>B</th></tr>"
+                                                   "<tr><td>1</td><td>2</td></tr></table>"}]),
+    ("table_first", [{"title": "표 먼저", "text": TABLE_HTML}]),
+    ("table_uppercase", [{"title": "대문자", "text": "<P>앞</P><TABLE><TR><TH>A</TH></TR><TR><TD>1</TD></TR></TABLE>"}]),
+    ("markdown_table", [{"title": "마크다운 표", "text": "<p>| 항목 | 값 |</p><p>|---|---|</p><p>| 예산 | 10억 |</p>"
+                                                      "<p>| 기간 | 6개월 | 초과 |</p>"}]),
+    ("markdown_table_short_row", [{"title": "", "text": "| a | b | c |\n|---|---|---|\n| 1 |\n"}]),
+    ("markdown_syntax", [{"title": "마크다운", "text": "## 추진 전략\n**핵심** 목표는 *정확성*이다.\n- 항목 하나\n"
+                                                  "1. 첫째 단계\n2) 둘째 단계"}]),
+    ("entities", [{"title": "엔티티", "text": "<p>A &amp; B &lt;비교&gt; &quot;인용&quot;&nbsp;&nbsp;끝</p>"}]),
+    ("leading_symbols", [{"title": "기호", "text": "<p>□ 세부 계획</p><p>※ 참고 사항</p><p>▶ 실행</p><p>--- 구분</p>"}]),
+    ("tag_words", [{"title": "", "text": "<p>div 구조와 span 요소, text-red-600 클래스 설명</p>"}]),
+    ("long_paragraphs", [{"title": "길이", "text": "<p>" + "가나다라 " * 40 + "</p><p>" + "마바사아 " * 120 + "</p>"}]),
+    ("heading_levels", [{"title": "", "text": "<p>추진배경</p><p>왜 필요한가?</p><p>목표:</p><p>3. 기대효과</p>"}]),
+    ("emoji", [{"title": "이모지", "text": "<p>성과 📈 지표 ✅ 달성</p>"}]),
+    ("empty_and_missing", [{"title": "빈 섹션", "text": ""}, {"text": "<p>제목 없음</p>"}, {"title": "공백", "text": "   "}]),
+    ("stray_angle_brackets", [{"title": "", "text": "<p>a < b 이고 c > d 이다</p><p>x <y</p>"}]),
+)
+
+
+def synthesize(target_mb):
+    """본문/색상 span/HTML 표가 섞인 target_mb 크기의 요청 본문 (처리량 측정용)"""
+    paragraph = ('<p>□ 세부 추진 계획 <span class="text-green-600">공공데이터 기반</span> '
+                 '분석 결과를 반영하고 <span class="text-red-500">총괄 PM</span>이 관리한다.</p>\n')
+    row = "<tr>" + "".join(f"<td>항목 {c} 값 {c * 37}</td>" for c in range(5)) + "</tr>"
+    table = ("<table><thead><tr>" + "".join(f"<th>열{c}</th>" for c in range(5)) + "</tr></thead><tbody>"
+             + row * 20 + "</tbody></table>")
+    text = paragraph * 30 + table + paragraph * 10
+    sections = []
+    size = 0
+    while size < target_mb * 1024 * 1024:
+        sections.append({"title": f"{len(sections) + 1}. 세부 추진 계획", "text": text})
+        size += len(text.encode("utf-8"))
+    return sections
+
+
+def build_cases(args):
+    cases = [{"name": name, "body": {"title": "전처리 비교", "sections": sections}} for name, sections in CASES]
+    if args.corpus:
+        for number, line in enumerate(Path(args.corpus).read_text(encoding="utf-8").splitlines(), 1):
+            if line.strip():
+                body = json.loads(line)
+                if isinstance(body, dict) and "sections" in body:
+                    cases.append({"name": f"corpus:{number}", "body": body})
+    for mb in args.mb:
+        cases.append({"name": f"synthetic:{mb:g}MB", "body": {"title": "대용량", "sections": synthesize(mb)}})
+    return cases
+
+
+def run_python(cases, repeat):
+    results = []
+    for case in cases:
+        sections = case["body"]["sections"]
+        document = preprocess_sections(sections, {})
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            preprocess_sections(sections, {})
+            times.append((time.perf_counter() - start) * 1000)
+        results.append({"name": case["name"], "proposal": document.to_dict(), "ms": times})
+    return results
+
+
+def run_node(cases, repeat, node):
+    payload = json.dumps({"cases": cases, "repeat": repeat}, ensure_ascii=False).encode("utf-8")
+    completed = subprocess.run([node, str(NODE_RUNNER)], input=payload, capture_output=True, cwd=PROJECT_ROOT)
+    if completed.returncode != 0:
+        raise SystemExit(f"[Parity] Node 실행 실패:\n{completed.stderr.decode('utf-8', 'replace')}")
+    return json.loads(completed.stdout)
+
+
+def comparable(proposal):
+    """비교 대상: content 전체 + metadata.total_chars (나머지 metadata는 각 라우트가 따로 채움)"""
+    return {"total_chars": proposal["metadata"].get("total_chars"), "content": proposal["content"]}
+
+
+def diff(node, python, path="$"):
+    """두 JSON 값의 차이 [(경로, node 값, python 값), ...] (목록 길이가 다르면 길이부터 보고)"""
+    if isinstance(node, dict) and isinstance(python, dict):
+        found = []
+        for key in list(node) + [key for key in python if key not in node]:
+            if key not in node or key not in python:
+                found.append((f"{path}.{key}", node.get(key, "<없음>"), python.get(key, "<없음>")))
+            else:
+                found.extend(diff(node[key], python[key], f"{path}.{key}"))
+        return found
+    if isinstance(node, list) and isinstance(python, list):
+        found = [] if len(node) == len(python) else [(f"{path}.length", len(node), len(python))]
+        for index, (left, right) in enumerate(zip(node, python)):
+            found.extend(diff(left, right, f"{path}[{index}]"))
+        return found
+    return [] if node == python else [(path, node, python)]
+
+
+def _short(value, limit=70):
+    text = json.dumps(value, ensure_ascii=False)
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML 전처리 Node/Python 구현 비교")
+    parser.add_argument("--corpus", help="요청 본문 JSONL (load_test.py --record 형식)")
+    parser.add_argument("--mb", type=float, nargs="*", default=[1], help="처리량 측정용 합성 요청 크기(MB)")
+    parser.add_argument("--repeat", type=int, default=5, help="측정 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--show", type=int, default=5, help="사례마다 출력할 차이 수")
+    parser.add_argument("--json", help="전체 결과를 JSON으로 저장")
+    parser.add_argument("--node", default=shutil.which("node") or "node", help="Node 실행 파일")
+    args = parser.parse_args()
+
+    cases = build_cases(args)
+    node_results = run_node(cases, args.repeat, args.node)
+    python_results = run_python(cases, args.repeat)
+
+    report = []
+    for case, node, python in zip(cases, node_results, python_results):
+        differences = diff(comparable(node["proposal"]), comparable(python["proposal"]))
+        input_mb = sum(len((s.get("text") or "").encode("utf-8")) for s in case["body"]["sections"]) / 1024 / 1024
+        report.append({
+            "name": case["name"],
+            "input_mb": input_mb,
+            "node_ms": statistics.median(node["ms"]) if node["ms"] else None,
+            "python_ms": statistics.median(python["ms"]) if python["ms"] else None,
+            "differences": [{"path": p, "node": n, "python": py} for p, n, py in differences],
+        })
+
+    print(f"{'case':<26} {'diffs':>5} {'node ms':>9} {'python ms':>10} {'py/node':>8}")
+    for row in report:
+        ratio = row["python_ms"] / row["node_ms"] if row["node_ms"] and row["python_ms"] else 0
+        print(f"{row['name']:<26} {len(row['differences']):>5} {row['node_ms'] or 0:9.3f} "
+              f"{row['python_ms'] or 0:10.3f} {ratio:7.2f}x")
+        for difference in row["differences"][:args.show]:
+            print(f"    {difference['path']}\n      node:   {_short(difference['node'])}\n"
+                  f"      python: {_short(difference['python'])}")
+        if len(row["differences"]) > args.show:
+            print(f"    ... 외 {len(row['differences']) - args.show}개")
+
+    big = [row for row in report if row["input_mb"] >= 0.5 and row["node_ms"] and row["python_ms"]]
+    for row in big:
+        print(f"[Parity] {row['name']}: node {row['input_mb'] / row['node_ms'] * 1000:.1f} MB/s, "
+              f"python {row['input_mb'] / row['python_ms'] * 1000:.1f} MB/s")
+    mismatched = [row["name"] for row in report if row["differences"]]
+    print(f"[Parity] {len(report) - len(mismatched)}/{len(report)} cases identical"
+          + (f" (차이: {', '.join(mismatched)})" if mismatched else ""))
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    sys.exit(1 if mismatched else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+hwpx 스킬 eval 자동 실행기 (정확성 + 생성 시간/크기)
+
+evals/evals.json의 각 eval을 fixture로 재현하고 assertion을 XML 검사로 확인한다.
+- fixture: evals/fixtures/<id>.json
+  - 생성: {"preset", "proposal": 기대 proposal JSON} → HWPXGenerator(preset 풀) + 네임스페이스 후처리
+    ("max_sections"/"workers"를 주면 section 병렬 생성 경로로 - 풀 generator의 워커 전달 확인)
+  - 편집: {"mode": "edit", "input": 기존 .hwpx, "title"/"date": {"from", "to"}} → replace_text_in_runs
+    ("{today}"는 실행일의 공문서 날짜 형식 "2026. 3. 10.")
+- assertion 문장을 키워드로 검사 함수에 대응 (CHECKS). 대응이 없는 assertion은 manual,
+  저장소에 없는 자산(템플릿 등)이 필요한 검사/eval은 skip으로 보고하고 실패로 치지 않는다.
+- eval마다 생성 시간(--repeat 회 중앙값)·후처리 시간·출력 크기를 기록하고 프로세스 풀에서 병렬 실행
+- --baseline으로 이전 --json 보고서를 주면 시간 증가(--tolerance 초과)와 새로 실패한 assertion을 함께 보고
+  (worker끼리 CPU를 나눠 쓰므로 시간은 같은 -j로 측정한 보고서끼리 비교)
+
+실패한 assertion·오류·회귀가 있으면 종료 코드 1.
+
+사용법:
+  python run_evals.py [--ids 1 2] [-j 4] [--repeat 3] [--out evals_out/]
+                      [--json report.json] [--baseline previous.json] [--tolerance 0.2]
+"""
+
+import argparse
+import datetime
+import html
+import io
+import json
+import os
+import re
+import statistics
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+SKILL_DIR = Path(__file__).resolve().parents[1]
+PROJECT_ROOT = SKILL_DIR.parents[1]
+EVALS_PATH = SKILL_DIR / "evals" / "evals.json"
+FIXTURES_DIR = SKILL_DIR / "evals" / "fixtures"
+sys.path.insert(0, str(SKILL_DIR / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fix_namespaces import fix_hwpx_namespaces_bytes  # noqa: E402
+from hwpx_archive import find_top_level_paragraphs  # noqa: E402
+from hwpx_templates import PRESETS, canonical_preset, resolve_template  # noqa: E402
+
+SECTION_RE = re.compile(r"^Contents/section(\d+)\.xml$")
+TEXT_RE = re.compile(rb"<(?:\w+:)?t(?:\s[^>]*)?>(.*?)</(?:\w+:)?t>", re.DOTALL)
+TAG_RE = re.compile(rb"<[^>]+>")
+
+# 항목 기호 체계 (수준 순서) - 기호 뒤에 공백, 숫자 기호는 날짜("2026. 3.")와 구분
+OFFICIAL_SYMBOLS = (r"\d+\.\s+(?!\d)", r"[가-하]\.\s", r"\d+\)\s", r"[가-하]\)\s")
+REPORT_SYMBOLS = ("□", "○", "―")  # ※(참고)는 어느 수준 뒤에나 올 수 있어 수준에서 제외
+
+_pool = None  # worker 프로세스별 PresetPool
+
+
+class Skip(Exception):
+    """저장소에 없는 자산이 필요해 확인할 수 없음 (실패로 치지 않음)"""
+
+
+class Output:
+    """eval 하나의 생성 결과 + 검사에 쓰는 XML/텍스트 (필요할 때 한 번만 추출)"""
+
+    def __init__(self, name, hwpx_bytes, fixture, source_bytes=None):
+        self.name = name
+        self.hwpx = hwpx_bytes
+        self.fixture = fixture
+        self.source = source_bytes
+        self._entries = None
+        self._paragraphs = None
+
+    @property
+    def entries(self):
+        if self._entries is None:
+            with zipfile.ZipFile(io.BytesIO(self.hwpx)) as zf:
+                self._entries = {info.filename: zf.read(info) for info in zf.infolist()}
+        return self._entries
+
+    @property
+    def paragraphs(self):
+        """section 순서대로 최상위 paragraph 텍스트 목록 (표는 셀 텍스트를 이어 붙인 한 항목)"""
+        if self._paragraphs is None:
+            self._paragraphs = section_paragraphs(self.entries)
+        return self._paragraphs
+
+    @property
+    def text(self):
+        return "\n".join(self.paragraphs)
+
+
+def _sections(entries):
+    names = [(int(m.group(1)), name) for name in entries for m in [SECTION_RE.match(name)] if m]
+    return [name for _, name in sorted(names)]
+
+
+def section_paragraphs(entries):
+    paragraphs = []
+    for name in _sections(entries):
+        xml = entries[name]
+        for start, end in find_top_level_paragraphs(xml):
+            texts = [TAG_RE.sub(b"", t).decode("utf-8") for t in TEXT_RE.findall(xml, start, end)]
+            paragraphs.append(html.unescape("".join(texts)))
+    return paragraphs
+
+
+def official_date(day):
+    """공문서 날짜 형식 (월·일 앞 0 없음): 2026. 3. 10."""
+    return f"{day.year}. {day.month}. {day.day}."
+
+
+# --- 검사 함수: (Output, assertion 정규식 match) → 통과 여부, 설명 (확인 불가면 Skip) ---
+
+def check_extension(out, match):
+    ok = out.name.endswith(".hwpx") and out.entries.get("mimetype", b"").startswith(b"application/hwp+zip")
+    return ok, f"{out.name}, mimetype {out.entries.get('mimetype', b'').decode(errors='replace')!r}"
+
+
+def check_namespaces(out, match):
+    bad = [name for name, data in out.entries.items()
+           if name.startswith("Contents/") and name.endswith(".xml") and re.search(rb"xmlns:ns\d+=", data[:4096])]
+    roots = {name: re.search(rb"<(?![?!])([\w:]+)", out.entries[name]).group(1).decode()
+             for name in ["Contents/header.xml"] + _sections(out.entries)[:1]}
+    ok = not bad and roots.get("Contents/header.xml") == "hh:head"
+    return ok, f"ns 별칭 남은 엔트리 {bad or '없음'}, 루트 {roots}"
+
+
+def _check_hierarchy(paragraphs, patterns):
+    """기호 수준이 한 단계씩만 깊어지는지 (□ 없이 ○, ○ 없이 ― 등) - (위반 목록, 사용된 수준 집합)"""
+    depth = 0
+    used = set()
+    violations = []
+    for text in paragraphs:
+        stripped = text.lstrip()
+        level = next((i + 1 for i, pattern in enumerate(patterns) if re.match(pattern, stripped)), None)
+        if level is None:
+            continue
+        used.add(level)
+        if level > depth + 1:
+            violations.append(stripped[:30])
+        depth = level
+    return violations, used
+
+
+def check_official_hierarchy(out, match):
+    violations, used = _check_hierarchy(out.paragraphs, OFFICIAL_SYMBOLS)
+    ok = not violations and {1, 2} <= used
+    return ok, f"사용 수준 {sorted(used)}, 건너뛴 수준 {violations or '없음'}"
+
+
+def check_report_hierarchy(out, match):
+    violations, used = _check_hierarchy(out.paragraphs, [re.escape(symbol) for symbol in REPORT_SYMBOLS])
+    ok = not violations and {1, 2, 3} <= used
+    return ok, f"사용 수준 {sorted(used)}, 건너뛴 수준 {violations or '없음'}"
+
+
+def check_date(out, match):
+    expected = match.group(1)
+    padded = re.findall(r"\d{4}\.\s*0\d\.|\d{4}\.\s*\d{1,2}\.\s*0\d\.|\d{4}-\d{2}-\d{2}", out.text)
+    ok = expected in out.text and not padded
+    return ok, f"'{expected}' {'있음' if expected in out.text else '없음'}, 0 채운 날짜 {padded or '없음'}"
+
+
+def check_time(out, match):
+    expected = match.group(1)
+    twelve_hour = re.findall(r"(?:오전|오후)\s*\d{1,2}시|\d{1,2}\s*[AP]M", out.text)
+    ok = expected in out.text and not twelve_hour
+    return ok, f"'{expected}' {'있음' if expected in out.text else '없음'}, 12시각제 {twelve_hour or '없음'}"
+
+
+def check_end_mark(out, match):
+    last = next((text.strip() for text in reversed(out.paragraphs) if text.strip()), "")
+    return last.endswith("끝."), f"마지막 문단 …{last[-20:]!r}"
+
+
+def check_template(out, match):
+    path = match.group(1)
+    name = PRESETS[canonical_preset(out.fixture.get("preset"))]["template"]
+    if not (PROJECT_ROOT / path).exists():
+        raise Skip(f"{path} 없음 (템플릿 '{name}'이 fallback으로 생성됨)")
+    resolved, resolved_path = resolve_template(name, PROJECT_ROOT)
+    ok = resolved_path is not None and resolved_path.resolve() == (PROJECT_ROOT / path).resolve()
+    return ok, f"preset 템플릿 '{name}' → {resolved_path or resolved}"
+
+
+def check_cover_title(out, match):
+    title = out.fixture["proposal"]["metadata"]["title"]
+    head = [text.strip() for text in out.paragraphs[:3]]
+    return title in head, f"앞 문단 {head}"
+
+
+def check_section_titles(out, match):
+    titles = [item["title"] for item in out.fixture["proposal"]["content"]
+              if item.get("type") == "section" and item.get("title")]
+    stripped = {text.strip() for text in out.paragraphs}
+    missing = [title for title in titles if title not in stripped]
+    return not missing, f"섹션 제목 {len(titles) - len(missing)}/{len(titles)}" + (f", 없음 {missing}" if missing else "")
+
+
+def check_edited_in_place(out, match):
+    """편집: section 밖의 엔트리는 원본과 같고 엔트리 목록도 같아야 함 (새로 생성한 문서가 아님)"""
+    with zipfile.ZipFile(io.BytesIO(out.source)) as zf:
+        source = {info.filename: zf.read(info) for info in zf.infolist()}
+    changed = [name for name in source if not SECTION_RE.match(name) and source[name] != out.entries.get(name)]
+    ok = list(source) == list(out.entries) and not changed
+    return ok, f"엔트리 {len(out.entries)}개, section 밖 변경 {changed or '없음'}"
+
+
+def check_structure_preserved(out, match):
+    """run 단위 치환: section별 최상위 paragraph 수와 run 수가 원본과 같음"""
+    with zipfile.ZipFile(io.BytesIO(out.source)) as zf:
+        source = {info.filename: zf.read(info) for info in zf.infolist() if SECTION_RE.match(info.filename)}
+    diffs = []
+    for name, xml in source.items():
+        before = (len(find_top_level_paragraphs(xml)), xml.count(b":run "))
+        after = (len(find_top_level_paragraphs(out.entries[name])), out.entries[name].count(b":run "))
+        if before != after:
+            diffs.append(f"{name} {before}→{after}")
+    return not diffs, f"paragraph/run 수 차이 {diffs or '없음'}"
+
+
+def _check_replaced(out, key):
+    spec = out.fixture[key]
+    new = spec["to"].replace("{today}", official_date(datetime.date.today()))
+    ok = new in out.text and spec["from"] not in out.text
+    return ok, f"'{spec['from']}' → '{new}' ({'적용' if ok else '미적용'})"
+
+
+def check_title_replaced(out, match):
+    return _check_replaced(out, "title")
+
+
+def check_date_replaced(out, match):
+    ok, detail = _check_replaced(out, "date")
+    new = out.fixture["date"]["to"].replace("{today}", official_date(datetime.date.today()))
+    return ok and re.fullmatch(r"\d{4}\. [1-9]\d?\. [1-9]\d?\.", new) is not None, detail
+
+
+# (assertion 정규식, 검사 함수) - 위에서부터 처음 맞는 것 하나
+CHECKS = (
+    (r"\.hwpx 확장자", check_extension),
+    (r"fix_hwpx_namespaces", check_namespaces),
+    (r"항목 기호 체계\(1\. 가\.", check_official_hierarchy),
+    (r"□○―", check_report_hierarchy),
+    (r"날짜가 '([^']+)' 형식", check_date),
+    (r"24시각제 '([^']+)'", check_time),
+    (r"'끝\.' 표시", check_end_mark),
+    (r"(\S+\.hwpx) 템플릿을 사용", check_template),
+    (r"표지에 .*제목", check_cover_title),
+    (r"섹션 구분 바의 제목", check_section_titles),
+    (r"기존 파일을 열어서 수정", check_edited_in_place),
+    (r"replace_text_in_runs|ZIP-level 치환", check_structure_preserved),
+    (r"표지 제목이 변경", check_title_replaced),
+    (r"작성일이 .*날짜 형식", check_date_replaced),
+)
+
+
+def run_assertion(out, assertion):
+    for pattern, check in CHECKS:
+        match = re.search(pattern, assertion)
+        if match:
+            try:
+                ok, detail = check(out, match)
+            except Skip as e:
+                return {"assertion": assertion, "status": "skip", "detail": str(e)}
+            return {"assertion": assertion, "status": "pass" if ok else "fail", "detail": detail}
+    return {"assertion": assertion, "status": "manual", "detail": "자동 검사 없음"}
+
+
+def _timed(fn, repeat):
+    """fn을 repeat회 실행한 (마지막 결과, 중앙값 ms)"""
+    times = []
+    result = None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return result, round(statistics.median(times), 2)
+
+
+def materialize(fixture, repeat):
+    """fixture → (HWPX bytes, 원본 bytes 또는 None, 생성 ms, 후처리 ms)"""
+    global _pool
+    if fixture.get("mode") == "edit":
+        from hwpx_text_replace import replace_text_in_runs
+        source_path = PROJECT_ROOT / fixture["input"]
+        if not source_path.exists():
+            raise Skip(f"{fixture['input']} 없음")
+        source = source_path.read_bytes()
+        today = official_date(datetime.date.today())
+        replacements = {fixture[key]["from"]: fixture[key]["to"].replace("{today}", today)
+                        for key in ("title", "date") if key in fixture}
+        (hwpx, count), generate_ms = _timed(lambda: replace_text_in_runs(source, replacements), repeat)
+        hwpx = hwpx or source  # 치환 대상이 없으면 None - 원본 그대로 검사 (치환 assertion이 실패)
+    else:
+        if _pool is None:
+            from hwpx_presets import PresetPool
+            _pool = PresetPool(PROJECT_ROOT)
+        source = None
+        preset = fixture.get("preset")
+        options = {key: fixture[key] for key in ("max_sections", "workers") if key in fixture}
+        hwpx, generate_ms = _timed(
+            lambda: _pool.generator(preset, embed_fonts=False).generate_bytes(fixture["proposal"], **options),
+            repeat)
+    hwpx, fix_ms = _timed(lambda: fix_hwpx_namespaces_bytes(hwpx), repeat)
+    return hwpx, source, generate_ms, fix_ms
+
+
+def run_eval(job):
+    """worker: eval 하나 실행 → 결과 dict (print 출력은 버리고 소요 시간만 기록)"""
+    eval_case, out_dir, repeat = job
+    eval_id = eval_case["id"]
+    result = {"id": eval_id, "prompt": eval_case["prompt"][:60], "status": "ok", "assertions": []}
+    fixture_path = FIXTURES_DIR / f"{eval_id}.json"
+    if not fixture_path.exists():
+        return {**result, "status": "skip", "error": f"fixture 없음: {fixture_path.name}"}
+    fixture = json.loads(fixture_path.read_text(encoding="utf-8"))
+
+    start = time.perf_counter()
+    try:
+        with open(os.devnull, "w") as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                hwpx, source, generate_ms, fix_ms = materialize(fixture, repeat)
+            finally:
+                sys.stdout = stdout
+    except Skip as e:
+        return {**result, "status": "skip", "error": str(e)}
+    except Exception as e:
+        return {**result, "status": "error", "error": f"{type(e).__name__}: {e}"}
+
+    name = f"eval-{eval_id}.hwpx"
+    if out_dir:
+        Path(out_dir).mkdir(parents=True, exist_ok=True)
+        (Path(out_dir) / name).write_bytes(hwpx)
+    output = Output(name, hwpx, fixture, source)
+    check_start = time.perf_counter()
+    result["assertions"] = [run_assertion(output, assertion) for assertion in eval_case.get("assertions", [])]
+    result.update({
+        "generate_ms": generate_ms,
+        "fix_ms": fix_ms,
+        "check_ms": round((time.perf_counter() - check_start) * 1000, 2),
+        "total_ms": round((time.perf_counter() - start) * 1000, 2),
+        "bytes": len(hwpx),
+        "paragraphs": len(output.paragraphs),
+    })
+    return result
+
+
+def compare(results, baseline, tolerance):
+    """이전 보고서 대비 회귀 [(eval id, 설명), ...] - 생성 시간 증가와 pass → fail"""
+    previous = {row["id"]: row for row in baseline.get("results", [])}
+    regressions = []
+    for row in results:
+        before = previous.get(row["id"])
+        if before is None or row["status"] != "ok" or before.get("status") != "ok":
+            continue
+        old_ms, new_ms = before.get("generate_ms"), row.get("generate_ms")
+        # 1ms 미만 차이는 측정 오차로 본다
+        if old_ms and new_ms and new_ms > old_ms * (1 + tolerance) and new_ms - old_ms > 1:
+            regressions.append((row["id"], f"생성 시간 {old_ms:.1f}ms → {new_ms:.1f}ms (+{new_ms / old_ms - 1:.0%})"))
+        if before.get("bytes") and row["bytes"] > before["bytes"] * (1 + tolerance):
+            regressions.append((row["id"], f"출력 크기 {before['bytes']:,} → {row['bytes']:,} bytes"))
+        passed = {a["assertion"] for a in before.get("assertions", []) if a["status"] == "pass"}
+        for assertion in row["assertions"]:
+            if assertion["status"] == "fail" and assertion["assertion"] in passed:
+                regressions.append((row["id"], f"새 실패: {assertion['assertion']}"))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="hwpx 스킬 eval 자동 실행 (정확성 + 생성 시간/크기)")
+    parser.add_argument("--evals", default=str(EVALS_PATH), help="evals.json 경로")
+    parser.add_argument("--ids", type=int, nargs="*", help="실행할 eval id (기본: 전체)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="병렬 worker 수 (기본: CPU 수)")
+    parser.add_argument("--repeat", type=int, default=3, help="생성 시간 측정 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--out", help="생성한 .hwpx를 저장할 디렉토리")
+    parser.add_argument("--json", help="전체 결과를 JSON으로 저장 (다음 실행의 --baseline)")
+    parser.add_argument("--baseline", help="비교할 이전 --json 보고서")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="시간/크기 회귀로 볼 증가 비율")
+    args = parser.parse_args()
+
+    evals = json.loads(Path(args.evals).read_text(encoding="utf-8"))["evals"]
+    if args.ids:
+        evals = [eval_case for eval_case in evals if eval_case["id"] in args.ids]
+    if not evals:
+        sys.exit("[Evals] 실행할 eval이 없습니다")
+
+    jobs = [(eval_case, args.out, args.repeat) for eval_case in evals]
+    workers = max(1, min(args.jobs or os.cpu_count() or 1, len(jobs)))
+    started = time.perf_counter()
+    if workers == 1:
+        results = [run_eval(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run_eval, jobs))
+    elapsed = time.perf_counter() - started
+
+    marks = {"pass": "✓", "fail": "✗", "skip": "-", "manual": "?"}
+    print(f"{'eval':<5} {'status':<7} {'pass':>6} {'gen ms':>9} {'fix ms':>8} {'KB':>8}  prompt")
+    for row in results:
+        counts = [a["status"] for a in row["assertions"]]
+        checked = [status for status in counts if status in ("pass", "fail")]
+        status = row["status"] if row["status"] != "ok" else ("fail" if "fail" in counts else "pass")
+        print(f"{row['id']:<5} {status:<7} {counts.count('pass'):>3}/{len(checked):<2} "
+              f"{row.get('generate_ms', 0):9.1f} {row.get('fix_ms', 0):8.1f} {row.get('bytes', 0) / 1024:8.1f}  "
+              f"{row['prompt']}")
+        if row.get("error"):
+            print(f"      {row['error']}")
+        for assertion in row["assertions"]:
+            if assertion["status"] != "pass":
+                print(f"      {marks[assertion['status']]} {assertion['assertion']}\n          {assertion['detail']}")
+
+    regressions = compare(results, json.loads(Path(args.baseline).read_text(encoding="utf-8")), args.tolerance) \
+        if args.baseline else []
+    for eval_id, detail in regressions:
+        print(f"[Evals] 회귀 eval {eval_id}: {detail}")
+
+    statuses = [a["status"] for row in results for a in row["assertions"]]
+    errors = [row["id"] for row in results if row["status"] == "error"]
+    print(f"[Evals] {len(results)} evals in {elapsed:.2f}s ({workers} worker(s)): "
+          + ", ".join(f"{statuses.count(s)} {s}" for s in ("pass", "fail", "skip", "manual"))
+          + (f", 오류 eval {errors}" if errors else "")
+          + (f", 회귀 {len(regressions)}" if args.baseline else ""))
+
+    if args.json:
+        report = {"created": datetime.datetime.now().isoformat(timespec="seconds"), "repeat": args.repeat,
+                  "results": results, "regressions": [{"id": i, "detail": d} for i, d in regressions]}
+        Path(args.json).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    sys.exit(1 if "fail" in statuses or errors or regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+HWPX(ZIP) 아카이브 저수준 유틸리티
+
+- 변경되지 않은 엔트리를 압축 해제/재압축 없이 그대로 복사
+- section XML을 파싱하지 않고 최상위 <hp:p> 경계를 바이트 단위로 탐색
+"""
+import copy
+import io
+import re
+import struct
+import zipfile
+
+from lxml import etree
+
+PARAGRAPH_NS = b"http://www.hancom.co.kr/hwpml/2011/paragraph"
+
+# 로컬 파일 헤더: zipfile.structFileHeader 의 파일명/extra 길이 필드 위치
+_FH_NAME_LENGTH = 10
+_FH_EXTRA_LENGTH = 11
+_COPY_CHUNK = 1024 * 1024
+
+
+def copy_entry_raw(zin, info, zout):
+    """압축된 엔트리 데이터를 해제하지 않고 zout에 그대로 기록"""
+    zin.fp.seek(info.header_offset)
+    fheader = struct.unpack(zipfile.structFileHeader, zin.fp.read(zipfile.sizeFileHeader))
+    zin.fp.seek(fheader[_FH_NAME_LENGTH] + fheader[_FH_EXTRA_LENGTH], io.SEEK_CUR)
+
+    zinfo = copy.copy(info)
+    # data descriptor 없이 CRC/크기를 로컬 헤더에 직접 기록
+    zinfo.flag_bits &= ~0x08
+
+    zout.fp.seek(zout.start_dir)
+    zinfo.header_offset = zout.fp.tell()
+    zout.fp.write(zinfo.FileHeader())
+
+    remaining = info.compress_size
+    while remaining > 0:
+        chunk = zin.fp.read(min(_COPY_CHUNK, remaining))
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated entry: {info.filename}")
+        zout.fp.write(chunk)
+        remaining -= len(chunk)
+
+    zout.start_dir = zout.fp.tell()
+    zout.filelist.append(zinfo)
+    zout.NameToInfo[zinfo.filename] = zinfo
+    zout._didModify = True
+
+
+def rewrite_archive(source, replacements, output_path=None, compresslevel=None):
+    """
+    replacements에 있는 엔트리만 새 데이터로 기록하고 나머지는 raw 복사
+
+    Args:
+        source: 원본 .hwpx 경로 또는 bytes
+        replacements: {엔트리 이름: 새 bytes}. 원본에 없는 이름은 끝에 추가된다.
+        output_path: 저장 경로 (None이면 bytes 반환)
+        compresslevel: 새로 기록하는 엔트리의 deflate 레벨
+
+    Returns:
+        output_path 또는 결과 bytes
+    """
+    src = io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+    out = io.BytesIO() if output_path is None else output_path
+
+    with zipfile.ZipFile(src, "r") as zin:
+        with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as zout:
+            written = set()
+            for info in zin.infolist():
+                if info.filename in replacements:
+                    zinfo = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+                    zinfo.compress_type = info.compress_type
+                    zinfo.external_attr = info.external_attr
+                    zout.writestr(zinfo, replacements[info.filename], compresslevel=compresslevel)
+                    written.add(info.filename)
+                else:
+                    copy_entry_raw(zin, info, zout)
+
+            for name, data in replacements.items():
+                if name not in written:
+                    zout.writestr(name, data, compresslevel=compresslevel)
+
+    return out.getvalue() if output_path is None else output_path
+
+
+def paragraph_prefix(xml_bytes):
+    """루트 요소에 선언된 paragraph 네임스페이스 prefix (hp, ns1 등)"""
+    match = re.search(rb'xmlns:([\w.-]+)="' + re.escape(PARAGRAPH_NS) + rb'"', xml_bytes)
+    return match.group(1) if match else b"hp"
+
+
+def find_top_level_paragraphs(xml_bytes, prefix=None):
+    """
+    section XML에서 루트 바로 아래 <hp:p> 요소들의 (start, end) 바이트 범위 목록 반환
+
+    표 셀 안의 중첩 paragraph는 깊이를 추적하여 건너뛴다.
+    """
+    if prefix is None:
+        prefix = paragraph_prefix(xml_bytes)
+
+    tag_re = re.compile(rb"<(/?)" + re.escape(prefix) + rb":p(?=[\s/>])")
+    ranges = []
+    depth = 0
+    start = 0
+
+    for match in tag_re.finditer(xml_bytes):
+        if match.group(1):
+            depth -= 1
+            if depth == 0:
+                ranges.append((start, xml_bytes.index(b">", match.end()) + 1))
+            continue
+
+        tag_end = xml_bytes.index(b">", match.end())
+        if xml_bytes[tag_end - 1:tag_end] == b"/":
+            # <hp:p ... /> 빈 paragraph
+            if depth == 0:
+                ranges.append((match.start(), tag_end + 1))
+            continue
+
+        if depth == 0:
+            start = match.start()
+        depth += 1
+
+    return ranges
+
+
+def iter_top_level_paragraphs(stream, prefix=None, chunk_size=64 * 1024):
+    """
+    section XML 스트림을 읽으며 ("raw", bytes) / ("p", bytes) 조각을 순서대로 생성
+
+    "p"는 루트 바로 아래 <hp:p> 요소 하나 전체, "raw"는 그 사이의 바이트(루트 태그 등)이다.
+    메모리에는 현재 읽는 chunk와 paragraph 하나만 유지한다.
+    """
+    buffer = b""
+    tag_re = None
+    depth = 0
+    emitted = 0        # buffer에서 이미 내보낸 위치
+    scan_pos = 0       # 다음 태그 탐색 시작 위치
+    para_start = None
+    eof = False
+
+    while not eof:
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
+
+        if tag_re is None:
+            if prefix is None:
+                # 루트 시작 태그를 다 읽어야 네임스페이스 선언을 알 수 있다
+                root_end = re.search(rb"<(?![?!])[^>]*>", buffer)
+                if root_end is None and not eof:
+                    continue
+                prefix = paragraph_prefix(buffer[:root_end.end()] if root_end else buffer)
+            tag_re = re.compile(rb"<(/?)" + re.escape(prefix) + rb":p(?=[\s/>])")
+
+        # 마지막 '<' 이후는 태그가 잘렸을 수 있으므로 다음 chunk와 합쳐서 탐색
+        safe_end = len(buffer) if eof else buffer.rfind(b"<")
+        for match in tag_re.finditer(buffer, scan_pos, max(safe_end, scan_pos)):
+            tag_end = buffer.index(b">", match.end()) + 1
+            if match.group(1):
+                depth -= 1
+                if depth == 0:
+                    yield "p", buffer[para_start:tag_end]
+                    emitted = tag_end
+            elif buffer[tag_end - 2:tag_end - 1] == b"/":
+                if depth == 0:
+                    if match.start() > emitted:
+                        yield "raw", buffer[emitted:match.start()]
+                    yield "p", buffer[match.start():tag_end]
+                    emitted = tag_end
+            else:
+                if depth == 0:
+                    if match.start() > emitted:
+                        yield "raw", buffer[emitted:match.start()]
+                    para_start = match.start()
+                depth += 1
+            scan_pos = tag_end
+
+        scan_pos = max(scan_pos, safe_end)
+        if depth == 0:
+            # 내보낼 수 있는 raw 구간은 태그가 잘리지 않은 곳까지
+            keep_from = min(safe_end, scan_pos) if not eof else len(buffer)
+            if keep_from > emitted:
+                yield "raw", buffer[emitted:keep_from]
+                emitted = keep_from
+            cut = emitted
+        else:
+            cut = para_start
+
+        buffer = buffer[cut:]
+        scan_pos -= cut
+        emitted -= cut
+        if para_start is not None:
+            para_start -= cut
+
+
+def serialize_children(container, elements):
+    """container(루트)의 네임스페이스 선언을 이용해 elements를 prefix 정리된 바이트로 직렬화"""
+    for child in list(container):
+        container.remove(child)
+    container.extend(elements)
+    if not elements:
+        return b""
+    raw = etree.tostring(container, encoding="utf-8")
+    # xml 선언 없이 직렬화되므로 첫 '>'가 루트 시작 태그의 끝
+    return raw[raw.index(b">") + 1:raw.rindex(b"</")]
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+HWPX 출력 최적화 (compact 모드)
+
+- header.xml에서 어디서도 참조하지 않는 charPr/paraPr/borderFill 제거 후 ID를 연속 번호로 다시 매김
+  (참조: section XML의 *IDRef 속성 + header 안의 style/charPr/paraPr 등)
+- section XML bytes의 charPrIDRef/paraPrIDRef/borderFillIDRef를 새 ID로 치환
+
+HWPXGenerator가 추가한 항목(레벨 paraPr, 표/셀 borderFill)은 참조가 없어도 남긴다.
+hwpx_patch가 header 끝의 이 항목들로 ID 상태를 복원하기 때문이다.
+"""
+import re
+
+from lxml import etree
+
+HH = "http://www.hancom.co.kr/hwpml/2011/head"
+
+# (목록 요소, 항목 요소, 참조 속성) - borderFill은 charPr/paraPr 정리 후 참조를 다시 센다
+STYLE_TABLES = (
+    ("charProperties", "charPr", "charPrIDRef"),
+    ("paraProperties", "paraPr", "paraPrIDRef"),
+    ("borderFills", "borderFill", "borderFillIDRef"),
+)
+
+# 태그 안의 속성만 (본문 텍스트의 '>'는 &gt;로 이스케이프되므로 다음 '>' 전에 '<'가 없으면 태그 내부)
+# styleIDRef는 prune_header가 다루지 않지만 문서 병합(hwpx_merge)에서 함께 치환한다
+_REF_PATTERN = re.compile(rb'\s(charPrIDRef|paraPrIDRef|borderFillIDRef|styleIDRef)="(\d+)"(?=[^<>]*>)')
+
+
+def _section_refs(section_xmls):
+    """section XML bytes들에서 {참조 속성: {ID, ...}}"""
+    refs = {attr: set() for _, _, attr in STYLE_TABLES}
+    for xml in section_xmls:
+        for attr, value in _REF_PATTERN.findall(xml):
+            ids = refs.get(attr.decode())
+            if ids is not None:
+                ids.add(value.decode())
+    return refs
+
+
+def prune_header(header_root, section_xmls, keep=None):
+    """
+    참조되지 않는 charPr/paraPr/borderFill 제거 + ID 재번호 (header_root를 직접 수정)
+
+    Args:
+        header_root: header.xml 루트
+        section_xmls: 최종 section XML bytes 목록
+        keep: {참조 속성: {남길 ID, ...}} - 참조가 없어도 남길 항목
+
+    Returns:
+        ({참조 속성: {이전 ID: 새 ID}} (바뀐 것만), {항목 요소: 제거 수})
+    """
+    keep = keep or {}
+    section_refs = _section_refs(section_xmls)
+    remap = {}
+    removed = {}
+
+    for list_tag, item_tag, attr in STYLE_TABLES:
+        container = header_root.find(f".//{{{HH}}}{list_tag}")
+        if container is None:
+            continue
+        items = container.findall(f"{{{HH}}}{item_tag}")
+
+        # header 안의 다른 요소(style, 남은 charPr/paraPr 등)가 참조하는 ID
+        used = set(section_refs[attr]) | set(keep.get(attr, ()))
+        for elem in header_root.iter(etree.Element):
+            value = elem.get(attr)
+            if value is not None:
+                used.add(value)
+
+        kept = [item for item in items if item.get("id") in used]
+        removed[item_tag] = len(items) - len(kept)
+        if not removed[item_tag]:
+            continue
+
+        for item in items:
+            if item.get("id") not in used:
+                container.remove(item)
+
+        # 첫 ID(charPr/paraPr 0, borderFill 1)부터 연속 번호
+        start = min(int(item.get("id")) for item in items)
+        mapping = {}
+        for new_id, item in enumerate(kept, start):
+            old_id = item.get("id")
+            if old_id != str(new_id):
+                mapping[old_id] = str(new_id)
+                item.set("id", str(new_id))
+        container.set("itemCnt", str(len(kept)))
+
+        if mapping:
+            for elem in header_root.iter(etree.Element):
+                value = elem.get(attr)
+                if value in mapping:
+                    elem.set(attr, mapping[value])
+            remap[attr] = mapping
+
+    return remap, removed
+
+
+def remap_section_refs(section_xml, remap):
+    """section XML bytes의 *IDRef 속성을 prune_header(또는 hwpx_merge)가 돌려준 새 ID로 치환"""
+    if not remap:
+        return section_xml
+    encoded = {attr.encode(): {old.encode(): new.encode() for old, new in mapping.items()}
+               for attr, mapping in remap.items()}
+
+    def replace(match):
+        attr, value = match.group(1), match.group(2)
+        new_value = encoded.get(attr, {}).get(value)
+        if new_value is None:
+            return match.group(0)
+        return match.group(0).replace(b'"' + value + b'"', b'"' + new_value + b'"', 1)
+
+    return _REF_PATTERN.sub(replace, section_xml)
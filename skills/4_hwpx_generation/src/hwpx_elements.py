@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+HWPX 요소 팩토리 (프로토타입 복제)
+
+paragraph / run / 표 / 표 셀 / charPr 모양마다 프로토타입 요소를 프로세스당 한 번 만들어 두고,
+요청마다 copy.deepcopy(lxml C 구현)로 복제한 뒤 달라지는 속성만 설정한다.
+요소당 수십 번의 etree.SubElement + .set 호출이 복제 1회 + 속성 몇 개로 줄어든다.
+속성 순서는 기존 생성 코드와 같으므로 직렬화 결과도 같다.
+
+lxml 요소는 pickle되지 않으므로 HWPXGenerator 속성이 아니라 모듈 전역(ELEMENTS)으로 둔다
+(병렬 section 워커 프로세스는 import 시 각자 프로토타입을 만든다).
+"""
+import copy
+
+from lxml import etree
+
+HP = "http://www.hancom.co.kr/hwpml/2011/paragraph"
+HH = "http://www.hancom.co.kr/hwpml/2011/head"
+
+# fontRef/ratio/spacing/relSz/offset 공통 언어 속성 순서
+LANGS = ("hangul", "latin", "hanja", "japanese", "other", "symbol", "user")
+
+TABLE_WIDTH = 41950  # A4 본문 너비 (HWPUNIT)
+
+
+def _sub(parent, tag, **attrs):
+    """속성 순서를 유지하며 하위 요소 추가"""
+    elem = etree.SubElement(parent, tag)
+    for key, value in attrs.items():
+        elem.set(key, value)
+    return elem
+
+
+def _paragraph(parent=None, id="0"):
+    attrs = dict(id=id, paraPrIDRef="0", styleIDRef="0", pageBreak="0", columnBreak="0", merged="0")
+    if parent is None:
+        return etree.Element(f"{{{HP}}}p", **attrs)
+    return _sub(parent, f"{{{HP}}}p", **attrs)
+
+
+def _lineseg(parent, vertpos, vertsize, baseline, spacing, horzsize):
+    linesegarray = etree.SubElement(parent, f"{{{HP}}}linesegarray")
+    return _sub(linesegarray, f"{{{HP}}}lineseg", textpos="0", vertpos=vertpos, vertsize=vertsize,
+                textheight=vertsize, baseline=baseline, spacing=spacing, horzpos="0", horzsize=horzsize,
+                flags="393216")
+
+
+class ElementFactory:
+    """모양별 프로토타입을 한 번 만들고 복제해서 요소 생성"""
+
+    def __init__(self):
+        # <hp:run charPrIDRef=""><hp:t/></hp:run>
+        self._run = etree.Element(f"{{{HP}}}run", charPrIDRef="0")
+        etree.SubElement(self._run, f"{{{HP}}}t")
+
+        # 본문 paragraph: 빈 초기 run(항상 필요) 포함
+        self._paragraph = _paragraph()
+        empty_run = _sub(self._paragraph, f"{{{HP}}}run", charPrIDRef="0")
+        etree.SubElement(empty_run, f"{{{HP}}}t").text = ""
+
+        # 본문 paragraph + 텍스트 run 하나 (가장 흔한 모양)
+        self._text_paragraph = copy.deepcopy(self._paragraph)
+        self._text_paragraph.append(copy.deepcopy(self._run))
+
+        # 표 paragraph: <hp:run><hp:t/></hp:run> + linesegarray (tbl은 run 맨 앞에 삽입)
+        self._table_paragraph = _paragraph()
+        table_run = _sub(self._table_paragraph, f"{{{HP}}}run", charPrIDRef="0")
+        etree.SubElement(table_run, f"{{{HP}}}t")
+        _lineseg(self._table_paragraph, "0", "1000", "850", "600", "0")
+
+        self._table = self._build_table()
+        self._cell = self._build_cell()
+        self._cells = {}  # (borderFillIDRef, col_count) -> 열 너비가 채워진 셀 프로토타입
+        self._charprs = {}  # font_id -> fontRef가 채워진 charPr 프로토타입
+        self._charpr = self._build_charpr()
+
+    def _build_table(self):
+        table = etree.Element(
+            f"{{{HP}}}tbl", id="0", zOrder="0", numberingType="TABLE", textWrap="TOP_AND_BOTTOM",
+            textFlow="BOTH_SIDES", lock="0", dropcapstyle="None", pageBreak="CELL", repeatHeader="1",
+            rowCnt="0", colCnt="0", cellSpacing="0", borderFillIDRef="0", noAdjust="0",
+        )
+        _sub(table, f"{{{HP}}}sz", width=str(TABLE_WIDTH), widthRelTo="ABSOLUTE", height="0",
+             heightRelTo="ABSOLUTE", protect="0")
+        _sub(table, f"{{{HP}}}pos", treatAsChar="1", affectLSpacing="0", flowWithText="1", allowOverlap="0",
+             holdAnchorAndSO="0", vertRelTo="PARA", horzRelTo="COLUMN", vertAlign="TOP", horzAlign="LEFT",
+             vertOffset="0", horzOffset="0")
+        _sub(table, f"{{{HP}}}outMargin", left="283", right="283", top="283", bottom="283")
+        _sub(table, f"{{{HP}}}inMargin", left="510", right="510", top="141", bottom="141")
+        return table
+
+    def _build_cell(self):
+        cell = etree.Element(f"{{{HP}}}tc", name="", header="0", hasMargin="0", protect="0", editable="0",
+                             dirty="0", borderFillIDRef="0")
+        sub_list = _sub(cell, f"{{{HP}}}subList", id="", textDirection="HORIZONTAL", lineWrap="BREAK",
+                        vertAlign="CENTER", linkListIDRef="0", linkListNextIDRef="0", textWidth="0",
+                        textHeight="0", hasTextRef="0", hasNumRef="0")
+        # 셀 paragraph는 빈 초기 run 없음 (네이티브 호환) - run은 linesegarray 앞에 삽입
+        para = _paragraph(sub_list)
+        _lineseg(para, "0", "1200", "1020", "720", "0")
+        _sub(cell, f"{{{HP}}}cellAddr", colAddr="0", rowAddr="0")
+        _sub(cell, f"{{{HP}}}cellSpan", colSpan="1", rowSpan="1")
+        _sub(cell, f"{{{HP}}}cellSz", width="0", height="1765")
+        _sub(cell, f"{{{HP}}}cellMargin", left="510", right="510", top="141", bottom="141")
+        return cell
+
+    def _build_charpr(self):
+        charpr = etree.Element(f"{{{HH}}}charPr", id="0", height="0", textColor="#000000", shadeColor="none",
+                               useFontSpace="0", useKerning="0", symMark="NONE", borderFillIDRef="2")
+        for tag, value in (("fontRef", "0"), ("ratio", "100"), ("spacing", "0"), ("relSz", "100"), ("offset", "0")):
+            _sub(charpr, f"{{{HH}}}{tag}", **dict.fromkeys(LANGS, value))
+        # 한글 오피스 기본 CharPr에는 underline, strikeout, outline, shadow가 없음 (호환성을 위해 생략)
+        return charpr
+
+    def run(self, charpr_id, text):
+        """<hp:run charPrIDRef=...><hp:t>text</hp:t></hp:run>"""
+        run = copy.deepcopy(self._run)
+        run.set("charPrIDRef", str(charpr_id))
+        run[0].text = text
+        return run
+
+    def paragraph(self, para_id, para_pr_id="0", runs=()):
+        """빈 초기 run + runs [(charPr ID, 텍스트), ...] 로 구성된 본문 paragraph"""
+        if len(runs) == 1:
+            para = copy.deepcopy(self._text_paragraph)
+            charpr_id, text = runs[0]
+            para[1].set("charPrIDRef", str(charpr_id))
+            para[1][0].text = text
+        else:
+            para = copy.deepcopy(self._paragraph)
+            for charpr_id, text in runs:
+                para.append(self.run(charpr_id, text))
+        para.set("id", para_id)
+        if para_pr_id != "0":
+            para.set("paraPrIDRef", para_pr_id)
+        return para
+
+    def table_paragraph(self, table, vertpos):
+        """표 하나를 담는 paragraph (tbl 뒤 빈 <hp:t/>, horzsize=0 lineseg)"""
+        para = copy.deepcopy(self._table_paragraph)
+        para[0].insert(0, table)
+        para[1][0].set("vertpos", str(vertpos))
+        return para
+
+    def table(self, table_id, row_count, col_count, borderfill_id):
+        """행/셀이 없는 <hp:tbl> (sz/pos/outMargin/inMargin 포함)"""
+        table = copy.deepcopy(self._table)
+        table.set("id", table_id)
+        table.set("rowCnt", str(row_count))
+        table.set("colCnt", str(col_count))
+        table.set("borderFillIDRef", borderfill_id)
+        table[0].set("height", str(1500 * row_count))  # 행 높이 * 행 수
+        return table
+
+    def cell(self, borderfill_id, col_count, col_idx, row_idx, runs=()):
+        """표 셀 (열 수에 맞게 너비 균등 분배, runs는 [(charPr ID, 텍스트), ...])"""
+        key = (borderfill_id, col_count)
+        proto = self._cells.get(key)
+        if proto is None:
+            proto = copy.deepcopy(self._cell)
+            cell_width = TABLE_WIDTH // max(col_count, 1)
+            proto.set("borderFillIDRef", borderfill_id)
+            proto[0][0][0][0].set("horzsize", str(cell_width - 1020))  # 좌우 cellMargin(510*2) 제외
+            proto[3].set("width", str(cell_width))
+            self._cells[key] = proto
+
+        cell = copy.deepcopy(proto)
+        para = cell[0][0]
+        for index, (charpr_id, text) in enumerate(runs):
+            para.insert(index, self.run(charpr_id, text))
+        cell_addr = cell[1]
+        cell_addr.set("colAddr", str(col_idx))
+        cell_addr.set("rowAddr", str(row_idx))
+        return cell
+
+    def charpr(self, charpr_id, height, text_color, shade_color="none", font_id="0"):
+        """<hh:charPr> (글자 크기/색/음영/폰트만 다르고 나머지는 기본값)"""
+        proto = self._charprs.get(font_id)
+        if proto is None:
+            proto = copy.deepcopy(self._charpr)
+            for lang in LANGS:
+                proto[0].set(lang, font_id)
+            self._charprs[font_id] = proto
+
+        charpr = copy.deepcopy(proto)
+        charpr.set("id", str(charpr_id))
+        charpr.set("height", str(height))
+        charpr.set("textColor", text_color)
+        charpr.set("shadeColor", shade_color)
+        return charpr
+
+
+ELEMENTS = ElementFactory()
@@ -1,16 +1,57 @@
 # -*- coding: utf-8 -*-
+import copy
+import io
 import os
 import json
+import time
 import zipfile
-import tempfile
-import shutil
 import base64
 from pathlib import Path
 from lxml import etree
 
+from hwpx_compact import prune_header, remap_section_refs
+from hwpx_elements import ELEMENTS
+from hwpx_templates import DEFAULT_TEMPLATE, load_template
+from proposal_ir import as_document, content_item_from_dict
+
+
+# 폰트 파일 bytes (경로 -> bytes) - 프로세스 안의 생성기들이 공유, prefork 서버는 fork 전에 preload_fonts로 채움
+_font_data = {}
+
+
+def _font_bytes(font_path):
+    data = _font_data.get(font_path)
+    if data is None:
+        data = _font_data[font_path] = Path(font_path).read_bytes()
+    return data
+
+
+def preload_fonts(base_dir):
+    """assets/fonts/*.ttf를 모두 읽어 두기, 읽은 (파일 수, 바이트 수) 반환"""
+    for font_path in sorted((Path(base_dir) / "assets" / "fonts").glob("*.ttf")):
+        _font_bytes(font_path)
+    return len(_font_data), sum(len(data) for data in _font_data.values())
+
+
+class CompiledTemplate:
+    """
+    스타일을 적용해 준비한 템플릿 (header에 표 borderFill/레벨 paraPr 추가, section 본문 비움)
+
+    여러 요청/스레드가 읽기 전용으로 공유한다. 문서 생성 시에는 header/section을 복사해서 사용한다.
+    """
+
+    def __init__(self, infos, entries, header_root, section_root, state):
+        self.infos = infos
+        self.entries = entries
+        self.header_root = header_root
+        self.section_root = section_root
+        self.state = state
+
 
 class HWPXGenerator:
-    def __init__(self, base_dir: str = None, styles_path: str = "proposal-styles.json", embed_fonts: bool = True):
+    def __init__(self, base_dir: str = None, styles_path: str = "proposal-styles.json", embed_fonts: bool = True,
+                 styles_data: dict = None, template=None, template_name: str = DEFAULT_TEMPLATE,
+                 compiled: CompiledTemplate = None):
         self.embed_fonts = embed_fonts
         if base_dir:
             self.base_dir = Path(base_dir)
@@ -19,11 +60,12 @@ class HWPXGenerator:
             self.base_dir = Path.cwd()
             self.styles_path = self.base_dir / styles_path
 
-        # 스타일 설정 로드
-        with open(self.styles_path, "r", encoding="utf-8") as f:
-            styles_data = json.load(f)
-            self.style_config = styles_data["styles"]
-            self.colors = styles_data.get("colors", {})
+        # 스타일 설정 로드 (styles_data가 주어지면 파일을 읽지 않음 - 스냅샷/캐시 재사용)
+        if styles_data is None:
+            with open(self.styles_path, "r", encoding="utf-8") as f:
+                styles_data = json.load(f)
+        self.style_config = styles_data["styles"]
+        self.colors = styles_data.get("colors", {})
 
         # 네임스페이스 정의
         self.ns = {
@@ -48,13 +90,47 @@ class HWPXGenerator:
         self.font_embed_cache = {}  # font_name -> binary_id 매핑
         self.next_binary_id = 0
 
-    def _create_template_hwpx(self, output_path):
-        """sample-from-hangul.hwpx가 없을 때 python-hwpx 내장 템플릿으로 생성"""
-        from hwpx.templates import blank_document_bytes
-        data = blank_document_bytes()
-        with open(output_path, 'wb') as f:
-            f.write(data)
-        print(f"[Template] Created HWPX template from python-hwpx: {output_path}")
+        # 템플릿 (엔트리 정보 목록, {이름: 압축 해제된 bytes}) - 첫 문서 생성 시 레지스트리에서 로드
+        self.template_name = template_name
+        self._template = template
+        self._compiled = compiled
+
+    def __getstate__(self):
+        """
+        병렬 section 생성 시 워커로 보내는 상태 - 템플릿은 제외
+
+        CompiledTemplate은 lxml 요소를 담고 있어 pickle되지 않고, 워커는 스타일 테이블(charPr 캐시 등)만 쓴다.
+        워커에서 템플릿이 필요하면 _load_template/compile_template이 다시 준비한다.
+        """
+        state = self.__dict__.copy()
+        state["_compiled"] = None
+        state["_template"] = None
+        return state
+
+    def _load_template(self):
+        """
+        템플릿 엔트리 로드 (base_dir 기준, hwpx_templates 레지스트리가 프로세스 전체에서 캐시)
+
+        Returns:
+            ([(이름, date_time, compress_type), ...], {이름: bytes})
+        """
+        if self._template is None:
+            self._template = load_template(self.template_name, self.base_dir)
+        return self._template
+
+    def _reset_document_state(self):
+        """문서별 상태 초기화 (charPr 캐시, ID 카운터, 폰트 임베딩)"""
+        self.next_charpr_id = 10
+        self.charpr_cache = {}
+        self.level_parapr_ids = {1: "0", 2: "0", 3: "0", 4: "0"}
+        self.table_borderfill_id = "4"
+        self.cell_borderfill_id = "5"
+        self.font_embed_cache = {}
+        self.next_binary_id = 0
+
+    def _serialize_xml(self, root, pretty_print=True):
+        """XML 루트를 선언 포함 UTF-8 bytes로 직렬화"""
+        return etree.tostring(root.getroottree(), encoding='UTF-8', xml_declaration=True, pretty_print=pretty_print)
 
     def _get_color_hex(self, color_name):
         """색상 이름을 HEX 코드로 변환"""
@@ -79,9 +155,9 @@ class HWPXGenerator:
         }
         return mapping.get(font_name, font_name)
 
-    def _embed_font_file(self, temp_dir, font_name):
+    def _embed_font_file(self, entries, font_name):
         """
-        폰트 파일을 HWPX의 BinData 폴더에 임베딩하고 binary ID 반환
+        폰트 파일을 HWPX의 BinData 엔트리로 임베딩하고 binary ID 반환
         """
         # 폰트 임베딩 비활성화 시 건너뛰기
         if not self.embed_fonts:
@@ -100,17 +176,12 @@ class HWPXGenerator:
             print(f"[Debug] Looking for: {font_name} -> {file_name}")
             return None
 
-        # BinData 디렉토리 생성
-        bindata_dir = Path(temp_dir) / "BinData"
-        bindata_dir.mkdir(exist_ok=True)
-
         # Binary ID 생성
         binary_id = f"BIN{self.next_binary_id:04d}"
         self.next_binary_id += 1
 
-        # 폰트 파일 복사
-        dest_path = bindata_dir / f"{binary_id}.ttf"
-        shutil.copy2(font_path, dest_path)
+        # 폰트 파일을 BinData 엔트리로 추가
+        entries[f"BinData/{binary_id}.ttf"] = _font_bytes(font_path)
 
         # 캐시에 저장
         self.font_embed_cache[font_name] = binary_id
@@ -118,18 +189,17 @@ class HWPXGenerator:
         print(f"[Font Embedded] {font_name} -> {binary_id}")
         return binary_id
 
-    def _update_manifest(self, temp_dir):
+    def _update_manifest(self, entries):
         """
         manifest.xml에 임베딩된 폰트 파일들을 추가
         """
-        manifest_path = Path(temp_dir) / "META-INF" / "manifest.xml"
-        if not manifest_path.exists():
+        manifest_name = "META-INF/manifest.xml"
+        if manifest_name not in entries:
             print("[Warning] manifest.xml not found")
             return
 
         # manifest.xml 읽기
-        tree = etree.parse(str(manifest_path))
-        root = tree.getroot()
+        root = etree.fromstring(entries[manifest_name])
 
         # 네임스페이스 확인
         ns = {'manifest': 'urn:oasis:names:tc:opendocument:xmlns:manifest:1.0'}
@@ -145,7 +215,7 @@ class HWPXGenerator:
             file_entry.set(f"{{{ns['manifest']}}}media-type", "application/x-font-truetype")
 
         # manifest.xml 저장
-        tree.write(str(manifest_path), encoding='utf-8', xml_declaration=True, pretty_print=True)
+        entries[manifest_name] = self._serialize_xml(root)
         print(f"[Manifest Updated] Added {len(self.font_embed_cache)} font entries")
 
     def _get_font_weight(self, font_name):
@@ -211,75 +281,10 @@ class HWPXGenerator:
         return new_font_id
 
     def _create_charpr_element(self, height, text_color, shade_color="none", font_id="0"):
-        """새로운 CharPr XML 요소 생성 - 색상과 크기만 사용"""
-        charpr_attrs = {
-            "id": str(self.next_charpr_id),
-            "height": str(height),
-            "textColor": text_color,
-            "shadeColor": shade_color,
-            "useFontSpace": "0",
-            "useKerning": "0",
-            "symMark": "NONE",
-            "borderFillIDRef": "2"
-        }
+        """새로운 CharPr XML 요소 생성 - 색상과 크기만 사용 (폰트별 프로토타입 복제)"""
+        return ELEMENTS.charpr(self.next_charpr_id, height, text_color, shade_color, font_id)
 
-        charpr = etree.Element(
-            f"{{{self.ns['hh']}}}charPr",
-            **charpr_attrs
-        )
-
-        # 하위 요소들 추가
-        fontref = etree.SubElement(charpr, f"{{{self.ns['hh']}}}fontRef")
-        fontref.set("hangul", font_id)
-        fontref.set("latin", font_id)
-        fontref.set("hanja", font_id)
-        fontref.set("japanese", font_id)
-        fontref.set("other", font_id)
-        fontref.set("symbol", font_id)
-        fontref.set("user", font_id)
-
-        ratio = etree.SubElement(charpr, f"{{{self.ns['hh']}}}ratio")
-        ratio.set("hangul", "100")
-        ratio.set("latin", "100")
-        ratio.set("hanja", "100")
-        ratio.set("japanese", "100")
-        ratio.set("other", "100")
-        ratio.set("symbol", "100")
-        ratio.set("user", "100")
-
-        spacing = etree.SubElement(charpr, f"{{{self.ns['hh']}}}spacing")
-        spacing.set("hangul", "0")
-        spacing.set("latin", "0")
-        spacing.set("hanja", "0")
-        spacing.set("japanese", "0")
-        spacing.set("other", "0")
-        spacing.set("symbol", "0")
-        spacing.set("user", "0")
-
-        relSz = etree.SubElement(charpr, f"{{{self.ns['hh']}}}relSz")
-        relSz.set("hangul", "100")
-        relSz.set("latin", "100")
-        relSz.set("hanja", "100")
-        relSz.set("japanese", "100")
-        relSz.set("other", "100")
-        relSz.set("symbol", "100")
-        relSz.set("user", "100")
-
-        offset = etree.SubElement(charpr, f"{{{self.ns['hh']}}}offset")
-        offset.set("hangul", "0")
-        offset.set("latin", "0")
-        offset.set("hanja", "0")
-        offset.set("japanese", "0")
-        offset.set("other", "0")
-        offset.set("symbol", "0")
-        offset.set("user", "0")
-
-        # 한글 오피스 기본 CharPr에는 underline, strikeout, outline, shadow가 없음
-        # 호환성을 위해 제거
-
-        return charpr
-
-    def _get_or_create_font_id(self, header_root, temp_dir, font_name):
+    def _get_or_create_font_id(self, header_root, entries, font_name):
         """폰트 이름으로 Font ID를 찾거나 생성"""
         # HANGUL fontface 찾기
         ns_hh = self.ns['hh']
@@ -298,7 +303,7 @@ class HWPXGenerator:
                 return font_id
 
         # 폰트를 찾지 못하면 실제 등록 시도
-        binary_id = self._embed_font_file(temp_dir, font_name)
+        binary_id = self._embed_font_file(entries, font_name)
         font_id = self._register_font_in_header(header_root, font_name, binary_id)
 
         if font_id:
@@ -308,7 +313,7 @@ class HWPXGenerator:
         print(f"[Font] Failed to register '{font_name}', using default Font ID 0")
         return "0"
 
-    def _get_or_create_charpr_id(self, header_root, temp_dir, height, text_color, shade_color="none", font_name="Hamchorong Batang"):
+    def _get_or_create_charpr_id(self, header_root, entries, height, text_color, shade_color="none", font_name="Hamchorong Batang"):
         """CharPr을 찾거나 생성하여 ID 반환 - 크기, 색상, 폰트 사용"""
         # 폰트를 포함한 캐시 키
         cache_key = (height, text_color, shade_color, font_name)
@@ -316,8 +321,12 @@ class HWPXGenerator:
         if cache_key in self.charpr_cache:
             return self.charpr_cache[cache_key]
 
+        if header_root is None:
+            # 병렬 section 워커는 미리 컴파일된 스타일 테이블만 사용
+            raise KeyError(f"CharPr not in precompiled style table: {cache_key}")
+
         # 폰트 ID 찾기 (기본값 0)
-        font_id = self._get_or_create_font_id(header_root, temp_dir, font_name)
+        font_id = self._get_or_create_font_id(header_root, entries, font_name)
 
         # 2. charProperties 섹션 찾기
         charprops = header_root.find(f".//{{{self.ns['hh']}}}charProperties")
@@ -343,41 +352,38 @@ class HWPXGenerator:
         print(f"[CharPr Created] ID: {charpr_id}, Height: {height}, TextColor: {text_color}, ShadeColor: {shade_color}, Font: {font_name} (ID: {font_id})")
         return charpr_id
 
-    def generate(self, data, output_path):
+    def generate(self, data, output_path, max_sections=1, workers=None, compact=False, compress_level=None):
         """
-        JSON 데이터를 기반으로 HWPX 문서 생성 (XML 직접 조작)
-        """
-        # 1. 샘플 HWPX 파일을 템플릿으로 사용
-        print("[Step 1] Using sample HWPX as template...")
-        sample_path = Path("sample-from-hangul.hwpx")
-
-        with tempfile.NamedTemporaryFile(suffix='.hwpx', delete=False) as tmp:
-            temp_path = tmp.name
+        JSON 데이터를 기반으로 HWPX 문서 생성하여 output_path에 저장
 
-        if sample_path.exists():
-            # 샘플 파일 복사
-            shutil.copy(sample_path, temp_path)
-        else:
-            # 샘플 없으면 프로그래밍으로 생성
-            print("[Warning] Sample file not found, creating template programmatically...")
-            self._create_template_hwpx(temp_path)
+        max_sections > 1이면 content를 장(제목 있는 section 항목) 경계에서 최대 max_sections개의
+        Contents/sectionN.xml로 나누고, 각 section 본문을 workers개 프로세스에서 병렬 생성한다.
+        compact/compress_level은 generate_bytes 참고.
+        """
+        hwpx_bytes = self.generate_bytes(data, max_sections=max_sections, workers=workers,
+                                         compact=compact, compress_level=compress_level)
+        with open(output_path, 'wb') as f:
+            f.write(hwpx_bytes)
 
-        # 2. ZIP으로 열어서 XML 조작
-        print("[Step 2] Extracting HWPX archive...")
-        temp_dir = tempfile.mkdtemp()
+        print(f"[Success] HWPX generated: {output_path}")
+        return output_path
 
-        with zipfile.ZipFile(temp_path, 'r') as zf:
-            zf.extractall(temp_dir)
+    def compile_template(self):
+        """
+        템플릿을 이 generator의 스타일로 준비 (header/section 파싱, borderFill/paraPr 추가, 본문 비우기)
 
-        # 3. header.xml 및 section0.xml 로드
-        header_path = Path(temp_dir) / "Contents" / "header.xml"
-        section_path = Path(temp_dir) / "Contents" / "section0.xml"
+        결과는 읽기 전용으로 여러 generator(compiled=...)가 공유할 수 있다.
+        """
+        self._reset_document_state()
 
-        header_tree = etree.parse(str(header_path))
-        header_root = header_tree.getroot()
+        # 1. 샘플 HWPX 파일을 템플릿으로 사용
+        print("[Step 1] Using sample HWPX as template...")
+        template_infos, template_entries = self._load_template()
 
-        section_tree = etree.parse(str(section_path))
-        section_root = section_tree.getroot()
+        # 2~3. header.xml 및 section0.xml 로드 (캐시된 템플릿 엔트리는 그대로 유지)
+        print("[Step 2] Reading HWPX archive...")
+        header_root = etree.fromstring(template_entries["Contents/header.xml"])
+        section_root = etree.fromstring(template_entries["Contents/section0.xml"])
 
         # 3.5. 표 테두리용 borderFill 추가
         self._ensure_table_borderfill(header_root)
@@ -406,108 +412,308 @@ class HWPXGenerator:
         for child in list(section_root):
             section_root.remove(child)
 
-        # 5. 새 콘텐츠 추가
+        state = {
+            "next_charpr_id": self.next_charpr_id,
+            "level_parapr_ids": dict(self.level_parapr_ids),
+            "table_borderfill_id": self.table_borderfill_id,
+            "cell_borderfill_id": self.cell_borderfill_id,
+        }
+        return CompiledTemplate(template_infos, template_entries, header_root, section_root, state)
+
+    def generate_bytes(self, data, max_sections=1, workers=None, compact=False, compress_level=None):
+        """
+        JSON 데이터를 기반으로 HWPX 문서 bytes 생성 (XML 직접 조작, 임시 파일 없이 메모리에서 처리)
+
+        data는 proposal_ir.Document 또는 같은 구조의 proposal JSON dict.
+        compact=True이면 XML을 들여쓰기 없이 기록하고 header의 미사용 charPr/paraPr/borderFill을
+        제거(ID 재번호)한다 (hwpx_compact). compress_level은 deflate 수준 0~9 (None: zlib 기본값 6).
+        """
+        doc = as_document(data)
+        section_groups = self._split_section_groups(doc.content, max_sections)
+
+        if len(section_groups) <= 1:
+            document = self.begin_document(doc.metadata)
+            for item in doc.content:
+                document.add(item)
+            return document.finish(compact=compact, compress_level=compress_level)
+
+        template_infos, entries, header_root, section_root = self._prepare_document()
+
+        # 5. 장(chapter) 경계로 나눈 section들을 워커 프로세스에서 병렬 생성
         print("[Step 4] Adding new content...")
-        metadata = data.get("metadata", {})
-        title = metadata.get("title", "제목 없음")
+        section_xmls = self._build_sections_parallel(doc, section_groups, header_root, entries, section_root,
+                                                     workers, pretty_print=not compact)
+        self._register_sections(entries, header_root, len(section_xmls))
 
-        # 제목 추가 (선택적 - metadata에서 설정 가능)
-        include_title = metadata.get("include_title", False)  # 기본값: 제목 표시 안 함
+        return self._finish_document(template_infos, entries, header_root, section_xmls=section_xmls,
+                                     compact=compact, compress_level=compress_level)
 
-        if include_title and title:
-            title_style = self.style_config.get("title", {})
-            title_height = self._pt_to_hwp_height(title_style.get("size", 25))
-            title_color = "#000000"
-            title_font = title_style.get("font", "KoPubWorld돋움체 Bold")
-            title_charpr_id = self._get_or_create_charpr_id(header_root, temp_dir, title_height, title_color, "none", title_font)
-
-            title_para = self._create_paragraph(title, title_charpr_id)
-            section_root.append(title_para)
-
-        # 콘텐츠 처리
-        for item in data.get("content", []):
-            item_type = item.get("type", "section")
-
-            if item_type == "section":
-                # 섹션 제목 (선택적 - 기본값: 표시 안 함)
-                include_section_titles = metadata.get("include_section_titles", False)
-                section_title = item.get("title")
-
-                if include_section_titles and section_title:
-                    sec_height = self._pt_to_hwp_height(18)
-                    sec_color = "#000000"
-                    sec_font = "KoPubWorld바탕체 Bold"
-                    sec_charpr_id = self._get_or_create_charpr_id(header_root, temp_dir, sec_height, sec_color, "none", sec_font)
-                    sec_para = self._create_paragraph(section_title, sec_charpr_id)
-                    section_root.append(sec_para)
-
-                # 섹션 항목 처리
-                for sub_item in item.get("items", []):
-                    sub_item_type = sub_item.get("type")
-
-                    # 표인 경우
-                    if sub_item_type == "table":
-                        # 표를 담을 paragraph 생성 (네이티브 한글 구조 동일)
-                        table_para = self._create_table_paragraph(header_root, temp_dir, sub_item)
-                        section_root.append(table_para)
-
-                        print(f"[Added] Table in section: Rows: {len(sub_item.get('rows', []))}, Cols: {len(sub_item.get('headers', []))}")
-
-                    # 일반 텍스트인 경우
-                    else:
-                        level = sub_item.get("level", 1)
-                        text = sub_item.get("text", "")
-
-                        # 레벨별 스타일 가져오기
-                        level_key = f"level{level}"
-                        style = self.style_config.get(level_key, {})
-
-                        font_size_pt = style.get("size", 15)
-                        font_name = style.get("font", "Hamchorong Batang")  # 스타일에서 폰트 가져오기
-                        height = self._pt_to_hwp_height(font_size_pt)
-
-                        # Paragraph 생성 - 마커 기반 색상 적용 (폰트 + 레벨 전달)
-                        para = self._create_paragraph_with_markers(text, height, header_root, temp_dir, font_name, level)
-                        section_root.append(para)
-
-                        print(f"[Added] Level: {level_key}, Size: {font_size_pt}pt, Font: {font_name}, Text: {text[:50]}...")
-
-            elif item_type == "table":
-                # 표 제목 (선택적)
-                table_title = item.get("title")
-                if table_title:
-                    title_height = self._pt_to_hwp_height(18)
-                    title_color = "#000000"
-                    title_charpr_id = self._get_or_create_charpr_id(header_root, temp_dir, title_height, title_color)
-                    title_para = self._create_paragraph(table_title, title_charpr_id)
-                    section_root.append(title_para)
-
-                # 표를 담을 paragraph 생성 (네이티브 한글 구조 동일)
-                table_para = self._create_table_paragraph(header_root, temp_dir, item)
-                section_root.append(table_para)
-
-                print(f"[Added] Table: {item.get('id', 'unknown')}, Rows: {len(item.get('rows', []))}, Cols: {len(item.get('headers', []))}")
+    def begin_document(self, metadata):
+        """
+        content 항목을 하나씩 추가하며 만드는 문서 (스트리밍 입력용, 단일 section)
+
+        문서 상태(charPr 캐시 등)는 generator에 있으므로 generator당 한 번에 한 문서만 만든다.
+            document = gen.begin_document(metadata)
+            document.add(section_item)   # 도착하는 대로 렌더링
+            hwpx_bytes = document.finish()
+        """
+        return IncrementalDocument(self, metadata)
 
+    def _prepare_document(self):
+        """
+        문서별 상태 초기화 + 준비된 템플릿 복사
+
+        Returns:
+            (템플릿 엔트리 정보, {이름: bytes}, header 루트, 본문이 빈 section 루트)
+        """
+        self._reset_document_state()
+
+        # 1~4. 스타일을 적용한 템플릿 준비 (compile_template 결과를 공유하면 파싱 생략)
+        compiled = self._compiled or self.compile_template()
+        entries = dict(compiled.entries)
+        header_root = copy.deepcopy(compiled.header_root)
+        section_root = copy.deepcopy(compiled.section_root)
+        for name, value in compiled.state.items():
+            setattr(self, name, copy.copy(value))
+        return compiled.infos, entries, header_root, section_root
+
+    def _finish_document(self, template_infos, entries, header_root, section_root=None, section_xmls=None,
+                         compact=False, compress_level=None):
+        """header/section 직렬화 (compact면 header 정리) 후 템플릿 엔트리 순서로 다시 압축한 HWPX bytes"""
         # 6. 수정된 XML 저장
         print("[Step 5] Saving modified XML files...")
-        header_tree.write(str(header_path), encoding='utf-8', xml_declaration=True, pretty_print=True)
-        section_tree.write(str(section_path), encoding='utf-8', xml_declaration=True, pretty_print=True)
-
-        # 7. 다시 ZIP으로 압축
+        start = time.perf_counter()
+        if section_xmls is None:
+            section_xmls = [self._serialize_xml(section_root, pretty_print=not compact)]
+        if compact:
+            remap, removed = prune_header(header_root, section_xmls, keep={
+                "paraPrIDRef": set(self.level_parapr_ids.values()),
+                "borderFillIDRef": {self.table_borderfill_id, self.cell_borderfill_id},
+            })
+            section_xmls = [remap_section_refs(section_xml, remap) for section_xml in section_xmls]
+            print(f"[Compact] Pruned unused header entries: {removed}")
+        entries["Contents/header.xml"] = self._serialize_xml(header_root, pretty_print=not compact)
+        for index, section_xml in enumerate(section_xmls):
+            entries[f"Contents/section{index}.xml"] = section_xml
+        xml_size = len(entries["Contents/header.xml"]) + sum(len(section_xml) for section_xml in section_xmls)
+        serialize_ms = (time.perf_counter() - start) * 1000
+
+        # 7. 다시 ZIP으로 압축 (템플릿 엔트리 순서 유지, mimetype 등 압축 방식도 템플릿을 따름)
         print("[Step 6] Re-packing HWPX archive...")
-        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-            for root, dirs, files in os.walk(temp_dir):
-                for file in files:
-                    file_path = Path(root) / file
-                    arcname = file_path.relative_to(temp_dir)
-                    zf.write(file_path, arcname)
+        start = time.perf_counter()
+        out = io.BytesIO()
+        with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED, compresslevel=compress_level) as zf:
+            for name, date_time, compress_type in template_infos:
+                zinfo = zipfile.ZipInfo(name, date_time=date_time)
+                zinfo.compress_type = compress_type
+                zf.writestr(zinfo, entries.pop(name), compresslevel=compress_level)
+            for name, entry_data in entries.items():
+                zf.writestr(name, entry_data)
+
+        hwpx_bytes = out.getvalue()
+        if compact or compress_level is not None:
+            print(f"[Output] XML {xml_size:,} bytes (serialize {serialize_ms:.1f}ms) -> HWPX {len(hwpx_bytes):,} bytes "
+                  f"(deflate level {6 if compress_level is None else compress_level}, "
+                  f"{(time.perf_counter() - start) * 1000:.1f}ms)")
+        return hwpx_bytes
+
+    def _build_title_paragraphs(self, metadata, header_root, entries):
+        """문서 제목 paragraph (metadata.include_title일 때만, 기본값: 제목 표시 안 함)"""
+        title = metadata.get("title", "제목 없음")
+        if not (metadata.get("include_title", False) and title):
+            return []
+
+        title_style = self.style_config.get("title", {})
+        title_height = self._pt_to_hwp_height(title_style.get("size", 25))
+        title_color = "#000000"
+        title_font = title_style.get("font", "KoPubWorld돋움체 Bold")
+        title_charpr_id = self._get_or_create_charpr_id(header_root, entries, title_height, title_color, "none", title_font)
+
+        return [self._create_paragraph(title, title_charpr_id)]
+
+    def _build_content_item(self, item, metadata, header_root, entries):
+        """content 항목(proposal_ir.Section/Table) 하나를 section에 들어갈 최상위 paragraph 목록으로 변환"""
+        paras = []
+        item = content_item_from_dict(item)
+        item_type = item.type
+
+        if item_type == "section":
+            # 섹션 제목 (선택적 - 기본값: 표시 안 함)
+            include_section_titles = metadata.get("include_section_titles", False)
+            section_title = item.title
+
+            if include_section_titles and section_title:
+                sec_height = self._pt_to_hwp_height(18)
+                sec_color = "#000000"
+                sec_font = "KoPubWorld바탕체 Bold"
+                sec_charpr_id = self._get_or_create_charpr_id(header_root, entries, sec_height, sec_color, "none", sec_font)
+                sec_para = self._create_paragraph(section_title, sec_charpr_id)
+                paras.append(sec_para)
+
+            # 섹션 항목 처리
+            for sub_item in item.items:
+                # 표인 경우
+                if sub_item.type == "table":
+                    # 표를 담을 paragraph 생성 (네이티브 한글 구조 동일)
+                    table_para = self._create_table_paragraph(header_root, entries, sub_item)
+                    paras.append(table_para)
+
+                    print(f"[Added] Table in section: Rows: {len(sub_item.rows)}, Cols: {len(sub_item.headers)}")
+
+                # 일반 텍스트인 경우
+                else:
+                    level = sub_item.level
+                    text = sub_item.text
+
+                    # 레벨별 스타일 가져오기
+                    level_key = f"level{level}"
+                    style = self.style_config.get(level_key, {})
+
+                    font_size_pt = style.get("size", 15)
+                    font_name = style.get("font", "Hamchorong Batang")  # 스타일에서 폰트 가져오기
+                    height = self._pt_to_hwp_height(font_size_pt)
+
+                    # Paragraph 생성 - 마커 기반 색상 적용 (폰트 + 레벨 전달)
+                    para = self._create_paragraph_with_markers(text, height, header_root, entries, font_name, level)
+                    paras.append(para)
+
+                    print(f"[Added] Level: {level_key}, Size: {font_size_pt}pt, Font: {font_name}, Text: {text[:50]}...")
+
+        elif item_type == "table":
+            # 표 제목 (선택적)
+            table_title = item.title
+            if table_title:
+                title_height = self._pt_to_hwp_height(18)
+                title_color = "#000000"
+                title_charpr_id = self._get_or_create_charpr_id(header_root, entries, title_height, title_color)
+                title_para = self._create_paragraph(table_title, title_charpr_id)
+                paras.append(title_para)
+
+            # 표를 담을 paragraph 생성 (네이티브 한글 구조 동일)
+            table_para = self._create_table_paragraph(header_root, entries, item)
+            paras.append(table_para)
+
+            print(f"[Added] Table: {item.id or 'unknown'}, Rows: {len(item.rows)}, Cols: {len(item.headers)}")
+
+        return paras
+
+    def _split_section_groups(self, content, max_sections):
+        """content를 장(제목 있는 section 항목) 경계에서 최대 max_sections개 그룹으로 분할"""
+        if max_sections <= 1 or not content:
+            return [content]
+
+        chapters = []
+        for item in content:
+            if not chapters or (item.type == "section" and item.title):
+                chapters.append([])
+            chapters[-1].append(item)
+
+        def weight(item):
+            if item.type == "table":
+                return len(item.rows) + 1
+            return sum(len(sub.rows) + 1 if sub.type == "table" else 1 for sub in item.items) or 1
+
+        chapter_weights = [sum(weight(item) for item in chapter) for chapter in chapters]
+        target = sum(chapter_weights) / min(max_sections, len(chapters))
+
+        groups = [[]]
+        accumulated = 0
+        for chapter, chapter_weight in zip(chapters, chapter_weights):
+            if groups[-1] and accumulated >= target * len(groups) and len(groups) < max_sections:
+                groups.append([])
+            groups[-1].extend(chapter)
+            accumulated += chapter_weight
+        return groups
+
+    def _iter_charpr_keys(self, doc):
+        """문서 순서대로 필요한 CharPr 키 (height, textColor, shadeColor, font) - 순차 생성과 동일한 순서"""
+        metadata = doc.metadata
+
+        if metadata.get("include_title", False) and metadata.get("title", "제목 없음"):
+            title_style = self.style_config.get("title", {})
+            yield (self._pt_to_hwp_height(title_style.get("size", 25)), "#000000", "none",
+                   title_style.get("font", "KoPubWorld돋움체 Bold"))
 
-        # 8. 임시 파일 정리
-        shutil.rmtree(temp_dir)
-        os.unlink(temp_path)
+        table_style = self.style_config.get("table", {})
+        table_height = self._pt_to_hwp_height(table_style.get("size", 11))
+        table_font = table_style.get("font", "KoPubWorld돋움체 Medium")
+
+        def table_keys(table_data):
+            cells = list(table_data.headers)
+            for row in table_data.rows:
+                cells.extend(row)
+            for cell_text in cells:
+                for segment in self._parse_color_markers(cell_text):
+                    yield (table_height, self._segment_text_color(segment['color']), "none", table_font)
+
+        for item in doc.content:
+            if item.type == "section":
+                if metadata.get("include_section_titles", False) and item.title:
+                    yield (self._pt_to_hwp_height(18), "#000000", "none", "KoPubWorld바탕체 Bold")
+
+                for sub_item in item.items:
+                    if sub_item.type == "table":
+                        yield from table_keys(sub_item)
+                        continue
+                    style = self.style_config.get(f"level{sub_item.level}", {})
+                    height = self._pt_to_hwp_height(style.get("size", 15))
+                    font_name = style.get("font", "Hamchorong Batang")
+                    for segment in self._parse_color_markers(sub_item.text):
+                        yield (height, self._segment_text_color(segment['color']), "none", font_name)
+
+            elif item.type == "table":
+                if item.title:
+                    yield (self._pt_to_hwp_height(18), "#000000", "none", "Hamchorong Batang")
+                yield from table_keys(item)
+
+    def _build_sections_parallel(self, doc, section_groups, header_root, entries, section_root, workers=None,
+                                 pretty_print=True):
+        """
+        section 그룹별 XML을 워커 프로세스에서 생성하여 bytes 목록으로 반환
 
-        print(f"[Success] HWPX generated: {output_path}")
-        return output_path
+        CharPr은 먼저 부모 프로세스에서 문서 순서대로 header에 등록(스타일 테이블 사전 컴파일)하므로
+        워커는 header를 건드리지 않고 ID만 조회한다. 결과 ID는 순차 생성과 동일하다.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+
+        for cache_key in self._iter_charpr_keys(doc):
+            self._get_or_create_charpr_id(header_root, entries, *cache_key)
+
+        section_template = etree.tostring(section_root)
+        metadata = doc.metadata
+        jobs = [(self, metadata, items, section_template, index == 0, pretty_print)
+                for index, items in enumerate(section_groups)]
+        print(f"[Sections] Building {len(jobs)} sections in parallel (styles precompiled: {len(self.charpr_cache)})")
+
+        if workers == 1:
+            return [_build_section_worker(job) for job in jobs]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_build_section_worker, jobs))
+
+    def _register_sections(self, entries, header_root, section_count):
+        """content.hpf manifest/spine과 header secCnt에 section1..N 등록"""
+        header_root.set("secCnt", str(section_count))
+
+        hpf_name = "Contents/content.hpf"
+        if hpf_name not in entries:
+            print("[Warning] content.hpf not found")
+            return
+
+        hpf_root = etree.fromstring(entries[hpf_name])
+        opf = hpf_root.nsmap.get("opf", "http://www.idpf.org/2007/opf/")
+
+        manifest_item = hpf_root.find(f".//{{{opf}}}manifest/{{{opf}}}item[@id='section0']")
+        spine_ref = hpf_root.find(f".//{{{opf}}}spine/{{{opf}}}itemref[@idref='section0']")
+        for index in range(section_count - 1, 0, -1):
+            if manifest_item is not None:
+                item = etree.Element(f"{{{opf}}}item", id=f"section{index}",
+                                     href=f"Contents/section{index}.xml", **{"media-type": "application/xml"})
+                manifest_item.addnext(item)
+            if spine_ref is not None:
+                spine_ref.addnext(etree.Element(f"{{{opf}}}itemref", idref=f"section{index}", linear="yes"))
+
+        entries[hpf_name] = self._serialize_xml(hpf_root, pretty_print=False)
+        print(f"[Sections] Registered {section_count} sections in content.hpf")
 
     def _ensure_table_borderfill(self, header_root):
         """표 테두리용 borderFill 보장 (ID 4: 표용, ID 5: 셀용 - 네이티브 한글과 동일)"""
@@ -696,6 +902,58 @@ class HWPXGenerator:
 
             print(f"[ParaPr Added] ID {parapr_id} (Level {level}, LeftMargin: {left_margin_pt}pt, SpaceBefore: {space_before_pt}pt, SpaceAfter: {space_after_pt}pt)")
 
+    def _restore_generated_state(self, header_root):
+        """HWPXGenerator가 만든 header.xml에서 ID 상태 복원 (기존 문서 패치용)
+
+        generate()는 템플릿 뒤에 레벨용 paraPr 4개, 표/셀용 borderFill 2개를 차례로 추가하고
+        charPr은 fontRef/ratio/spacing/relSz/offset만 가진 형태로 생성한다.
+        이 규칙을 역으로 적용해 charpr_cache와 ID 카운터를 다시 채운다.
+        """
+        ns_hh = self.ns['hh']
+
+        paraprops = header_root.find(f".//{{{ns_hh}}}paraProperties")
+        if paraprops is not None:
+            parapr_ids = [pp.get("id") for pp in paraprops.findall(f"{{{ns_hh}}}paraPr")]
+            if len(parapr_ids) >= 4:
+                self.level_parapr_ids = {level: parapr_ids[-5 + level] for level in range(1, 5)}
+
+        borderfills = header_root.find(f".//{{{ns_hh}}}borderFills")
+        if borderfills is not None:
+            bf_ids = [bf.get("id") for bf in borderfills.findall(f"{{{ns_hh}}}borderFill")]
+            if len(bf_ids) >= 2:
+                self.table_borderfill_id, self.cell_borderfill_id = bf_ids[-2], bf_ids[-1]
+
+        # HANGUL fontface의 font ID -> 이름
+        font_names = {}
+        fontface = header_root.find(f".//{{{ns_hh}}}fontface[@lang='HANGUL']")
+        if fontface is not None:
+            for font in fontface.findall(f"{{{ns_hh}}}font"):
+                font_names[font.get("id")] = font.get("face")
+
+        generated_children = ["fontRef", "ratio", "spacing", "relSz", "offset"]
+        self.charpr_cache = {}
+        max_id = -1
+        charprops = header_root.find(f".//{{{ns_hh}}}charProperties")
+        if charprops is not None:
+            for charpr in charprops.findall(f"{{{ns_hh}}}charPr"):
+                try:
+                    cid = int(charpr.get("id", "0"))
+                except ValueError:
+                    continue
+                max_id = max(max_id, cid)
+
+                children = [etree.QName(child).localname for child in charpr]
+                if children != generated_children:
+                    continue
+                fontref = charpr.find(f"{{{ns_hh}}}fontRef")
+                font_name = font_names.get(fontref.get("hangul"))
+                if font_name is None:
+                    continue
+                cache_key = (int(charpr.get("height", "0")), charpr.get("textColor"), charpr.get("shadeColor", "none"), font_name)
+                self.charpr_cache.setdefault(cache_key, cid)
+
+        self.next_charpr_id = max_id + 1
+
     def _clean_html_tags(self, text):
         """HTML 태그를 제거하고 마커로 변환"""
         import re
@@ -778,7 +1036,15 @@ class HWPXGenerator:
 
         return segments if segments else [{'text': text, 'color': None}]
 
-    def _create_paragraph_with_markers(self, text, default_size, header_root, temp_dir, font_name="Hamchorong Batang", level=1):
+    def _segment_text_color(self, segment_color):
+        """마커 색상 이름을 글자색 HEX로 변환"""
+        if segment_color == 'red':
+            return "#DC2626"  # 빨간색 글자
+        if segment_color == 'green':
+            return "#16A34A"  # 녹색 글자
+        return "#000000"  # 기본 검정
+
+    def _create_paragraph_with_markers(self, text, default_size, header_root, entries, font_name="Hamchorong Batang", level=1):
         """마커 기반 다중 색상 paragraph 생성 - 글자색 사용"""
         # 마커 파싱
         segments = self._parse_color_markers(text)
@@ -786,116 +1052,35 @@ class HWPXGenerator:
         # 레벨에 맞는 ParaPr ID 결정 (동적 할당)
         parapr_id = self.level_parapr_ids.get(level, "0")
 
-        # Paragraph 생성 (레벨별 ParaPr 사용)
-        para = etree.Element(
-            f"{{{self.ns['hp']}}}p",
-            id=str(abs(hash(text)) % 1000000000),
-            paraPrIDRef=parapr_id,
-            styleIDRef="0",
-            pageBreak="0",
-            columnBreak="0",
-            merged="0"
-        )
-
-        # 빈 run (항상 필요)
-        run1 = etree.SubElement(para, f"{{{self.ns['hp']}}}run")
-        run1.set("charPrIDRef", "0")
-        t1 = etree.SubElement(run1, f"{{{self.ns['hp']}}}t")
-        t1.text = ""
-
-        # 각 segment마다 run 생성
-        for segment in segments:
-            segment_text = segment['text']
-            segment_color = segment['color']
-
-            # 글자색 결정
-            if segment_color == 'red':
-                text_color = "#DC2626"  # 빨간색 글자
-            elif segment_color == 'green':
-                text_color = "#16A34A"  # 녹색 글자
-            else:
-                text_color = "#000000"  # 기본 검정
-
-            # CharPr ID 가져오기 또는 생성 (폰트 전달)
-            charpr_id = self._get_or_create_charpr_id(header_root, temp_dir, default_size, text_color, "none", font_name)
-
-            # Run 추가
-            run = etree.SubElement(para, f"{{{self.ns['hp']}}}run")
-            run.set("charPrIDRef", str(charpr_id))
-            t = etree.SubElement(run, f"{{{self.ns['hp']}}}t")
-            t.text = segment_text
+        # 각 segment마다 run (글자색 → CharPr ID 가져오기 또는 생성, 폰트 전달)
+        runs = [
+            (self._get_or_create_charpr_id(header_root, entries, default_size,
+                                           self._segment_text_color(segment['color']), "none", font_name),
+             segment['text'])
+            for segment in segments
+        ]
 
-        return para
+        # Paragraph 생성 (레벨별 ParaPr 사용, 빈 초기 run 포함)
+        return ELEMENTS.paragraph(str(abs(hash(text)) % 1000000000), parapr_id, runs)
 
     def _create_paragraph(self, text, charpr_id):
-        """Paragraph XML 요소 생성 - prefix 분리 지원"""
-        para = etree.Element(
-            f"{{{self.ns['hp']}}}p",
-            id=str(abs(hash(text)) % 1000000000),  # 간단한 ID 생성
-            paraPrIDRef="0",
-            styleIDRef="0",
-            pageBreak="0",
-            columnBreak="0",
-            merged="0"
-        )
-
-        # Run 추가 (빈 run)
-        run1 = etree.SubElement(para, f"{{{self.ns['hp']}}}run")
-        run1.set("charPrIDRef", "0")
-        t1 = etree.SubElement(run1, f"{{{self.ns['hp']}}}t")
-        t1.text = ""
-
-        # Run 추가 (실제 텍스트)
-        run2 = etree.SubElement(para, f"{{{self.ns['hp']}}}run")
-        run2.set("charPrIDRef", str(charpr_id))
-        t2 = etree.SubElement(run2, f"{{{self.ns['hp']}}}t")
-        t2.text = text
-
-        return para
+        """Paragraph XML 요소 생성 (빈 run + 실제 텍스트 run)"""
+        return ELEMENTS.paragraph(str(abs(hash(text)) % 1000000000), "0", [(charpr_id, text)])
 
     def _create_paragraph_with_prefix(self, text, charpr_id, prefix_charpr_id):
         """prefix와 본문을 분리하여 paragraph 생성"""
-        para = etree.Element(
-            f"{{{self.ns['hp']}}}p",
-            id=str(abs(hash(text)) % 1000000000),
-            paraPrIDRef="0",
-            styleIDRef="0",
-            pageBreak="0",
-            columnBreak="0",
-            merged="0"
-        )
-
-        # Run 추가 (빈 run)
-        run1 = etree.SubElement(para, f"{{{self.ns['hp']}}}run")
-        run1.set("charPrIDRef", "0")
-        t1 = etree.SubElement(run1, f"{{{self.ns['hp']}}}t")
-        t1.text = ""
-
-        # prefix와 본문 분리
         prefix, rest = self._split_prefix(text)
 
         if prefix:
-            # prefix run (색상 적용)
-            prefix_run = etree.SubElement(para, f"{{{self.ns['hp']}}}run")
-            prefix_run.set("charPrIDRef", str(prefix_charpr_id))
-            prefix_t = etree.SubElement(prefix_run, f"{{{self.ns['hp']}}}t")
-            prefix_t.text = prefix
-
-            # 본문 run (검정색)
-            rest_run = etree.SubElement(para, f"{{{self.ns['hp']}}}run")
-            rest_run.set("charPrIDRef", "0")  # 기본 CharPr (검정색)
-            rest_t = etree.SubElement(rest_run, f"{{{self.ns['hp']}}}t")
-            rest_t.text = rest
+            # prefix run (색상 적용) + 본문 run (기본 CharPr, 검정색)
+            runs = [(prefix_charpr_id, prefix), ("0", rest)]
         else:
             # prefix 없으면 전체에 색상 적용
-            run2 = etree.SubElement(para, f"{{{self.ns['hp']}}}run")
-            run2.set("charPrIDRef", str(charpr_id))
-            t2 = etree.SubElement(run2, f"{{{self.ns['hp']}}}t")
-            t2.text = text
+            runs = [(charpr_id, text)]
 
-        return para
+        return ELEMENTS.paragraph(str(abs(hash(text)) % 1000000000), "0", runs)
 
-    def _create_table_paragraph(self, header_root, temp_dir, table_data):
+    def _create_table_paragraph(self, header_root, entries, table_data):
         """표를 담는 paragraph 생성 (네이티브 한글 구조 정확 재현)
 
         네이티브 한글 구조:
@@ -910,109 +1095,25 @@ class HWPXGenerator:
           </hp:linesegarray>
         </hp:p>
         """
-        # paragraph
-        table_para = etree.Element(
-            f"{{{self.ns['hp']}}}p",
-            id="0",
-            paraPrIDRef="0",
-            styleIDRef="0",
-            pageBreak="0",
-            columnBreak="0",
-            merged="0"
-        )
-
-        # run (charPrIDRef="0" 필수)
-        table_run = etree.SubElement(table_para, f"{{{self.ns['hp']}}}run")
-        table_run.set("charPrIDRef", "0")
-
-        # 표 생성하여 run에 추가
-        table = self._create_table(header_root, temp_dir, table_data)
-        table_run.append(table)
-
-        # 빈 <hp:t/> 추가 (tbl 뒤에 - 네이티브 필수 구조)
-        etree.SubElement(table_run, f"{{{self.ns['hp']}}}t")
+        table = self._create_table(header_root, entries, table_data)
 
         # linesegarray (표 paragraph용: horzsize=0)
-        row_count = len(table_data.get("rows", [])) + 1
-        table_height = 1765 * row_count  # 행 높이 * 행 수
-        linesegarray = etree.SubElement(table_para, f"{{{self.ns['hp']}}}linesegarray")
-        lineseg = etree.SubElement(linesegarray, f"{{{self.ns['hp']}}}lineseg")
-        lineseg.set("textpos", "0")
-        lineseg.set("vertpos", str(table_height))
-        lineseg.set("vertsize", "1000")
-        lineseg.set("textheight", "1000")
-        lineseg.set("baseline", "850")
-        lineseg.set("spacing", "600")
-        lineseg.set("horzpos", "0")
-        lineseg.set("horzsize", "0")
-        lineseg.set("flags", "393216")
-
-        return table_para
-
-    def _create_table(self, header_root, temp_dir, table_data):
+        row_count = len(table_data.rows) + 1
+        return ELEMENTS.table_paragraph(table, 1765 * row_count)  # 행 높이 * 행 수
+
+    def _create_table(self, header_root, entries, table_data):
         """표 XML 요소 생성"""
         import random
 
-        headers = table_data.get("headers", [])
-        rows = table_data.get("rows", [])
+        headers = table_data.headers
+        rows = table_data.rows
 
         col_count = len(headers)
         row_count = len(rows) + 1  # 헤더 포함
 
-        # 표 요소 생성
-        table = etree.Element(
-            f"{{{self.ns['hp']}}}tbl",
-            id=str(random.randint(1000000000, 2000000000)),
-            zOrder="0",
-            numberingType="TABLE",
-            textWrap="TOP_AND_BOTTOM",
-            textFlow="BOTH_SIDES",
-            lock="0",
-            dropcapstyle="None",
-            pageBreak="CELL",
-            repeatHeader="1",
-            rowCnt=str(row_count),
-            colCnt=str(col_count),
-            cellSpacing="0",
-            borderFillIDRef=self.table_borderfill_id,
-            noAdjust="0"
-        )
-
-        # 크기 설정
-        sz = etree.SubElement(table, f"{{{self.ns['hp']}}}sz")
-        sz.set("width", "41950")  # A4 너비
-        sz.set("widthRelTo", "ABSOLUTE")
-        sz.set("height", str(1500 * row_count))  # 행 높이 * 행 수
-        sz.set("heightRelTo", "ABSOLUTE")
-        sz.set("protect", "0")
-
-        # 위치 설정
-        pos = etree.SubElement(table, f"{{{self.ns['hp']}}}pos")
-        pos.set("treatAsChar", "1")  # 글자처럼 취급
-        pos.set("affectLSpacing", "0")
-        pos.set("flowWithText", "1")
-        pos.set("allowOverlap", "0")
-        pos.set("holdAnchorAndSO", "0")
-        pos.set("vertRelTo", "PARA")
-        pos.set("horzRelTo", "COLUMN")
-        pos.set("vertAlign", "TOP")
-        pos.set("horzAlign", "LEFT")
-        pos.set("vertOffset", "0")
-        pos.set("horzOffset", "0")
-
-        # 외부 여백
-        outMargin = etree.SubElement(table, f"{{{self.ns['hp']}}}outMargin")
-        outMargin.set("left", "283")
-        outMargin.set("right", "283")
-        outMargin.set("top", "283")
-        outMargin.set("bottom", "283")
-
-        # 내부 여백
-        inMargin = etree.SubElement(table, f"{{{self.ns['hp']}}}inMargin")
-        inMargin.set("left", "510")
-        inMargin.set("right", "510")
-        inMargin.set("top", "141")
-        inMargin.set("bottom", "141")
+        # 표 요소 생성 (크기/위치/여백 포함 프로토타입 복제)
+        table = ELEMENTS.table(str(random.randint(1000000000, 2000000000)), row_count, col_count,
+                               self.table_borderfill_id)
 
         # 표 스타일 (proposal-styles.json에서 로드)
         table_style = self.style_config.get("table", {})
@@ -1022,115 +1123,71 @@ class HWPXGenerator:
 
         # 헤더 행 생성
         header_row = etree.SubElement(table, f"{{{self.ns['hp']}}}tr")
-        for col_idx, header in enumerate(headers):
-            header_text = header.get("text", "") if isinstance(header, dict) else header
-            cell = self._create_table_cell(header_text, height, header_root, temp_dir, col_idx, 0, table_font_name, col_count)
+        for col_idx, header_text in enumerate(headers):
+            cell = self._create_table_cell(header_text, height, header_root, entries, col_idx, 0, table_font_name, col_count)
             header_row.append(cell)
 
         # 데이터 행 생성
         for row_idx, row in enumerate(rows):
             data_row = etree.SubElement(table, f"{{{self.ns['hp']}}}tr")
-            for col_idx, cell_data in enumerate(row):
-                cell_text = cell_data.get("text", "") if isinstance(cell_data, dict) else cell_data
-                cell = self._create_table_cell(cell_text, height, header_root, temp_dir, col_idx, row_idx + 1, table_font_name, col_count)
+            for col_idx, cell_text in enumerate(row):
+                cell = self._create_table_cell(cell_text, height, header_root, entries, col_idx, row_idx + 1, table_font_name, col_count)
                 data_row.append(cell)
 
         return table
 
-    def _create_table_cell(self, text, default_size, header_root, temp_dir, col_idx, row_idx, font_name="Hamchorong Batang", col_count=1):
+    def _create_table_cell(self, text, default_size, header_root, entries, col_idx, row_idx, font_name="Hamchorong Batang", col_count=1):
         """표 셀 XML 요소 생성 - 마커 기반 색상 지원"""
-        cell = etree.Element(
-            f"{{{self.ns['hp']}}}tc",
-            name="",
-            header="0",
-            hasMargin="0",
-            protect="0",
-            editable="0",
-            dirty="0",
-            borderFillIDRef=self.cell_borderfill_id
-        )
+        # 마커 파싱하여 각 세그먼트별 run 생성 (빈 초기 run 없음 - 네이티브 호환)
+        runs = [
+            (self._get_or_create_charpr_id(header_root, entries, default_size,
+                                           self._segment_text_color(segment['color']), "none", font_name),
+             segment['text'])
+            for segment in self._parse_color_markers(text)
+        ]
+        return ELEMENTS.cell(self.cell_borderfill_id, col_count, col_idx, row_idx, runs)
 
-        # subList 추가 (필수!)
-        subList = etree.SubElement(cell, f"{{{self.ns['hp']}}}subList")
-        subList.set("id", "")
-        subList.set("textDirection", "HORIZONTAL")
-        subList.set("lineWrap", "BREAK")
-        subList.set("vertAlign", "CENTER")
-        subList.set("linkListIDRef", "0")
-        subList.set("linkListNextIDRef", "0")
-        subList.set("textWidth", "0")
-        subList.set("textHeight", "0")
-        subList.set("hasTextRef", "0")
-        subList.set("hasNumRef", "0")
-
-        # subList 안에 Paragraph 추가 (네이티브 한글 구조: 빈 초기 run 없이)
-        para = etree.SubElement(subList, f"{{{self.ns['hp']}}}p")
-        para.set("id", "0")
-        para.set("paraPrIDRef", "0")  # 기본 paraPr (표 셀용 - 여백 없음)
-        para.set("styleIDRef", "0")
-        para.set("pageBreak", "0")
-        para.set("columnBreak", "0")
-        para.set("merged", "0")
 
-        # 마커 파싱하여 각 세그먼트별 run 생성 (빈 초기 run 없음 - 네이티브 호환)
-        segments = self._parse_color_markers(text)
-        for segment in segments:
-            segment_text = segment['text']
-            segment_color = segment['color']
-
-            if segment_color == 'red':
-                text_color = "#DC2626"
-            elif segment_color == 'green':
-                text_color = "#16A34A"
-            else:
-                text_color = "#000000"
-
-            charpr_id = self._get_or_create_charpr_id(header_root, temp_dir, default_size, text_color, "none", font_name)
-
-            run = etree.SubElement(para, f"{{{self.ns['hp']}}}run")
-            run.set("charPrIDRef", str(charpr_id))
-            t = etree.SubElement(run, f"{{{self.ns['hp']}}}t")
-            t.text = segment_text
-
-        # linesegarray 추가 (한글 렌더링에 필수)
-        cell_width = 41950 // max(col_count, 1)
-        cell_inner_width = cell_width - 1020  # 좌우 cellMargin(510*2) 제외
-        linesegarray = etree.SubElement(para, f"{{{self.ns['hp']}}}linesegarray")
-        lineseg = etree.SubElement(linesegarray, f"{{{self.ns['hp']}}}lineseg")
-        lineseg.set("textpos", "0")
-        lineseg.set("vertpos", "0")
-        lineseg.set("vertsize", "1200")
-        lineseg.set("textheight", "1200")
-        lineseg.set("baseline", "1020")
-        lineseg.set("spacing", "720")
-        lineseg.set("horzpos", "0")
-        lineseg.set("horzsize", str(cell_inner_width))
-        lineseg.set("flags", "393216")
-
-        # cellAddr 추가 (col, row 인덱스)
-        cellAddr = etree.SubElement(cell, f"{{{self.ns['hp']}}}cellAddr")
-        cellAddr.set("colAddr", str(col_idx))
-        cellAddr.set("rowAddr", str(row_idx))
-
-        # cellSpan 추가
-        cellSpan = etree.SubElement(cell, f"{{{self.ns['hp']}}}cellSpan")
-        cellSpan.set("colSpan", "1")
-        cellSpan.set("rowSpan", "1")
-
-        # cellSz 추가 (열 수에 맞게 균등 분배: 41950 / col_count)
-        cell_width = 41950 // max(col_count, 1)
-        cellSz = etree.SubElement(cell, f"{{{self.ns['hp']}}}cellSz")
-        cellSz.set("width", str(cell_width))
-        cellSz.set("height", "1765")
-
-        # cellMargin 추가
-        cellMargin = etree.SubElement(cell, f"{{{self.ns['hp']}}}cellMargin")
-        cellMargin.set("left", "510")
-        cellMargin.set("right", "510")
-        cellMargin.set("top", "141")
-        cellMargin.set("bottom", "141")
-
-        return cell
+class IncrementalDocument:
+    """도착하는 content 항목을 바로 section에 렌더링하고 finish()에서 HWPX로 묶는 문서"""
+
+    def __init__(self, generator, metadata):
+        self.generator = generator
+        self.metadata = metadata
+        self.item_count = 0
+        self.template_infos, self.entries, self.header_root, self.section_root = generator._prepare_document()
+
+        # 5. 새 콘텐츠 추가 - 제목 (선택적 - metadata에서 설정 가능)
+        print("[Step 4] Adding new content...")
+        for para in generator._build_title_paragraphs(metadata, self.header_root, self.entries):
+            self.section_root.append(para)
+
+    def add(self, item):
+        """content 항목(Section/Table 또는 dict) 하나 렌더링"""
+        for para in self.generator._build_content_item(item, self.metadata, self.header_root, self.entries):
+            self.section_root.append(para)
+        self.item_count += 1
+
+    def finish(self, compact=False, compress_level=None):
+        """HWPX bytes (compact/compress_level은 HWPXGenerator.generate_bytes 참고)"""
+        return self.generator._finish_document(self.template_infos, self.entries, self.header_root,
+                                               section_root=self.section_root,
+                                               compact=compact, compress_level=compress_level)
+
+
+def _build_section_worker(job):
+    """워커 프로세스: content 그룹 하나로 section XML bytes 생성 (스타일 테이블은 generator에 포함)"""
+    generator, metadata, items, section_template, with_title, pretty_print = job
+    section_root = etree.fromstring(section_template)
+
+    if with_title:
+        for para in generator._build_title_paragraphs(metadata, None, None):
+            section_root.append(para)
+    for item in items:
+        for para in generator._build_content_item(item, metadata, None, None):
+            section_root.append(para)
+
+    return etree.tostring(section_root, encoding='utf-8', xml_declaration=True, pretty_print=pretty_print)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,409 @@
+# -*- coding: utf-8 -*-
+"""
+HWPX 문서 병합 (다시 렌더링하지 않음)
+
+HWPXGenerator로 따로 생성한 여러 .hwpx(장별 원고 등)를 한 문서로 합친다.
+- 첫 문서가 기준: 기준 문서의 엔트리와 section은 압축 해제 없이 raw 복사
+- header.xml: 다른 문서의 폰트/borderFill/charPr/tabPr/numbering/paraPr/style을 기준 header에 합치며
+  내용이 같은 항목은 기존 ID를 재사용하고 없는 것만 새 ID로 추가 (문서별 ID 대응표)
+- 다른 문서의 section은 기준 문서 section 뒤에 새 Contents/sectionN.xml로 이어 붙인다
+  (content.hpf manifest/spine, header secCnt 등록). ID가 바뀌지 않은 section은 raw 복사,
+  바뀐 section은 최상위 <hp:p> 단위로 스트리밍하며 *IDRef만 바이트 치환 (paragraph를 파싱하지 않음)
+- 임베딩 폰트(BinData)는 이름이 겹치면 새 BIN ID로 바꿔 복사
+
+사용법:
+  CLI:    python hwpx_merge.py 1장.hwpx 2장.hwpx 3장.hwpx -o 제안서.hwpx
+  Import: merge_hwpx(["1장.hwpx", "2장.hwpx"], "제안서.hwpx")
+"""
+import argparse
+import copy
+import io
+import os
+import re
+import time
+import zipfile
+
+from lxml import etree
+
+from hwpx_archive import copy_entry_raw, iter_top_level_paragraphs
+from hwpx_compact import HH, remap_section_refs
+
+HEADER_ENTRY = "Contents/header.xml"
+CONTENT_HPF = "Contents/content.hpf"
+MANIFEST_ENTRY = "META-INF/manifest.xml"
+SECTION_RE = re.compile(r"^Contents/section(\d+)\.xml$")
+MANIFEST_NS = "urn:oasis:names:tc:opendocument:xmlns:manifest:1.0"
+
+# (목록 요소, 항목 요소, 참조 속성, 첫 ID) - 뒤 항목이 앞 항목을 참조하므로 이 순서로 병합
+# (charPr → borderFill, numbering → charPr, paraPr → tabPr/borderFill/numbering, style → paraPr/charPr)
+MERGE_TABLES = (
+    ("borderFills", "borderFill", "borderFillIDRef", 1),
+    ("charProperties", "charPr", "charPrIDRef", 0),
+    ("tabProperties", "tabPr", "tabPrIDRef", 0),
+    ("numberings", "numbering", None, 1),
+    ("bullets", "bullet", None, 1),
+    ("paraProperties", "paraPr", "paraPrIDRef", 0),
+)
+
+# section 본문에서 치환하는 참조 속성 (remap_section_refs)
+SECTION_REF_ATTRS = ("charPrIDRef", "paraPrIDRef", "borderFillIDRef", "styleIDRef")
+
+# charPr fontRef 속성 → fontface lang
+FONT_LANGS = {"hangul": "HANGUL", "latin": "LATIN", "hanja": "HANJA", "japanese": "JAPANESE",
+              "other": "OTHER", "symbol": "SYMBOL", "user": "USER"}
+
+# paraPr heading type → idRef가 가리키는 목록
+HEADING_TABLES = {"NUMBER": "numberings", "OUTLINE": "numberings", "BULLET": "bullets"}
+
+
+def _content_key(elem, top=True):
+    """항목 비교 키 - 태그/속성/텍스트 (최상위 id와 들여쓰기 공백, 네임스페이스 prefix 차이는 무시)"""
+    attrs = tuple(sorted((k, v) for k, v in elem.attrib.items() if not (top and k == "id")))
+    return (elem.tag, attrs, (elem.text or "").strip(), tuple(_content_key(child, False) for child in elem))
+
+
+def _set_refs(item, maps):
+    """item과 하위 요소의 참조 속성을 {속성: {이전 ID: 새 ID}}로 치환"""
+    for elem in item.iter(etree.Element):
+        for attr, mapping in maps.items():
+            value = elem.get(attr)
+            if value is not None and value in mapping:
+                elem.set(attr, mapping[value])
+
+
+class HeaderMerger:
+    """기준 header에 다른 문서의 header 항목을 합치며 문서별 ID 대응표를 만든다 (header_root를 직접 수정)"""
+
+    def __init__(self, header_root):
+        self.root = header_root
+        self.index = {}     # 목록 요소(또는 fontface lang) -> {내용 키: ID}
+        self.keys = {}      # 목록 요소(또는 fontface lang) -> {ID: 내용 키}
+        self.next_id = {}
+        self.added = {}     # 항목 요소 -> 추가 수
+
+        for lang, fontface in self._fontfaces(header_root).items():
+            self._index_items(("font", lang), fontface.findall(f"{{{HH}}}font"), 0)
+        for list_tag, item_tag, _, first_id in MERGE_TABLES:
+            container = header_root.find(f".//{{{HH}}}{list_tag}")
+            items = container.findall(f"{{{HH}}}{item_tag}") if container is not None else []
+            self._index_items(list_tag, items, first_id)
+        styles = header_root.find(f".//{{{HH}}}styles")
+        self.style_ids = {}
+        for style in (styles.findall(f"{{{HH}}}style") if styles is not None else []):
+            self.style_ids.setdefault((style.get("type"), style.get("name")), style.get("id"))
+        self.next_style_id = max((int(style_id) for style_id in self.style_ids.values()), default=-1) + 1
+
+    @staticmethod
+    def _fontfaces(header_root):
+        return {fontface.get("lang"): fontface for fontface in header_root.iter(f"{{{HH}}}fontface")}
+
+    def _index_items(self, key, items, first_id):
+        known = self.index.setdefault(key, {})
+        keys = self.keys.setdefault(key, {})
+        for item in items:
+            content_key = keys[item.get("id")] = _content_key(item)
+            known.setdefault(content_key, item.get("id"))
+        self.next_id[key] = max((int(item.get("id")) for item in items), default=first_id - 1) + 1
+
+    def _add(self, key, container, item, item_tag):
+        """내용이 같은 항목이 있으면 그 ID (같은 ID 우선 - 기준 header 안의 중복 항목), 없으면 새 ID로 container에 추가"""
+        content_key = _content_key(item)
+        if self.keys[key].get(item.get("id")) == content_key:
+            return item.get("id")
+        existing = self.index[key].get(content_key)
+        if existing is not None:
+            return existing
+        new_id = str(self.next_id[key])
+        self.next_id[key] += 1
+        item.set("id", new_id)
+        item.tail = None
+        container.append(item)
+        self.index[key][content_key] = new_id
+        self.keys[key][new_id] = content_key
+        self.added[item_tag] = self.added.get(item_tag, 0) + 1
+        return new_id
+
+    def merge(self, other_root, binary_ids=None):
+        """
+        other_root(다른 문서 header)의 항목을 합친다
+
+        Args:
+            other_root: 다른 문서 header.xml 루트 (읽기만 함)
+            binary_ids: {이전 BinData ID: 새 ID} - 이름이 겹쳐 바꾼 임베딩 폰트
+
+        Returns:
+            {section 참조 속성: {이전 ID: 새 ID}} - 바뀐 것만 (비어 있으면 section을 그대로 쓸 수 있음)
+        """
+        maps = {}
+
+        # 1. 폰트 (fontface lang마다 ID가 따로)
+        font_maps = {}
+        base_fontfaces = self._fontfaces(self.root)
+        for lang, fontface in self._fontfaces(other_root).items():
+            target = base_fontfaces.get(lang)
+            if target is None:
+                raise ValueError(f"기준 문서 header에 {lang} fontface가 없습니다")
+            mapping = font_maps[lang] = {}
+            for font in fontface.findall(f"{{{HH}}}font"):
+                font = copy.deepcopy(font)
+                old_id = font.get("id")
+                if binary_ids and font.get("binaryItemIDRef") in binary_ids:
+                    font.set("binaryItemIDRef", binary_ids[font.get("binaryItemIDRef")])
+                mapping[old_id] = self._add(("font", lang), target, font, "font")
+            target.set("fontCnt", str(len(target.findall(f"{{{HH}}}font"))))
+
+        # 2. 스타일 목록 (앞 목록의 대응표로 참조를 바꾼 뒤 비교)
+        for list_tag, item_tag, attr, _ in MERGE_TABLES:
+            source = other_root.find(f".//{{{HH}}}{list_tag}")
+            if source is None:
+                continue
+            container = self.root.find(f".//{{{HH}}}{list_tag}")
+            if container is None:
+                raise ValueError(f"기준 문서 header에 {list_tag}가 없습니다")
+            mapping = {}
+            for item in source.findall(f"{{{HH}}}{item_tag}"):
+                item = copy.deepcopy(item)
+                old_id = item.get("id")
+                self._remap_item(item, maps, font_maps)
+                mapping[old_id] = self._add(list_tag, container, item, item_tag)
+            container.set("itemCnt", str(len(container.findall(f"{{{HH}}}{item_tag}"))))
+            maps[attr or list_tag] = mapping
+
+        # 3. style은 이름으로 대응 (같은 이름이면 기준 문서의 style 사용)
+        maps["styleIDRef"] = self._merge_styles(other_root, maps)
+
+        return {attr: {old: new for old, new in maps.get(attr, {}).items() if old != new}
+                for attr in SECTION_REF_ATTRS
+                if any(old != new for old, new in maps.get(attr, {}).items())}
+
+    def _remap_item(self, item, maps, font_maps):
+        _set_refs(item, {attr: mapping for attr, mapping in maps.items() if attr.endswith("IDRef")})
+        for font_ref in item.iter(f"{{{HH}}}fontRef"):
+            for attr, lang in FONT_LANGS.items():
+                value = font_ref.get(attr)
+                if value is not None and value in font_maps.get(lang, {}):
+                    font_ref.set(attr, font_maps[lang][value])
+        for heading in item.iter(f"{{{HH}}}heading"):
+            mapping = maps.get(HEADING_TABLES.get(heading.get("type")), {})
+            if heading.get("idRef") in mapping:
+                heading.set("idRef", mapping[heading.get("idRef")])
+
+    def _merge_styles(self, other_root, maps):
+        source = other_root.find(f".//{{{HH}}}styles")
+        container = self.root.find(f".//{{{HH}}}styles")
+        if source is None or container is None:
+            return {}
+
+        mapping = {}
+        added = []
+        for style in source.findall(f"{{{HH}}}style"):
+            key = (style.get("type"), style.get("name"))
+            if key in self.style_ids:
+                mapping[style.get("id")] = self.style_ids[key]
+                continue
+            style = copy.deepcopy(style)
+            self._remap_item(style, maps, {})
+            new_id = str(self.next_style_id)
+            self.next_style_id += 1
+            mapping[style.get("id")] = new_id
+            self.style_ids[key] = new_id
+            style.set("id", new_id)
+            style.tail = None
+            container.append(style)
+            added.append(style)
+        for style in added:
+            _set_refs(style, {"nextStyleIDRef": mapping})
+        if added:
+            container.set("itemCnt", str(len(container.findall(f"{{{HH}}}style"))))
+            self.added["style"] = self.added.get("style", 0) + len(added)
+        return mapping
+
+
+def _section_infos(zin):
+    """Contents/sectionN.xml 엔트리 (N 순서)"""
+    sections = [(int(match.group(1)), info) for info in zin.infolist()
+                for match in [SECTION_RE.match(info.filename)] if match]
+    return [info for _, info in sorted(sections, key=lambda pair: pair[0])]
+
+
+def _binary_renames(zin, taken):
+    """
+    다른 문서의 BinData 엔트리 → 출력 이름 {원래 이름: 출력 이름 또는 None(같은 내용이 이미 있음)}
+
+    taken: {출력 엔트리 이름: ZipInfo} (새 이름을 고르면서 갱신)
+    """
+    renames = {}
+    for info in zin.infolist():
+        if not info.filename.startswith("BinData/"):
+            continue
+        existing = taken.get(info.filename)
+        if existing is not None and (existing.CRC, existing.file_size) == (info.CRC, info.file_size):
+            renames[info.filename] = None
+            continue
+        new_name = info.filename
+        if existing is not None:
+            ext = os.path.splitext(info.filename)[1]
+            number = 0
+            while f"BinData/BIN{number:04d}{ext}" in taken:
+                number += 1
+            new_name = f"BinData/BIN{number:04d}{ext}"
+        renames[info.filename] = new_name
+        taken[new_name] = info
+    return renames
+
+
+def _register_sections(hpf_bytes, first_index, count):
+    """content.hpf manifest/spine의 마지막 section 뒤에 section{first_index}..{first_index + count - 1} 추가"""
+    hpf_root = etree.fromstring(hpf_bytes)
+    opf = hpf_root.nsmap.get("opf", "http://www.idpf.org/2007/opf/")
+    last = f"section{first_index - 1}"
+    manifest_item = hpf_root.find(f".//{{{opf}}}manifest/{{{opf}}}item[@id='{last}']")
+    spine_ref = hpf_root.find(f".//{{{opf}}}spine/{{{opf}}}itemref[@idref='{last}']")
+    for index in range(first_index + count - 1, first_index - 1, -1):
+        if manifest_item is not None:
+            manifest_item.addnext(etree.Element(f"{{{opf}}}item", id=f"section{index}",
+                                                href=f"Contents/section{index}.xml",
+                                                **{"media-type": "application/xml"}))
+        if spine_ref is not None:
+            spine_ref.addnext(etree.Element(f"{{{opf}}}itemref", idref=f"section{index}", linear="yes"))
+    return etree.tostring(hpf_root.getroottree(), encoding="UTF-8", xml_declaration=True)
+
+
+def _add_manifest_entries(manifest_bytes, entries):
+    """META-INF/manifest.xml에 [(출력 이름, 원본 file-entry 또는 None)] 추가"""
+    root = etree.fromstring(manifest_bytes)
+    for name, source_entry in entries:
+        entry = copy.deepcopy(source_entry) if source_entry is not None else etree.Element(
+            f"{{{MANIFEST_NS}}}file-entry", nsmap={"manifest": MANIFEST_NS})
+        entry.set(f"{{{MANIFEST_NS}}}full-path", name)
+        if entry.get(f"{{{MANIFEST_NS}}}media-type") is None:
+            entry.set(f"{{{MANIFEST_NS}}}media-type", "application/octet-stream")
+        root.append(entry)
+    return etree.tostring(root.getroottree(), encoding="UTF-8", xml_declaration=True)
+
+
+def _manifest_entries(zin):
+    """{full-path: file-entry 요소} (manifest.xml이 없으면 빈 dict)"""
+    if MANIFEST_ENTRY not in zin.NameToInfo:
+        return {}
+    root = etree.fromstring(zin.read(MANIFEST_ENTRY))
+    return {entry.get(f"{{{MANIFEST_NS}}}full-path"): entry for entry in root.iter(f"{{{MANIFEST_NS}}}file-entry")}
+
+
+def _copy_renamed(zin, info, zout, name):
+    """copy_entry_raw + 엔트리 이름 변경"""
+    renamed = copy.copy(info)
+    renamed.filename = renamed.orig_filename = name
+    copy_entry_raw(zin, renamed, zout)
+
+
+def _write_section(zin, info, zout, name, remap):
+    """section 엔트리를 ID 치환하며 기록 (치환할 것이 없으면 raw 복사)"""
+    if not remap:
+        _copy_renamed(zin, info, zout, name)
+        return
+    zinfo = zipfile.ZipInfo(name, date_time=info.date_time)
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    with zin.open(info) as src, zout.open(zinfo, "w", force_zip64=info.file_size > zipfile.ZIP64_LIMIT // 2) as dst:
+        for kind, chunk in iter_top_level_paragraphs(src):
+            dst.write(remap_section_refs(chunk, remap) if kind == "p" else chunk)
+
+
+def merge_hwpx(sources, output_path=None, compresslevel=None):
+    """
+    HWPXGenerator로 만든 여러 HWPX 문서를 순서대로 합친 하나의 HWPX
+
+    Args:
+        sources: .hwpx 경로 또는 bytes 목록 (첫 문서가 기준: 페이지 설정/메타데이터/미리보기)
+        output_path: 저장 경로 (None이면 bytes 반환)
+        compresslevel: 다시 압축하는 엔트리(header, ID가 바뀐 section)의 deflate 레벨
+
+    Returns:
+        output_path 또는 병합된 bytes
+    """
+    if not sources:
+        raise ValueError("병합할 문서가 없습니다")
+    start = time.perf_counter()
+    archives = [zipfile.ZipFile(io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source, "r")
+                for source in sources]
+    try:
+        base = archives[0]
+        if HEADER_ENTRY not in base.NameToInfo:
+            raise ValueError("기준 문서에 Contents/header.xml이 없습니다")
+        header_root = etree.fromstring(base.read(HEADER_ENTRY))
+        merger = HeaderMerger(header_root)
+        base_sections = _section_infos(base)
+        if not base_sections:
+            raise ValueError("기준 문서에 section이 없습니다")
+
+        # 1. 문서별 header 병합 + 이어 붙일 section/BinData 계획 (header만 파싱)
+        taken = dict(base.NameToInfo)
+        base_manifest = _manifest_entries(base)
+        appended = []      # (zip, section info, 출력 이름, 치환표)
+        binaries = []      # (zip, info, 출력 이름)
+        manifest_added = []
+        for number, zin in enumerate(archives[1:], 2):
+            if HEADER_ENTRY not in zin.NameToInfo:
+                raise ValueError(f"{number}번째 문서에 Contents/header.xml이 없습니다")
+            renames = _binary_renames(zin, taken)
+            binary_ids = {os.path.splitext(os.path.basename(old))[0]: os.path.splitext(os.path.basename(new))[0]
+                          for old, new in renames.items() if new and new != old}
+            remap = merger.merge(etree.fromstring(zin.read(HEADER_ENTRY)), binary_ids)
+
+            other_manifest = _manifest_entries(zin)
+            for old, new in renames.items():
+                if new:
+                    binaries.append((zin, zin.getinfo(old), new))
+                    if new not in base_manifest:
+                        manifest_added.append((new, other_manifest.get(old)))
+            for info in _section_infos(zin):
+                appended.append((zin, info, f"Contents/section{len(base_sections) + len(appended)}.xml", remap))
+
+        header_root.set("secCnt", str(len(base_sections) + len(appended)))
+        replacements = {HEADER_ENTRY: etree.tostring(header_root.getroottree(), encoding="UTF-8",
+                                                     xml_declaration=True)}
+        if appended and CONTENT_HPF in base.NameToInfo:
+            replacements[CONTENT_HPF] = _register_sections(base.read(CONTENT_HPF), len(base_sections), len(appended))
+        if manifest_added and MANIFEST_ENTRY in base.NameToInfo:
+            replacements[MANIFEST_ENTRY] = _add_manifest_entries(base.read(MANIFEST_ENTRY), manifest_added)
+
+        # 2. 기준 문서 엔트리 순서로 기록, 마지막 section 바로 뒤에 다른 문서 section 삽입
+        out = io.BytesIO() if output_path is None else output_path
+        with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as zout:
+            for info in base.infolist():
+                if info.filename in replacements:
+                    zinfo = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+                    zinfo.compress_type = info.compress_type
+                    zinfo.external_attr = info.external_attr
+                    zout.writestr(zinfo, replacements[info.filename])
+                else:
+                    copy_entry_raw(base, info, zout)
+                if info is base_sections[-1]:
+                    for zin, section_info, name, remap in appended:
+                        _write_section(zin, section_info, zout, name, remap)
+            for zin, info, name in binaries:
+                _copy_renamed(zin, info, zout, name)
+    finally:
+        for zin in archives:
+            zin.close()
+
+    rewritten = sum(1 for *_, remap in appended if remap)
+    print(f"[Merge] {len(sources)} documents -> {len(base_sections) + len(appended)} sections "
+          f"({rewritten} rewritten, {len(appended) - rewritten} raw), header added {merger.added or 'nothing'} "
+          f"in {(time.perf_counter() - start) * 1000:.1f}ms")
+    return out.getvalue() if output_path is None else output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HWPX 문서 병합 (다시 렌더링하지 않음)")
+    parser.add_argument("inputs", nargs="+", help="합칠 .hwpx 파일 (순서대로, 첫 파일이 기준)")
+    parser.add_argument("-o", "--output", required=True, help="출력 .hwpx")
+    parser.add_argument("--level", type=int, default=None, help="다시 압축하는 엔트리의 deflate 레벨 (0~9)")
+    args = parser.parse_args()
+
+    merge_hwpx(args.inputs, args.output, compresslevel=args.level)
+    print(f"✓ {args.output} ({os.path.getsize(args.output) / 1024 / 1024:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+HWPX 증분 패치 API
+
+이전에 HWPXGenerator로 생성한 .hwpx에 content 항목 단위 변경분만 반영한다.
+- Contents/section0.xml: 변경된 항목의 최상위 <hp:p> 범위만 바이트 단위로 교체
+- Contents/header.xml: 새 charPr/폰트가 필요한 경우에만 다시 기록
+- 그 밖의 엔트리: 압축 해제 없이 raw 복사
+
+사용 예:
+    from hwpx_patch import patch_hwpx, apply_section_diff
+
+    changes = {"section3": new_section_item, "table_s2_1": None}  # None = 삭제
+    patch_hwpx("v1.hwpx", proposal_json, changes, "v2.hwpx", base_dir=PROJECT_ROOT)
+    proposal_json = apply_section_diff(proposal_json, changes)
+"""
+import io
+import zipfile
+
+from lxml import etree
+
+from hwpx_archive import find_top_level_paragraphs, paragraph_prefix, rewrite_archive, serialize_children
+from hwpx_generator import HWPXGenerator
+from proposal_ir import Document, as_document, content_item_from_dict
+
+SECTION_ENTRY = "Contents/section0.xml"
+HEADER_ENTRY = "Contents/header.xml"
+
+
+def item_paragraph_count(item, metadata):
+    """content 항목 하나가 section0.xml에 만드는 최상위 paragraph 수 (generate()와 동일 규칙)"""
+    item = content_item_from_dict(item)
+
+    if item.type == "section":
+        count = len(item.items)
+        if metadata.get("include_section_titles", False) and item.title:
+            count += 1
+        return count
+
+    if item.type == "table":
+        return 2 if item.title else 1
+
+    return 0
+
+
+def compute_section_layout(data):
+    """
+    content 항목별 최상위 paragraph 범위 계산
+
+    Returns:
+        [(id 또는 content index, start, count), ...] - content 순서
+    """
+    doc = as_document(data)
+    metadata = doc.metadata
+    position = 0
+    if metadata.get("include_title", False) and metadata.get("title", "제목 없음"):
+        position = 1
+
+    layout = []
+    for index, item in enumerate(doc.content):
+        count = item_paragraph_count(item, metadata)
+        layout.append((index if item.id is None else item.id, position, count))
+        position += count
+    return layout
+
+
+def _resolve_changes(data, changes):
+    """changes 키(id 또는 content index)를 content index로 변환"""
+    content = as_document(data).content
+    by_id = {item.id: index for index, item in enumerate(content) if item.id}
+
+    resolved = {}
+    for key, new_item in changes.items():
+        if isinstance(key, int) and 0 <= key < len(content):
+            index = key
+        elif key in by_id:
+            index = by_id[key]
+        else:
+            raise KeyError(f"Unknown content item: {key!r} (새 항목 추가는 전체 재생성 필요)")
+        resolved[index] = new_item
+    return resolved
+
+
+def apply_section_diff(data, changes):
+    """patch_hwpx와 같은 변경분을 proposal JSON에 반영한 새 문서 반환 (입력이 Document면 Document, dict면 dict)"""
+    resolved = _resolve_changes(data, changes)
+    content = []
+    source = data.content if isinstance(data, Document) else data.get("content", [])
+    for index, item in enumerate(source):
+        if index in resolved:
+            if resolved[index] is not None:
+                content.append(resolved[index])
+        else:
+            content.append(item)
+    if isinstance(data, Document):
+        return Document(data.metadata, [content_item_from_dict(item) for item in content])
+    return {**data, "content": [item.to_dict() if hasattr(item, "to_dict") else item for item in content]}
+
+
+def patch_hwpx(source, previous_data, changes, output_path=None, base_dir=None, styles_path="proposal-styles.json"):
+    """
+    이전 생성 결과에 섹션 단위 변경분을 적용
+
+    Args:
+        source: 이전에 생성한 .hwpx 경로 또는 bytes
+        previous_data: source 생성에 사용한 proposal JSON (또는 proposal_ir.Document)
+        changes: {content id 또는 index: 새 항목(dict 또는 Section/Table) 또는 None(삭제)}
+        output_path: 저장 경로 (None이면 bytes 반환)
+        base_dir, styles_path: HWPXGenerator와 동일
+
+    Returns:
+        output_path 또는 패치된 bytes
+    """
+    previous_data = as_document(previous_data)
+    metadata = previous_data.metadata
+    layout = compute_section_layout(previous_data)
+    resolved = _resolve_changes(previous_data, changes)
+
+    if isinstance(source, (bytes, bytearray)):
+        src = bytes(source)
+    else:
+        with open(source, "rb") as f:
+            src = f.read()
+
+    with zipfile.ZipFile(io.BytesIO(src), "r") as zf:
+        section_xml = zf.read(SECTION_ENTRY)
+        header_xml = zf.read(HEADER_ENTRY)
+
+    prefix = paragraph_prefix(section_xml)
+    ranges = find_top_level_paragraphs(section_xml, prefix)
+    expected = layout[-1][1] + layout[-1][2] if layout else 0
+    if len(ranges) != expected:
+        raise ValueError(
+            f"section0.xml has {len(ranges)} top-level paragraphs, previous_data implies {expected}"
+        )
+
+    # 기존 header에서 charPr/paraPr/borderFill ID 상태 복원
+    gen = HWPXGenerator(base_dir=base_dir, styles_path=styles_path, embed_fonts=False)
+    header_root = etree.fromstring(header_xml)
+    gen._restore_generated_state(header_root)
+    next_charpr_id = gen.next_charpr_id
+
+    # 교체용 paragraph를 직렬화할 빈 section 루트 (원본 네임스페이스 선언 유지)
+    if ranges:
+        container = etree.fromstring(section_xml[:ranges[0][0]] + section_xml[ranges[-1][1]:])
+    else:
+        container = etree.fromstring(section_xml)
+    close_tag_pos = section_xml.rindex(b"</")
+
+    pieces = []
+    cursor = 0
+    for index in sorted(resolved):
+        _, start, count = layout[index]
+        if start < len(ranges):
+            splice_start = ranges[start][0]
+        else:
+            splice_start = ranges[-1][1] if ranges else close_tag_pos
+        splice_end = ranges[start + count - 1][1] if count else splice_start
+
+        new_item = resolved[index]
+        elements = [] if new_item is None else gen._build_content_item(new_item, metadata, header_root, None)
+
+        pieces.append(section_xml[cursor:splice_start])
+        pieces.append(serialize_children(container, elements))
+        cursor = splice_end
+    pieces.append(section_xml[cursor:])
+
+    replacements = {SECTION_ENTRY: b"".join(pieces)}
+    if gen.next_charpr_id != next_charpr_id:
+        replacements[HEADER_ENTRY] = etree.tostring(header_root, encoding="utf-8", xml_declaration=True)
+
+    print(f"[Patch] {len(resolved)} item(s) replaced, header {'rewritten' if HEADER_ENTRY in replacements else 'copied'}")
+    return rewrite_archive(src, replacements, output_path)
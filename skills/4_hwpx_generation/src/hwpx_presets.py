@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+preset별 템플릿/스타일 풀
+
+preset(제안서/보고서/공문서)마다 기본 템플릿과 스타일 세트를 두고,
+시작 시 한 번 템플릿 archive 로드 + header 준비(compile_template)를 끝내 둔다.
+요청마다 새 HWPXGenerator를 만들지만 준비된 템플릿은 읽기 전용으로 공유하므로 파싱이 없다.
+
+사용 예:
+    pool = PresetPool(PROJECT_ROOT)
+    pool.preload()
+    hwpx_bytes = pool.generator("보고서", embed_fonts=False).generate_bytes(proposal_json)
+"""
+import json
+import threading
+import time
+from pathlib import Path
+
+from hwpx_generator import HWPXGenerator
+from hwpx_templates import PRESETS, canonical_preset
+
+
+class PresetPool:
+    """preset별 (스타일, 준비된 템플릿) 풀 - 프로세스당 하나를 만들어 요청 간 공유"""
+
+    def __init__(self, base_dir, presets=None, sources=None):
+        """
+        Args:
+            base_dir: 프로젝트 루트 (템플릿/스타일 경로 기준)
+            presets: {이름: {"template", "styles"}} (기본: PRESETS)
+            sources: {이름: {"styles": dict, "template": (infos, entries)}} - 스냅샷 등에서 미리 읽은 원본
+        """
+        self.base_dir = Path(base_dir)
+        self.presets = presets or PRESETS
+        self.sources = sources or {}
+        self.timings = {}
+        self._compiled = {}
+        self._lock = threading.Lock()
+
+    def _load_styles(self, name):
+        source = self.sources.get(name, {})
+        if "styles" in source:
+            return source["styles"]
+        with open(self.base_dir / self.presets[name]["styles"], "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _compile(self, name):
+        start = time.perf_counter()
+        spec = self.presets[name]
+        styles_data = self._load_styles(name)
+        gen = HWPXGenerator(
+            base_dir=str(self.base_dir),
+            styles_path=spec["styles"],
+            embed_fonts=False,
+            styles_data=styles_data,
+            template=self.sources.get(name, {}).get("template"),
+            template_name=spec["template"],
+        )
+        compiled = gen.compile_template()
+        self.timings[name] = round((time.perf_counter() - start) * 1000, 1)
+        return styles_data, compiled
+
+    def get(self, preset):
+        """preset의 (스타일 dict, CompiledTemplate) - 처음 요청된 preset만 준비"""
+        name = canonical_preset(preset)
+        cached = self._compiled.get(name)
+        if cached is None:
+            with self._lock:
+                cached = self._compiled.get(name)
+                if cached is None:
+                    cached = self._compile(name)
+                    self._compiled[name] = cached
+        return cached
+
+    def preload(self, names=None):
+        """모든(또는 지정한) preset을 미리 준비, preset별 소요 시간(ms) 반환"""
+        for name in names or self.presets:
+            self.get(name)
+        return dict(self.timings)
+
+    def generator(self, preset, **kwargs):
+        """preset의 준비된 템플릿/스타일을 공유하는 새 HWPXGenerator"""
+        name = canonical_preset(preset)
+        styles_data, compiled = self.get(name)
+        return HWPXGenerator(
+            base_dir=str(self.base_dir),
+            styles_path=self.presets[name]["styles"],
+            styles_data=styles_data,
+            template_name=self.presets[name]["template"],
+            compiled=compiled,
+            **kwargs,
+        )
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+HWPXGenerator 시작 스냅샷
+
+배포 시점에 preset별 템플릿 엔트리(압축 해제 상태)와 스타일 설정을 pickle 하나로 묶어 두고,
+서버리스 cold start에서는 JSON 파싱/ZIP 해제/python-hwpx import 없이 그대로 로드한다.
+이 모듈은 빌드 환경에서도 실행되므로 표준 라이브러리만 사용한다.
+
+사용법:
+  빌드:  python hwpx_snapshot.py [--base-dir DIR] [-o hwpx_snapshot.pickle]
+  로드:  sources = load_snapshot(PROJECT_ROOT)      # {preset: {"styles", "template"}}
+         pool = PresetPool(PROJECT_ROOT, sources=sources)
+"""
+import argparse
+import hashlib
+import json
+import os
+import pickle
+from pathlib import Path
+
+from hwpx_templates import PRESETS, load_template, load_template_bytes, resolve_template
+
+SNAPSHOT_VERSION = 4
+DEFAULT_SNAPSHOT_PATH = Path(__file__).resolve().with_name("hwpx_snapshot.pickle")
+
+
+def _sha1(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _stat_key(path):
+    """(크기, mtime ns) - 빌드 시점과 같으면 해시 비교 생략"""
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def _build_preset(base_dir, spec):
+    """preset 하나의 스타일/템플릿 원본 + 검증용 해시"""
+    styles_file = base_dir / spec["styles"]
+    with open(styles_file, "r", encoding="utf-8") as f:
+        styles = json.load(f)
+
+    # 빌더 템플릿(python-hwpx)으로 fallback 되더라도 빌드 시점에 만들어 두어 런타임 import를 피한다
+    template_name, template_path = resolve_template(spec["template"], base_dir)
+    template_bytes = load_template_bytes(spec["template"], base_dir)
+
+    return {
+        "styles_path": spec["styles"],
+        "styles_sha1": _sha1(styles_file),
+        "styles_stat": _stat_key(styles_file),
+        "styles": styles,
+        "template_name": template_name,
+        "template_sha1": hashlib.sha1(template_bytes).hexdigest() if template_path else None,
+        "template_stat": _stat_key(template_path) if template_path else None,
+        "template": load_template(spec["template"], base_dir),
+    }
+
+
+def build_snapshot(base_dir, output_path=None, presets=None):
+    """preset별 템플릿/스타일을 읽어 스냅샷 파일 생성, 저장 경로 반환"""
+    base_dir = Path(base_dir)
+    output_path = Path(output_path) if output_path else DEFAULT_SNAPSHOT_PATH
+    presets = presets or PRESETS
+
+    entries = {name: _build_preset(base_dir, spec) for name, spec in presets.items()}
+
+    # 같은 템플릿 파일을 쓰는 preset은 한 객체를 공유해서 pickle 크기를 줄인다
+    shared = {}
+    for entry in entries.values():
+        if entry["template_sha1"]:
+            entry["template"] = shared.setdefault(entry["template_sha1"], entry["template"])
+
+    snapshot = {"version": SNAPSHOT_VERSION, "presets": entries}
+
+    tmp_path = str(output_path) + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+def _unchanged(path, sha1, stat_key, hashes):
+    """
+    파일이 빌드 시점과 같은지 - (크기, mtime)이 같으면 읽지 않고, 다를 때만 해시 비교
+
+    hashes: {경로: sha1} - 여러 preset이 같은 템플릿을 쓰므로 load_snapshot 한 번 안에서 경로별로 한 번만 해시
+    """
+    if stat_key is not None and _stat_key(path) == tuple(stat_key):
+        return True
+    key = str(path)
+    if key not in hashes:
+        hashes[key] = _sha1(path)
+    return hashes[key] == sha1
+
+
+def _is_current(base_dir, spec, entry, hashes):
+    """스냅샷 항목이 현재 스타일/템플릿 파일과 같은지 (원본은 (크기, mtime)이 바뀐 경우에만 해시 비교용으로 읽는다)"""
+    if entry["styles_path"] != spec["styles"]:
+        return False
+    styles_file = base_dir / spec["styles"]
+    if styles_file.exists() and not _unchanged(styles_file, entry["styles_sha1"], entry["styles_stat"], hashes):
+        return False
+    template_name, template_path = resolve_template(spec["template"], base_dir)
+    if template_name != entry["template_name"]:
+        return False
+    return not template_path or _unchanged(template_path, entry["template_sha1"], entry["template_stat"], hashes)
+
+
+def load_snapshot(base_dir, snapshot_path=None, presets=None):
+    """
+    스냅샷 로드 - 원본과 일치하는 preset만 {preset: {"styles", "template"}}로 반환
+
+    스냅샷이 없거나 읽을 수 없으면 None. 변경된 preset은 빠지므로 호출 측에서 원본 파일로 로드한다.
+    """
+    base_dir = Path(base_dir)
+    snapshot_path = Path(snapshot_path) if snapshot_path else DEFAULT_SNAPSHOT_PATH
+    presets = presets or PRESETS
+    if not snapshot_path.exists():
+        return None
+
+    try:
+        with open(snapshot_path, "rb") as f:
+            snapshot = pickle.load(f)
+    except Exception as e:
+        print(f"[Snapshot] Ignored unreadable snapshot: {e}")
+        return None
+
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        print("[Snapshot] Ignored: version mismatch")
+        return None
+
+    sources = {}
+    hashes = {}
+    for name, spec in presets.items():
+        entry = snapshot["presets"].get(name)
+        if entry is None or not _is_current(base_dir, spec, entry, hashes):
+            print(f"[Snapshot] Preset '{name}' changed since build, loading from files")
+            continue
+        sources[name] = {"styles": entry["styles"], "template": entry["template"]}
+    return sources
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HWPXGenerator 시작 스냅샷 생성 (배포 빌드 단계용)")
+    parser.add_argument("--base-dir", default=str(Path(__file__).resolve().parents[3]), help="프로젝트 루트")
+    parser.add_argument("-o", "--output", default=str(DEFAULT_SNAPSHOT_PATH), help="스냅샷 저장 경로")
+    args = parser.parse_args()
+
+    path = build_snapshot(args.base_dir, args.output)
+    print(f"✓ Snapshot written: {path} ({os.path.getsize(path):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
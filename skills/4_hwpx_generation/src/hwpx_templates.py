@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+HWPX 템플릿 레지스트리
+
+이름으로 템플릿을 등록하고, base_dir 기준으로 찾아 만든 bytes를 프로세스 전체에서 한 번만 만든다.
+- 파일 템플릿: base_dir 기준 상대 경로 (없으면 fallback 템플릿 사용)
+- 빌더 템플릿: python-hwpx 내장 빈 문서 등 코드로 만드는 템플릿
+표준 라이브러리만 사용한다 (배포 빌드 단계의 hwpx_snapshot.py에서도 사용).
+
+preset(제안서/보고서/공문서)별 템플릿 + 스타일 JSON 매핑(PRESETS)도 여기서 정의한다.
+
+사용 예:
+    spec = PRESETS[canonical_preset("보고서")]         # {"template": "report", "styles": ...}
+    infos, entries = load_template(spec["template"], PROJECT_ROOT)
+"""
+import io
+import threading
+import zipfile
+from pathlib import Path
+
+DEFAULT_TEMPLATE = "proposal"
+
+# 이름 -> {"path": base_dir 기준 경로 | "builder": 함수, "fallback": 대체 템플릿 이름}
+TEMPLATES = {}
+
+DEFAULT_PRESET = "proposal"
+
+# preset 이름 -> 템플릿(hwpx_templates 레지스트리 이름) + 스타일 JSON(base_dir 기준)
+PRESETS = {
+    "proposal": {"template": "proposal", "styles": "proposal-styles.json"},
+    # references/report-style.md: □ ○ ― ※ 기호 체계, HY헤드라인M/휴먼명조
+    "report": {"template": "report", "styles": "report-styles.json"},
+    # references/official-doc-style.md: 1. 가. 1) 가) 항목 체계, 맑은 고딕 11.5pt
+    "official": {"template": "official", "styles": "official-styles.json"},
+}
+
+# GenerateRequest.preset 등 화면 표시 이름 -> preset 이름
+PRESET_ALIASES = {
+    "제안서": "proposal",
+    "보고서": "report",
+    "공문서": "official",
+}
+
+
+def canonical_preset(preset):
+    """별칭/대소문자를 preset 이름으로 변환 (알 수 없는 preset은 기본 preset)"""
+    if not preset:
+        return DEFAULT_PRESET
+    name = PRESET_ALIASES.get(preset, str(preset).lower())
+    return name if name in PRESETS else DEFAULT_PRESET
+
+
+_cache = {}  # (이름, base_dir) -> (실제 사용된 이름, 원본 경로 또는 None, bytes, 압축 해제 엔트리)
+_cache_lock = threading.Lock()
+
+
+def _build_blank_document():
+    """python-hwpx 내장 빈 문서 bytes"""
+    from hwpx.templates import blank_document_bytes
+    print("[Template] Created HWPX template from python-hwpx")
+    return blank_document_bytes()
+
+
+def register_template(name, path=None, builder=None, fallback=None):
+    """템플릿 등록 (같은 이름은 덮어쓰고 캐시도 비운다)"""
+    if (path is None) == (builder is None):
+        raise ValueError("Exactly one of path or builder is required")
+    TEMPLATES[name] = {"path": path, "builder": builder, "fallback": fallback}
+    clear_template_cache()
+
+
+def clear_template_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+def resolve_template(name, base_dir):
+    """
+    fallback을 따라가며 실제로 사용할 템플릿 결정
+
+    Returns:
+        (템플릿 이름, 파일 경로 또는 None(빌더 템플릿))
+    """
+    base_dir = Path(base_dir)
+    seen = []
+    while name not in seen:
+        seen.append(name)
+        spec = TEMPLATES.get(name)
+        if spec is None:
+            raise KeyError(f"Unknown HWPX template: {name!r}")
+        if spec["builder"] is not None:
+            return name, None
+        path = base_dir / spec["path"]
+        if path.exists():
+            return name, path
+        if spec["fallback"] is None:
+            raise FileNotFoundError(f"Template file not found: {path}")
+        print(f"[Warning] Template '{name}' not found ({spec['path']}), using '{spec['fallback']}'")
+        name = spec["fallback"]
+    raise ValueError(f"Template fallback cycle: {' -> '.join(seen)}")
+
+
+def unpack_template(template_bytes):
+    """
+    템플릿 HWPX bytes를 엔트리 단위로 압축 해제
+
+    Returns:
+        ([(이름, date_time, compress_type), ...], {이름: bytes}) - 원본 엔트리 순서 유지
+    """
+    with zipfile.ZipFile(io.BytesIO(template_bytes), "r") as zf:
+        infos = [(info.filename, info.date_time, info.compress_type) for info in zf.infolist()]
+        entries = {info.filename: zf.read(info) for info in zf.infolist()}
+    return infos, entries
+
+
+def _cached(name, base_dir):
+    key = (name, str(Path(base_dir).resolve()))
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is None:
+            resolved, path = resolve_template(name, base_dir)
+            template_bytes = path.read_bytes() if path else TEMPLATES[resolved]["builder"]()
+            cached = (resolved, path, template_bytes, unpack_template(template_bytes))
+            _cache[key] = cached
+    return cached
+
+
+def load_template_bytes(name=DEFAULT_TEMPLATE, base_dir="."):
+    """템플릿 HWPX bytes (프로세스 전체에서 한 번만 읽거나 생성)"""
+    return _cached(name, base_dir)[2]
+
+
+def load_template(name=DEFAULT_TEMPLATE, base_dir="."):
+    """압축 해제된 템플릿 (infos, entries) - 공유 객체이므로 entries는 복사해서 수정할 것"""
+    return _cached(name, base_dir)[3]
+
+
+register_template("python-hwpx", builder=_build_blank_document)
+register_template("proposal", path="sample-from-hangul.hwpx", fallback="python-hwpx")
+# references/report-style.md 기준 보고서 템플릿 (없으면 제안서 템플릿)
+register_template("report", path="assets/report-template.hwpx", fallback="proposal")
+# 공문서는 별도 템플릿 없이 기본 템플릿 + 공문서 스타일 (references/official-doc-style.md)
+register_template("official", path="sample-from-hangul.hwpx", fallback="python-hwpx")
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+기존 HWPX 문서의 스트리밍 텍스트 치환 엔진
+
+Contents/section*.xml을 최상위 <hp:p> 단위로 스트리밍하면서 run 단위로 텍스트를 치환한다.
+- 여러 run(<hp:t>)에 걸쳐 나뉜 문자열도 치환 (서식은 첫 run의 것을 따른다)
+- 치환 대상이 없는 paragraph는 파싱하지 않고 원본 바이트 그대로 통과
+- 변경된 section 엔트리만 다시 압축하고 나머지 엔트리는 raw 복사
+
+사용법:
+  CLI:    python hwpx_text_replace.py -r "기본 보고서 양식" "디지털 전환 추진 계획" docs/*.hwpx
+  Import: replace_text_in_runs("report.hwpx", {"2024. 5. 23.": "2026. 2. 13."}, "out.hwpx")
+"""
+import argparse
+import glob
+import html
+import io
+import os
+import re
+import zipfile
+
+from lxml import etree
+
+from hwpx_archive import PARAGRAPH_NS, iter_top_level_paragraphs, paragraph_prefix, rewrite_archive, serialize_children
+
+SECTION_RE = re.compile(r"^Contents/section\d+\.xml$")
+
+
+class _SectionContext:
+    """section 루트 태그 정보 - paragraph 조각을 단독으로 파싱/직렬화하는 데 사용"""
+
+    def __init__(self, head):
+        start_tag = re.search(rb"<(?![?!])([^\s>/]+)[^>]*>", head)
+        self.root_open = start_tag.group(0)
+        self.root_close = b"</" + start_tag.group(1) + b">"
+        self.prefix = paragraph_prefix(self.root_open)
+        nsmap = etree.fromstring(self.root_open + self.root_close).nsmap
+        self.hp = "{%s}" % nsmap.get(self.prefix.decode(), PARAGRAPH_NS.decode())
+        self.t_re = re.compile(rb"<" + re.escape(self.prefix) + rb":t(?:\s[^>]*)?>(.*?)</" + re.escape(self.prefix) + rb":t>", re.DOTALL)
+        self.nested_p = b"<" + self.prefix + b":p"
+
+    def quick_text(self, fragment):
+        """파싱 없이 fragment 안의 모든 <hp:t> 텍스트를 이어붙인 값"""
+        parts = [re.sub(rb"<[^>]*>", b"", m.group(1)) for m in self.t_re.finditer(fragment)]
+        return html.unescape(b"".join(parts).decode("utf-8"))
+
+
+def _text_pieces(para, hp):
+    """paragraph 자신의 run에 속한 텍스트 조각 [(element, 'text'|'tail')]"""
+    pieces = []
+    for run in para.findall(f"{hp}run"):
+        for t in run.findall(f"{hp}t"):
+            pieces.append((t, "text"))
+            for child in t:
+                pieces.append((child, "tail"))
+    return pieces
+
+
+def _replace_in_paragraph(para, replacements, hp):
+    """하나의 <hp:p>에서 run 경계를 넘어 치환, 치환 횟수 반환"""
+    pieces = _text_pieces(para, hp)
+    if not pieces:
+        return 0
+
+    count = 0
+    for old, new in replacements:
+        values = [getattr(elem, attr) or "" for elem, attr in pieces]
+        full = "".join(values)
+        if old not in full:
+            continue
+
+        starts = []
+        pos = 0
+        for value in values:
+            starts.append(pos)
+            pos += len(value)
+
+        # 뒤에서부터 치환해야 앞쪽 조각의 오프셋이 유지된다
+        occurrences = [m.start() for m in re.finditer(re.escape(old), full)]
+        for occ_start in reversed(occurrences):
+            occ_end = occ_start + len(old)
+            inserted = False
+            for idx, value in enumerate(values):
+                p_start, p_end = starts[idx], starts[idx] + len(value)
+                if p_end <= occ_start or p_start >= occ_end or (p_start == p_end):
+                    continue
+                cut_from = max(occ_start, p_start) - p_start
+                cut_to = min(occ_end, p_end) - p_start
+                insert = new if not inserted else ""
+                inserted = True
+                values[idx] = value[:cut_from] + insert + value[cut_to:]
+            count += 1
+
+        for (elem, attr), value in zip(pieces, values):
+            if (getattr(elem, attr) or "") != value:
+                setattr(elem, attr, value)
+
+    return count
+
+
+def _replace_in_fragment(fragment, ctx, replacements):
+    """최상위 paragraph 조각 하나 처리 - (새 bytes, 치환 횟수)"""
+    text = ctx.quick_text(fragment)
+    has_nested = fragment.count(ctx.nested_p) > 1
+    if not has_nested and not any(old in text for old, _ in replacements):
+        return fragment, 0
+
+    container = etree.fromstring(ctx.root_open + fragment + ctx.root_close)
+    count = 0
+    for para in container.iter(f"{ctx.hp}p"):
+        count += _replace_in_paragraph(para, replacements, ctx.hp)
+    if count == 0:
+        return fragment, 0
+    return serialize_children(container, list(container)), count
+
+
+def _replace_in_section(stream, replacements):
+    """section XML 스트림 처리 - (새 bytes 또는 None, 치환 횟수)"""
+    out = io.BytesIO()
+    ctx = None
+    total = 0
+
+    for kind, chunk in iter_top_level_paragraphs(stream):
+        if kind == "raw":
+            if ctx is None and re.search(rb"<(?![?!])", chunk):
+                ctx = _SectionContext(chunk)
+            out.write(chunk)
+            continue
+
+        new_chunk, count = _replace_in_fragment(chunk, ctx, replacements)
+        total += count
+        out.write(new_chunk)
+
+    return (out.getvalue() if total else None), total
+
+
+def replace_text_in_runs(source, replacements, output_path=None):
+    """
+    HWPX 문서의 본문 텍스트를 run 단위로 치환
+
+    Args:
+        source: .hwpx 경로 또는 bytes
+        replacements: {찾을 문자열: 바꿀 문자열} 또는 [(찾을, 바꿀), ...] - 순서대로 적용
+        output_path: 저장 경로 (None이면 source 경로에 덮어쓰기, source가 bytes면 bytes 반환)
+
+    Returns:
+        치환 횟수 (bytes 입력이면 (결과 bytes 또는 None, 치환 횟수))
+    """
+    pairs = list(replacements.items()) if isinstance(replacements, dict) else list(replacements)
+    pairs = [(old, new) for old, new in pairs if old]
+
+    in_memory = isinstance(source, (bytes, bytearray))
+    src = io.BytesIO(source) if in_memory else source
+
+    changed = {}
+    total = 0
+    with zipfile.ZipFile(src, "r") as zf:
+        for info in zf.infolist():
+            if not SECTION_RE.match(info.filename):
+                continue
+            with zf.open(info) as stream:
+                data, count = _replace_in_section(stream, pairs)
+            if data is not None:
+                changed[info.filename] = data
+                total += count
+
+    if in_memory:
+        return (rewrite_archive(bytes(source), changed) if changed else None), total
+
+    # str/pathlib.Path 모두 허용 - 같은 파일인지 비교할 수 있도록 경로 문자열로
+    source = os.fspath(source)
+    output_path = os.fspath(output_path) if output_path else None
+    if changed:
+        target = output_path or source
+        tmp_path = f"{target}.tmp"
+        rewrite_archive(source, changed, tmp_path)
+        os.replace(tmp_path, target)
+    elif output_path and output_path != source:
+        # 변경 없음 - 출력 경로가 따로 지정된 경우에만 원본 그대로 복사
+        with open(source, "rb") as fin, open(output_path, "wb") as fout:
+            fout.write(fin.read())
+
+    return total
+
+
+def _expand_paths(patterns):
+    """파일/디렉토리/glob 패턴을 .hwpx 파일 목록으로 확장"""
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            paths.extend(sorted(glob.glob(os.path.join(pattern, "**", "*.hwpx"), recursive=True)))
+        else:
+            paths.extend(sorted(glob.glob(pattern)) or [pattern])
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HWPX 문서 run 단위 텍스트 일괄 치환")
+    parser.add_argument("paths", nargs="+", help=".hwpx 파일, 디렉토리 또는 glob 패턴")
+    parser.add_argument("-r", "--replace", nargs=2, action="append", metavar=("OLD", "NEW"), required=True,
+                        help="치환 쌍 (여러 번 지정 가능, 지정 순서대로 적용)")
+    args = parser.parse_args()
+
+    total_files = 0
+    for path in _expand_paths(args.paths):
+        if not os.path.exists(path):
+            print(f"Error: File not found: {path}")
+            continue
+        count = replace_text_in_runs(path, args.replace)
+        if count:
+            total_files += 1
+            print(f"Replaced {count}: {path}")
+
+    print(f"✓ {total_files} file(s) modified")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+제안서 중간 표현(IR)
+
+전처리(api/index.py preprocess_sections, markdown_to_json.py)가 만들고 HWPXGenerator가 그대로 읽는
+__slots__ 클래스 모음. dict-of-dict 대신 속성으로 접근하므로 메모리와 .get() 조회 비용이 줄어든다.
+색상/출처 문자열은 intern 하여 문단마다 같은 객체를 공유한다.
+
+JSON은 선택적인 직렬화 형식이다 (기존 proposal JSON과 같은 구조):
+    doc = Document.from_dict(json.load(f))    # 또는 from_json(text)
+    json.dump(doc.to_dict(), f)               # 또는 doc.to_json()
+"""
+import json
+import sys
+
+DEFAULT_COLOR = sys.intern("default")
+DEFAULT_SOURCE = sys.intern("generated")
+
+
+def _intern(value, default):
+    return sys.intern(value) if isinstance(value, str) and value else default
+
+
+def _cell_text(cell):
+    """표 셀 값 (문자열 또는 {"text": ...})을 문자열로"""
+    if isinstance(cell, dict):
+        return cell.get("text", "")
+    return "" if cell is None else str(cell)
+
+
+class Paragraph:
+    """본문 문단 하나 (level 1~4, text는 {{color:...}} 마커 포함 가능)"""
+    __slots__ = ("level", "text", "color", "source")
+    type = "paragraph"
+
+    def __init__(self, text, level=1, color=DEFAULT_COLOR, source=DEFAULT_SOURCE):
+        self.level = level
+        self.text = text
+        self.color = _intern(color, DEFAULT_COLOR)
+        self.source = _intern(source, DEFAULT_SOURCE)
+
+    def to_dict(self):
+        return {"level": self.level, "text": self.text, "color": self.color, "source": self.source}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("text", ""), data.get("level", 1), data.get("color"), data.get("source"))
+
+
+class Table:
+    """표 (headers: 열 제목 목록, rows: 셀 문자열 목록의 목록)"""
+    __slots__ = ("id", "title", "headers", "rows", "style")
+    type = "table"
+
+    def __init__(self, headers, rows, id=None, title="", style=None):
+        self.id = id
+        self.title = title
+        self.headers = headers
+        self.rows = rows
+        self.style = style
+
+    def to_dict(self):
+        data = {"type": "table"}
+        if self.id is not None:
+            data["id"] = self.id
+        if self.title or self.id is not None:
+            data["title"] = self.title
+        data["headers"] = self.headers
+        data["rows"] = self.rows
+        if self.style is not None:
+            data["style"] = self.style
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        headers = [_cell_text(cell) for cell in data.get("headers", [])]
+        rows = [[_cell_text(cell) for cell in row] for row in data.get("rows", [])]
+        return cls(headers, rows, data.get("id"), data.get("title") or "", data.get("style"))
+
+
+class Section:
+    """섹션 (items: Paragraph 또는 Table 목록)"""
+    __slots__ = ("id", "title", "items")
+    type = "section"
+
+    def __init__(self, title="", items=None, id=None):
+        self.id = id
+        self.title = title
+        self.items = items if items is not None else []
+
+    def to_dict(self):
+        data = {"type": "section"}
+        if self.id is not None:
+            data["id"] = self.id
+        data["title"] = self.title
+        data["items"] = [item.to_dict() for item in self.items]
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        items = [Table.from_dict(sub) if sub.get("type") == "table" else Paragraph.from_dict(sub)
+                 for sub in data.get("items", [])]
+        return cls(data.get("title") or "", items, data.get("id"))
+
+
+class Document:
+    """문서 전체 (metadata는 자유 형식 dict, content는 Section/Table 목록)"""
+    __slots__ = ("metadata", "content")
+
+    def __init__(self, metadata=None, content=None):
+        self.metadata = metadata if metadata is not None else {}
+        self.content = content if content is not None else []
+
+    def to_dict(self):
+        return {"metadata": self.metadata, "content": [item.to_dict() for item in self.content]}
+
+    def to_json(self, **kwargs):
+        kwargs.setdefault("ensure_ascii", False)
+        return json.dumps(self.to_dict(), **kwargs)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(dict(data.get("metadata", {})), [content_item_from_dict(item) for item in data.get("content", [])])
+
+
+def content_item_from_dict(data):
+    """content 항목 dict → Section/Table (이미 IR이면 그대로)"""
+    if isinstance(data, (Section, Table)):
+        return data
+    item_type = data.get("type", "section")
+    if item_type == "table":
+        return Table.from_dict(data)
+    if item_type == "section":
+        return Section.from_dict(data)
+    # 생성기가 모르는 항목 유형은 빈 섹션으로 (content 위치는 유지)
+    return Section(id=data.get("id"))
+
+
+def as_document(data):
+    """Document 또는 proposal JSON dict를 Document로"""
+    if isinstance(data, Document):
+        return data
+    return Document.from_dict(data)
+
+
+def from_json(text):
+    return Document.from_dict(json.loads(text))